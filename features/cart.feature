@@ -4,9 +4,7 @@ Feature: Shopping Cart Functionality
   So that I can prepare for checkout
 
   Background:
-    Given I am on the Sauce Demo login page
-    When I login with username "standard_user" and password "secret_sauce"
-    Then I should be redirected to the products page
+    Given I am logged in as "standard_user"
 
   Scenario: Add products to cart
     When I add 3 products to the cart
@@ -15,8 +13,7 @@ Feature: Shopping Cart Functionality
     Then the cart should contain 3 items
 
   Scenario: Remove product from cart
-    When I add 3 products to the cart
-    Then the cart badge should show 3 items
+    Given the cart contains 3 products
     When I navigate to the cart page
     And I remove 1 product from the cart
     Then the cart should contain 2 items
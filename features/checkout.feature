@@ -4,12 +4,11 @@ Feature: Checkout Functionality
   So that I can purchase products
 
   Background:
-    Given I am on the Sauce Demo login page
-    When I login with username "standard_user" and password "secret_sauce"
+    Given I am logged in as "standard_user"
 
   Scenario: Complete checkout with valid information
-    When I add 3 products to the cart
-    And I navigate to the cart page
+    Given the cart contains 3 products
+    When I navigate to the cart page
     And I proceed to checkout
     And I fill checkout information with data from CSV
     And I continue to checkout overview
@@ -18,6 +17,20 @@ Feature: Checkout Functionality
     When I finish the checkout
     Then I should see the order success message
 
+  @http
+  Scenario Outline: Checkout with customer data row <row>
+    Given the cart contains 1 products
+    When I navigate to the cart page
+    And I proceed to checkout
+    And I fill checkout information with CSV row <row>
+    And I continue to checkout overview
+    Then the total should equal subtotal plus tax
+
+    Examples:
+      | row |
+      | 1   |
+      | 2   |
+
   Scenario: Checkout with empty cart (Negative)
     When I navigate to the cart page
     Then the cart should be empty
@@ -1,63 +1,214 @@
 """Behave environment configuration."""
+import time
 from selenium import webdriver
-from utils.driver_factory import DriverFactory
-from utils.config import BROWSER, HEADLESS, BASE_URL
+from utils import config
+from utils.driver_factory import DriverFactory, DriverPool, driver_services
+from utils.config import (BROWSER, HEADLESS, DRIVER_POOL,
+                          DRIVER_POOL_SIZE, DRIVER_POOL_MAX_USES,
+                          TIMINGS_PATH, TRACE_PATH, PAGE_METRICS_PATH, RESULTS_STREAM_PATH,
+                          WORKER_ID, SCREENSHOT_ON_FAILURE, STATE_SNAPSHOTS,
+                          LOCAL_APP, LOCAL_APP_PORT, LOCAL_APP_LATENCY, LOCAL_APP_GLITCH_DELAY)
+from local_app import LocalApp
+from utils.artifacts import artifacts
+from utils.frame_recorder import frame_recorder
+from utils.http_driver import HttpDriver, use_http_backend
+from utils.instrumentation import recorder
+from utils.page_metrics import format_metrics, page_metrics
+from utils.result_stream import result_stream
 from pages.login_page import LoginPage
+from utils.test_data import test_data
+from utils.state_snapshots import StateSnapshotCache, background_key, context_page_objects
 
 
 def before_all(context):
     """Run before all tests."""
-    context.base_url = BASE_URL
+    context.local_app = None
+    if LOCAL_APP:
+        # Serve the stand-in app in-process and point every page object at it
+        context.local_app = LocalApp(
+            port=LOCAL_APP_PORT,
+            latency=LOCAL_APP_LATENCY,
+            glitch_delay=LOCAL_APP_GLITCH_DELAY
+        ).start()
+        config.BASE_URL = context.local_app.url
+        print(f"Local Sauce Demo stand-in running at {context.local_app.url}")
+    context.base_url = config.BASE_URL
+    # Keep parallel workers from overwriting each other's files
+    context.report_suffix = f"-worker-{WORKER_ID}" if WORKER_ID else ""
+    result_stream.open(RESULTS_STREAM_PATH.replace('.jsonl', f'{context.report_suffix}.jsonl'))
     context.browser = BROWSER
     context.headless = HEADLESS
     context.shared_driver = None  # Shared driver for session reuse
     context.logged_in = False  # Track login state
+    context.state_snapshots = StateSnapshotCache() if STATE_SNAPSHOTS else None
+    context.http_backend = False
+    context.driver_pool = None
+    if DRIVER_POOL:
+        # Pre-launch warm sessions that scenarios check out and return
+        context.driver_pool = DriverPool(
+            browser=context.browser,
+            headless=context.headless,
+            size=DRIVER_POOL_SIZE,
+            max_uses=DRIVER_POOL_MAX_USES
+        )
+        context.driver_pool.start()
 
 
 def before_scenario(context, scenario):
     """Run before each scenario."""
+    context.scenario_start = time.perf_counter()
+    context.http_backend = use_http_backend(scenario.effective_tags)
     try:
-        # Create new driver instance for each scenario
-        context.driver = DriverFactory.get_driver(
-            browser=context.browser,
-            headless=context.headless
-        )
-        context.driver.maximize_window()
+        if context.http_backend:
+            # Smoke tier: same page objects over plain HTTP, no browser
+            context.driver = HttpDriver()
+        elif context.driver_pool:
+            # Reuse a warm, already reset session from the pool
+            context.driver = context.driver_pool.checkout()
+        else:
+            # Create new driver instance for each scenario
+            context.driver = DriverFactory.get_driver(
+                browser=context.browser,
+                headless=context.headless
+            )
+            context.driver.maximize_window()
         
     except Exception as e:
         print(f"Failed to create driver: {e}")
         raise
 
+    if getattr(context, 'auto_login_user', None):
+        # Auto-login for scenarios tagged with @skip_login
+        LoginPage(context.driver).fast_login(
+            context.auto_login_user,
+            test_data.password_for(context.auto_login_user, default="secret_sauce")
+        )
+        print("✓ Auto-login completed (via @skip_login tag)")
+
+    context.snapshot_key = None
+    if (context.state_snapshots and not context.http_backend and scenario.feature.background
+            and 'no_snapshot' not in scenario.effective_tags):
+        key = background_key(scenario.feature.background, config.BASE_URL)
+        if not _restore_background(context, scenario, key):
+            # Run the Background normally; after_step snapshots it once it has passed
+            context.snapshot_key = key
+    # Budgets and metrics start with the scenario's own steps (not the auto-login)
+    page_metrics.reset_scenario()
+
+
+def _restore_background(context, scenario, key):
+    """Restore a snapshot of the scenario's Background instead of running its steps."""
+    snapshot = context.state_snapshots.get(key)
+    if snapshot is None:
+        return False
+    try:
+        page_objects = context.state_snapshots.restore(snapshot, context.driver, config.BASE_URL)
+    except Exception as e:
+        print(f"Failed to restore Background snapshot: {e}")
+        page_objects = None
+    if page_objects is None:
+        context.state_snapshots.invalidate(key)
+        return False
+    for name, page in page_objects.items():
+        setattr(context, name, page)
+    # behave internal (1.2.6): with no background steps it skips (and does not report) the Background
+    scenario._background_steps = []
+    print("✓ Background restored from snapshot")
+    return True
+
+
+def before_step(context, step):
+    """Run before each step."""
+    context.step_start = time.perf_counter()
+
+
+def after_step(context, step):
+    """Run after each step."""
+    recorder.record('step', step.name, context.step_start, time.perf_counter() - context.step_start,
+                    status=step.status.name)
+    # Page transition metrics of this step, kept per step for the run's report
+    transitions = page_metrics.take(str(context.scenario.location), str(step.location))
+    for metrics in transitions:
+        print(f"Page metrics {format_metrics(metrics)}")
+    result_stream.step(context.scenario, step, transitions)
+    background_steps = context.scenario.background_steps
+    if context.snapshot_key and background_steps and step is background_steps[-1] and step.status == 'passed':
+        context.state_snapshots.capture(context.snapshot_key, context.driver, context_page_objects(context))
+        context.snapshot_key = None
+
 
 def before_tag(context, tag):
     """Run before scenarios with specific tags."""
     if tag == "skip_login":
-        # Auto-login for scenarios tagged with @skip_login
-        if hasattr(context, 'driver') and context.driver:
-            login_page = LoginPage(context.driver)
-            login_page.navigate_to(context.base_url)
-            login_page.login("standard_user", "secret_sauce")
-            print("✓ Auto-login completed (via @skip_login tag)")
+        # Tag hooks run before before_scenario creates the driver,
+        # so only request the auto-login here
+        context.auto_login_user = "standard_user"
 
 
 def after_scenario(context, scenario):
     """Run after each scenario."""
     # Only proceed if driver was successfully created
     if hasattr(context, 'driver') and context.driver is not None:
+        # Buffered action frames are only decoded and written for failed scenarios
+        frames = frame_recorder.take(context.driver)
         try:
-            # Take screenshot on failure
-            if scenario.status == 'failed':
-                DriverFactory.take_screenshot(context.driver, scenario.name)
+            # Capture failure artifacts; they are written in the background
+            if scenario.status == 'failed' and SCREENSHOT_ON_FAILURE:
+                path = artifacts.capture(context.driver, scenario.name, frames=frames,
+                                         location=str(scenario.location), status=scenario.status.name)
+                print(f"Failure artifacts queued: {path}")
         except Exception as e:
-            print(f"Failed to take screenshot: {e}")
+            print(f"Failed to capture failure artifacts: {e}")
+        try:
+            # Report what the performance profile blocked (also drains the browser's log);
+            # the HTTP backend has no profile and no network log
+            context.network_stats = (None if context.http_backend
+                                     else DriverFactory.collect_network_stats(context.driver))
+            if context.network_stats and context.network_stats['blocked']:
+                stats = context.network_stats
+                print(f"Profile '{stats['profile']}': blocked {stats['blocked']} of {stats['requests']} "
+                      f"requests, ~{stats['bytes_saved'] / 1024:.1f} KiB saved"
+                      + (f" ({stats['unknown_size']} of unknown size)" if stats['unknown_size'] else ""))
+        except Exception as e:
+            print(f"Failed to collect network stats: {e}")
         finally:
-            # Close browser
+            # Return browser to the pool or close it
             try:
-                context.driver.quit()
+                if context.driver_pool and not context.http_backend:
+                    context.driver_pool.release(context.driver)
+                else:
+                    context.driver.quit()
             except Exception as e:
-                print(f"Failed to quit driver: {e}")
+                print(f"Failed to release driver: {e}")
+
+    recorder.record('scenario', scenario.name, context.scenario_start,
+                    time.perf_counter() - context.scenario_start, status=scenario.status.name)
+    result_stream.scenario(scenario)
 
 
 def after_all(context):
     """Run after all tests."""
+    if context.driver_pool:
+        print(context.driver_pool.format_stats())
+        context.driver_pool.shutdown()
+    if driver_services.sessions:
+        print(driver_services.format_stats())
+        driver_services.stop_all()
+    if context.state_snapshots and context.state_snapshots.restored:
+        print(f"Backgrounds restored from snapshots: {context.state_snapshots.restored}")
+    written, errors = artifacts.flush()
+    if written or errors:
+        print(f"Failure artifacts: {len(written)} written to {artifacts.output_dir}"
+              + (f", {len(errors)} failed ({errors[0]})" if errors else ""))
+    result_stream.close()
+    suffix = context.report_suffix
+    if recorder.enabled:
+        timings_path = TIMINGS_PATH.replace('.json', f'{suffix}.json')
+        trace_path = TRACE_PATH.replace('.json', f'{suffix}.json')
+        recorder.write(timings_path, trace_path)
+        print(f"Timings written to {timings_path}, trace to {trace_path}")
+    if page_metrics.entries:
+        page_metrics.write(PAGE_METRICS_PATH.replace('.json', f'{suffix}.json'))
+    if context.local_app:
+        context.local_app.stop()
     print("All tests completed.")
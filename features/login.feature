@@ -16,6 +16,13 @@ Feature: Login Functionality
       | standard_user           | secret_sauce |
       | performance_glitch_user | secret_sauce |
 
+  Scenario: Products page loads within its budget
+    Given the "inventory" page has a budget of 5000 ms
+    And the "inventory" page has a "long_task_ms" budget of 500 ms
+    When I login with username "standard_user" and password "secret_sauce"
+    Then I should be redirected to the products page
+
+  @http
   Scenario Outline: Login with invalid credentials
     When I login with username "<username>" and password "<password>"
     Then I should see an error message
@@ -27,6 +34,7 @@ Feature: Login Functionality
       | invalid_user  | wrong_password  |
       | standard_user | wrong_password  |
 
+  @http
   Scenario: Login with locked out user
     When I login with username "locked_out_user" and password "secret_sauce"
     Then I should see an error message containing "Sorry, this user has been locked out"
@@ -1,12 +1,11 @@
+@http
 Feature: Products Page Functionality
   As a logged-in user
   I want to view and interact with products
   So that I can browse the inventory
 
   Background:
-    Given I am on the Sauce Demo login page
-    When I login with username "standard_user" and password "secret_sauce"
-    Then I should be redirected to the products page
+    Given I am logged in as "standard_user"
 
   Scenario: Verify product listing is displayed
     Then the products page should display inventory items
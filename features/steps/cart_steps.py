@@ -1,6 +1,6 @@
 """Step definitions for cart feature."""
 
-from behave import when, then
+from behave import given, when, then
 from pages.products_page import ProductsPage
 from pages.cart_page import CartPage
 
@@ -14,6 +14,15 @@ def step_add_products_to_cart(context, count):
     context.products_page.add_products_to_cart(count)
 
 
+@given('the cart contains {count:d} products')
+def step_cart_contains(context, count):
+    """Fill the cart directly (one storage write and reload) as a precondition."""
+    if not hasattr(context, 'products_page'):
+        context.products_page = ProductsPage(context.driver)
+    
+    context.products_page.fill_cart(count)
+
+
 @then('the cart badge should show {count:d} items')
 def step_verify_cart_badge(context, count):
     """Verify cart badge shows correct count."""
@@ -3,7 +3,7 @@
 from behave import when, then
 from pages.cart_page import CartPage
 from pages.checkout_page import CheckoutStepOnePage, CheckoutStepTwoPage, CheckoutCompletePage
-import csv
+from utils.test_data import test_data
 
 
 @when('I proceed to checkout')
@@ -28,10 +28,8 @@ def step_fill_from_csv(context):
     if not hasattr(context, 'checkout_step_one'):
         context.checkout_step_one = CheckoutStepOnePage(context.driver)
     
-    # Read first row from CSV
-    with open('data/checkout_data.csv', 'r') as file:
-        reader = csv.DictReader(file)
-        data = next(reader)
+    # First row of the (memoized) checkout data
+    data = test_data.rows()[0]
     
     context.checkout_step_one.fill_checkout_form(
         data['first_name'],
@@ -40,6 +38,20 @@ def step_fill_from_csv(context):
     )
 
 
+@when('I fill checkout information with CSV row {number:d}')
+def step_fill_from_csv_row(context, number):
+    """Fill checkout form with one row (1-based) of the CSV file, read by offset."""
+    if not hasattr(context, 'checkout_step_one'):
+        context.checkout_step_one = CheckoutStepOnePage(context.driver)
+    
+    data = test_data.row(number - 1)
+    context.checkout_step_one.fill_checkout_form(
+        data['first_name'],
+        data['last_name'],
+        data['postal_code']
+    )
+
+
 @when('I fill checkout information with firstname "{first_name}" lastname "{last_name}" and zipcode "{zipcode}"')
 def step_fill_checkout_manual(context, first_name, last_name, zipcode):
     """Fill checkout form with manual data."""
@@ -75,9 +87,9 @@ def step_verify_subtotal(context):
     if not hasattr(context, 'checkout_step_two'):
         context.checkout_step_two = CheckoutStepTwoPage(context.driver)
     
-    item_prices = context.checkout_step_two.get_item_prices()
-    expected_subtotal = sum(item_prices)
-    actual_subtotal = context.checkout_step_two.get_subtotal()
+    overview = context.checkout_step_two.get_overview()
+    expected_subtotal = sum(item.price for item in overview.items)
+    actual_subtotal = overview.summary.subtotal
     
     assert abs(actual_subtotal - expected_subtotal) < 0.01, \
         f"Subtotal {actual_subtotal} does not match sum of prices {expected_subtotal}"
@@ -89,10 +101,8 @@ def step_verify_total(context):
     if not hasattr(context, 'checkout_step_two'):
         context.checkout_step_two = CheckoutStepTwoPage(context.driver)
     
-    subtotal = context.checkout_step_two.get_subtotal()
-    tax = context.checkout_step_two.get_tax()
+    subtotal, tax, actual_total = context.checkout_step_two.get_summary()
     expected_total = round(subtotal + tax, 2)
-    actual_total = context.checkout_step_two.get_total()
     
     assert abs(actual_total - expected_total) < 0.01, \
         f"Total {actual_total} does not match subtotal + tax {expected_total}"
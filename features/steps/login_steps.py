@@ -2,6 +2,7 @@
 from behave import given, when, then
 from pages.login_page import LoginPage
 from pages.products_page import ProductsPage
+from utils.test_data import test_data
 
 
 @given('I am on the Sauce Demo login page')
@@ -13,10 +14,9 @@ def step_navigate_to_login(context):
 
 @given('I am logged in as "{username}"')
 def step_quick_login(context, username):
-    """Quick login without UI interaction (for non-login tests)."""
+    """Quick login by session injection (UI login only once per user)."""
     login_page = LoginPage(context.driver)
-    login_page.navigate()
-    login_page.login(username, "secret_sauce")
+    login_page.fast_login(username, test_data.password_for(username, default="secret_sauce"))
     # Verify login succeeded
     products_page = ProductsPage(context.driver)
     assert products_page.is_products_page_displayed(), "Login failed"
@@ -0,0 +1,15 @@
+"""Step definitions for page latency budgets."""
+from behave import given
+from utils.page_metrics import page_metrics
+
+
+@given('the "{page}" page has a budget of {budget:d} ms')
+def step_page_budget(context, page, budget):
+    """Fail the step that moves to the page if it takes longer than the budget."""
+    page_metrics.set_budget(page, budget)
+
+
+@given('the "{page}" page has a "{metric}" budget of {budget:d} ms')
+def step_page_metric_budget(context, page, metric, budget):
+    """Budget one metric of a page, e.g. "ttfb_ms" or "long_task_ms"."""
+    page_metrics.set_budget(page, budget, metric)
@@ -0,0 +1,5 @@
+"""Local stand-in for www.saucedemo.com used for fast, offline runs."""
+
+from local_app.server import LocalApp
+
+__all__ = ['LocalApp']
@@ -0,0 +1,35 @@
+"""Run the local Sauce Demo stand-in in the foreground.
+
+Usage:
+    python -m local_app --port 8000 --glitch-delay 2
+"""
+
+import argparse
+import time
+
+from local_app.server import LocalApp
+from utils.config import LOCAL_APP_GLITCH_DELAY, LOCAL_APP_LATENCY
+
+
+def main(argv=None):
+    """Parse arguments and serve until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve the local Sauce Demo stand-in.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=LOCAL_APP_LATENCY,
+                        help="Seconds added to every response")
+    parser.add_argument('--glitch-delay', type=float, default=LOCAL_APP_GLITCH_DELAY,
+                        help="Extra seconds for performance_glitch_user")
+    args = parser.parse_args(argv)
+
+    app = LocalApp(args.host, args.port, args.latency, args.glitch_delay, verbose=True).start()
+    print(f"Sauce Demo stand-in running at {app.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        app.stop()
+
+
+if __name__ == '__main__':
+    main()
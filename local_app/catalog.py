@@ -0,0 +1,85 @@
+"""Products, users and messages of the local Sauce Demo stand-in."""
+
+from collections import namedtuple
+
+
+Product = namedtuple('Product', ['id', 'name', 'price', 'description'])
+
+# Same ids, names and prices as www.saucedemo.com (ids appear in element ids and cart storage)
+PRODUCTS = (
+    Product(4, "Sauce Labs Backpack", 29.99,
+            "carry.allTheThings() with the sleek, streamlined Sly Pack that melds "
+            "uncompromising style with unequaled laptop and tablet protection."),
+    Product(0, "Sauce Labs Bike Light", 9.99,
+            "A red light isn't the desired state in testing but it sure helps when "
+            "riding your bike at night. Water-resistant with 3 lighting modes, 1 AAA battery included."),
+    Product(1, "Sauce Labs Bolt T-Shirt", 15.99,
+            "Get your testing superhero on with the Sauce Labs bolt T-shirt. From American "
+            "Apparel, 100% ringspun combed cotton, heather gray with red bolt."),
+    Product(5, "Sauce Labs Fleece Jacket", 49.99,
+            "It's not every day that you come across a midweight quarter-zip fleece jacket "
+            "capable of handling everything from a relaxing day outdoors to a busy day at the office."),
+    Product(2, "Sauce Labs Onesie", 7.99,
+            "Rib snap infant onesie for the junior automation engineer in development. "
+            "Reinforced 3-snap bottom closure, two-needle hemmed sleeved and bottom won't unravel."),
+    Product(3, "Test.allTheThings() T-Shirt (Red)", 15.99,
+            "This classic Sauce Labs t-shirt is perfect to wear when cozying up to your "
+            "keyboard to automate a few tests. Super-soft and comfy ringspun combed cotton."),
+)
+
+PRODUCTS_BY_ID = {product.id: product for product in PRODUCTS}
+
+PASSWORD = "secret_sauce"
+USERNAMES = ("standard_user", "locked_out_user", "problem_user",
+             "performance_glitch_user", "error_user", "visual_user")
+LOCKED_OUT_USERS = ("locked_out_user",)
+GLITCH_USERS = ("performance_glitch_user",)
+
+TAX_RATE = 0.08
+
+SORT_OPTIONS = (
+    ('az', "Name (A to Z)"),
+    ('za', "Name (Z to A)"),
+    ('lohi', "Price (low to high)"),
+    ('hilo', "Price (high to low)"),
+)
+
+ERROR_USERNAME_REQUIRED = "Epic sadface: Username is required"
+ERROR_PASSWORD_REQUIRED = "Epic sadface: Password is required"
+ERROR_NO_MATCH = "Epic sadface: Username and password do not match any user in this service"
+ERROR_LOCKED_OUT = "Epic sadface: Sorry, this user has been locked out."
+ERROR_NOT_LOGGED_IN = "Epic sadface: You can only access '{path}' when you are logged in."
+
+
+def slug(product):
+    """Return the data-test suffix of a product, e.g. 'sauce-labs-backpack'."""
+    return product.name.lower().replace(' ', '-')
+
+
+def sort_products(products, option):
+    """Sort products the way the inventory sort dropdown does."""
+    if option == 'za':
+        return sorted(products, key=lambda product: product.name, reverse=True)
+    if option == 'lohi':
+        return sorted(products, key=lambda product: product.price)
+    if option == 'hilo':
+        return sorted(products, key=lambda product: product.price, reverse=True)
+    return sorted(products, key=lambda product: product.name)
+
+
+def check_login(username, password):
+    """
+    Validate credentials.
+
+    Returns:
+        str: Error message, or None if the login succeeds
+    """
+    if not username:
+        return ERROR_USERNAME_REQUIRED
+    if not password:
+        return ERROR_PASSWORD_REQUIRED
+    if username not in USERNAMES or password != PASSWORD:
+        return ERROR_NO_MATCH
+    if username in LOCKED_OUT_USERS:
+        return ERROR_LOCKED_OUT
+    return None
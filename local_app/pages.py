@@ -0,0 +1,232 @@
+"""Server-side HTML rendering for the local Sauce Demo stand-in.
+
+Markup mirrors the class names, ids and data-test attributes that the page
+objects in pages/ use on www.saucedemo.com.
+"""
+
+from html import escape
+
+from local_app.catalog import PRODUCTS, SORT_OPTIONS, TAX_RATE, slug, sort_products
+
+
+def _document(title, body, cart=(), page='', authoritative=False):
+    """Wrap page content in the common document shell."""
+    attributes = f' data-cart="{"-".join(str(item) for item in cart)}" data-page="{page}"'
+    if authoritative:
+        attributes += ' data-cart-authoritative'
+    return (
+        "<!DOCTYPE html>\n<html lang=\"en\"><head><meta charset=\"utf-8\">"
+        f"<title>{escape(title)}</title></head>"
+        f"<body{attributes}><div id=\"root\">{body}</div>"
+        "<script src=\"/static/app.js\"></script></body></html>"
+    )
+
+
+def _header(cart, title, extra=''):
+    """Render the primary header with cart badge and the secondary title bar."""
+    badge = (f'<span class="shopping_cart_badge" data-test="shopping-cart-badge">{len(cart)}</span>'
+             if cart else '')
+    return (
+        '<div class="primary_header" data-test="primary-header">'
+        '<div class="app_logo">Swag Labs</div>'
+        '<div id="shopping_cart_container" class="shopping_cart_container">'
+        f'<a class="shopping_cart_link" data-test="shopping-cart-link" href="/cart.html">{badge}</a>'
+        '</div></div>'
+        '<div class="header_secondary_container" data-test="secondary-header">'
+        f'<span class="title" data-test="title">{escape(title)}</span>{extra}</div>'
+    )
+
+
+def _error(message):
+    """Render an error banner, or nothing."""
+    if not message:
+        return ''
+    return (f'<div class="error-message-container error"><h3 data-test="error">{escape(message)}'
+            '<button class="error-button" data-test="error-button">x</button></h3></div>')
+
+
+def _nav_button(action, test_id, label, css='btn btn_secondary'):
+    """Render a button that navigates with a plain GET form."""
+    return (f'<form method="get" action="{action}" class="nav-form">'
+            f'<button type="submit" class="{css}" id="{test_id}" name="{test_id}" '
+            f'data-test="{test_id}">{escape(label)}</button></form>')
+
+
+def _cart_button(product, in_cart, back_to):
+    """Render the add/remove button for a product."""
+    name = slug(product)
+    if in_cart:
+        op, test_id, css, label = 'remove', f'remove-{name}', 'btn btn_secondary btn_small btn_inventory', 'Remove'
+    else:
+        op, test_id, css, label = 'add', f'add-to-cart-{name}', 'btn btn_primary btn_small btn_inventory', 'Add to cart'
+    return (f'<form method="post" action="/cart" class="cart-form">'
+            f'<input type="hidden" name="id" value="{product.id}">'
+            f'<input type="hidden" name="op" value="{op}">'
+            f'<input type="hidden" name="back" value="{back_to}">'
+            f'<button type="submit" class="{css}" id="{test_id}" name="{test_id}" '
+            f'data-test="{test_id}" data-slug="{escape(name)}">{label}</button></form>')
+
+
+def _price(amount):
+    """Format an amount like the real site does."""
+    return f"${amount:.2f}"
+
+
+def login_page(error='', username=''):
+    """Render the login page."""
+    body = (
+        '<div class="login_logo">Swag Labs</div>'
+        '<div class="login_wrapper"><div class="login-box">'
+        '<form method="post" action="/">'
+        '<div class="form_group"><input class="input_error form_input" placeholder="Username" '
+        f'type="text" data-test="username" id="user-name" name="user-name" value="{escape(username)}"></div>'
+        '<div class="form_group"><input class="input_error form_input" placeholder="Password" '
+        'type="password" data-test="password" id="password" name="password" value=""></div>'
+        f'{_error(error)}'
+        '<input type="submit" class="submit-button btn_action" data-test="login-button" '
+        'id="login-button" name="login-button" value="Login">'
+        '</form></div></div>'
+    )
+    return _document("Swag Labs", body, page='login')
+
+
+def inventory_page(cart, sort='az'):
+    """Render the product list."""
+    options = "".join(
+        f'<option value="{value}"{" selected" if value == sort else ""}>{escape(label)}</option>'
+        for value, label in SORT_OPTIONS
+    )
+    active = dict(SORT_OPTIONS).get(sort, SORT_OPTIONS[0][1])
+    sorter = (
+        '<div class="right_component"><form method="get" action="/inventory.html" class="sort-form">'
+        '<span class="select_container"><span class="active_option" data-test="active-option">'
+        f'{escape(active)}</span><select class="product_sort_container" '
+        f'data-test="product-sort-container" name="sort">{options}</select></span></form></div>'
+    )
+    rows = []
+    for product in sort_products(PRODUCTS, sort):
+        rows.append(
+            f'<div class="inventory_item" data-test="inventory-item" data-name="{escape(product.name)}" '
+            f'data-price="{product.price}">'
+            f'<div class="inventory_item_img"><a href="/inventory-item.html?id={product.id}" '
+            f'id="item_{product.id}_img_link"></a></div>'
+            '<div class="inventory_item_description" data-test="inventory-item-description">'
+            f'<div class="inventory_item_label"><a href="/inventory-item.html?id={product.id}" '
+            f'id="item_{product.id}_title_link">'
+            f'<div class="inventory_item_name" data-test="inventory-item-name">{escape(product.name)}</div></a>'
+            f'<div class="inventory_item_desc" data-test="inventory-item-desc">{escape(product.description)}</div></div>'
+            f'<div class="pricebar"><div class="inventory_item_price" data-test="inventory-item-price">'
+            f'{_price(product.price)}</div>{_cart_button(product, product.id in cart, "/inventory.html")}'
+            '</div></div></div>'
+        )
+    body = (_header(cart, "Products", sorter)
+            + '<div class="inventory_container"><div class="inventory_list" data-test="inventory-list">'
+            + "".join(rows) + '</div></div>')
+    return _document("Swag Labs", body, cart, page='inventory')
+
+
+def item_page(product, cart):
+    """Render a single product's detail page."""
+    body = (
+        _header(cart, "")
+        + _nav_button('/inventory.html', 'back-to-products', 'Back to products')
+        + f'<div class="inventory_details" data-test="inventory-container">'
+        f'<div class="inventory_details_name large_size" data-test="inventory-item-name">'
+        f'{escape(product.name)}</div>'
+        f'<div class="inventory_details_desc large_size" data-test="inventory-item-desc">'
+        f'{escape(product.description)}</div>'
+        f'<div class="inventory_details_price" data-test="inventory-item-price">{_price(product.price)}</div>'
+        f'{_cart_button(product, product.id in cart, f"/inventory-item.html?id={product.id}")}</div>'
+    )
+    return _document("Swag Labs", body, cart, page='item')
+
+
+def _cart_rows(products, removable):
+    """Render cart/overview rows."""
+    rows = []
+    for product in products:
+        button = _cart_button(product, True, "/cart.html") if removable else ''
+        rows.append(
+            '<div class="cart_item" data-test="inventory-item"><div class="cart_quantity" '
+            'data-test="item-quantity">1</div><div class="cart_item_label">'
+            f'<a href="/inventory-item.html?id={product.id}" id="item_{product.id}_title_link">'
+            f'<div class="inventory_item_name" data-test="inventory-item-name">{escape(product.name)}</div></a>'
+            f'<div class="inventory_item_desc" data-test="inventory-item-desc">{escape(product.description)}</div>'
+            f'<div class="item_pricebar"><div class="inventory_item_price" data-test="inventory-item-price">'
+            f'{_price(product.price)}</div>{button}</div></div></div>'
+        )
+    return '<div class="cart_list" data-test="cart-list">' + "".join(rows) + '</div>'
+
+
+def cart_page(cart, products):
+    """Render the cart."""
+    body = (
+        _header(cart, "Your Cart")
+        + '<div class="cart_contents_container">' + _cart_rows(products, removable=True)
+        + '<div class="cart_footer">'
+        + _nav_button('/inventory.html', 'continue-shopping', 'Continue Shopping', 'btn btn_secondary back btn_medium')
+        + _nav_button('/checkout-step-one.html', 'checkout', 'Checkout', 'btn btn_action btn_medium checkout_button')
+        + '</div></div>'
+    )
+    return _document("Swag Labs", body, cart, page='cart')
+
+
+def checkout_step_one_page(cart, error='', values=None):
+    """Render the customer information form."""
+    values = values or {}
+
+    def field(name, placeholder):
+        return (f'<div class="form_group"><input class="input_error form_input" placeholder="{placeholder}" '
+                f'type="text" data-test="{name}" id="{name}" name="{name}" '
+                f'value="{escape(values.get(name, ""))}"></div>')
+
+    body = (
+        _header(cart, "Checkout: Your Information")
+        + '<div class="checkout_info_container"><form method="post" action="/checkout-step-one.html">'
+        + '<div class="checkout_info">' + field('firstName', "First Name") + field('lastName', "Last Name")
+        + field('postalCode', "Zip/Postal Code") + _error(error) + '</div>'
+        + '<div class="checkout_buttons">'
+        + '<input type="submit" class="submit-button btn btn_primary cart_button btn_action" '
+        'data-test="continue" name="continue" id="continue" value="Continue">'
+        + '</div></form>'
+        + _nav_button('/cart.html', 'cancel', 'Cancel', 'btn btn_secondary back btn_medium cart_cancel_link')
+        + '</div>'
+    )
+    return _document("Swag Labs", body, cart, page='checkout-step-one')
+
+
+def checkout_step_two_page(cart, products):
+    """Render the order overview with subtotal, tax and total."""
+    subtotal = round(sum(product.price for product in products), 2)
+    tax = round(subtotal * TAX_RATE, 2)
+    total = round(subtotal + tax, 2)
+    body = (
+        _header(cart, "Checkout: Overview")
+        + '<div class="checkout_summary_container">' + _cart_rows(products, removable=False)
+        + '<div class="summary_info">'
+        f'<div class="summary_subtotal_label" data-test="subtotal-label">Item total: {_price(subtotal)}</div>'
+        f'<div class="summary_tax_label" data-test="tax-label">Tax: {_price(tax)}</div>'
+        f'<div class="summary_info_label summary_total_label" data-test="total-label">Total: {_price(total)}</div>'
+        '<div class="cart_footer">'
+        + _nav_button('/inventory.html', 'cancel', 'Cancel', 'btn btn_secondary back btn_medium cart_cancel_link')
+        + '<form method="post" action="/checkout-step-two.html" class="finish-form">'
+        '<button type="submit" class="btn btn_action btn_medium cart_button" id="finish" name="finish" '
+        'data-test="finish">Finish</button></form>'
+        '</div></div></div>'
+    )
+    return _document("Swag Labs", body, cart, page='checkout-step-two')
+
+
+def checkout_complete_page():
+    """Render the order confirmation; the (now empty) server cart is authoritative."""
+    body = (
+        _header((), "Checkout: Complete!")
+        + '<div id="checkout_complete_container" class="checkout_complete_container" '
+        'data-test="checkout-complete-container">'
+        '<h2 class="complete-header" data-test="complete-header">Thank you for your order!</h2>'
+        '<div class="complete-text" data-test="complete-text">Your order has been dispatched, '
+        'and will arrive just as fast as the pony can get there!</div>'
+        + _nav_button('/inventory.html', 'back-to-products', 'Back Home', 'btn btn_primary btn_small')
+        + '</div>'
+    )
+    return _document("Swag Labs", body, (), page='checkout-complete', authoritative=True)
@@ -0,0 +1,235 @@
+"""HTTP server and in-process launcher for the local Sauce Demo stand-in."""
+
+import os
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from local_app import pages
+from local_app.catalog import (ERROR_NOT_LOGGED_IN, GLITCH_USERS, LOCKED_OUT_USERS, PRODUCTS_BY_ID,
+                               USERNAMES, check_login)
+
+
+SESSION_COOKIE = 'session-username'
+CART_COOKIE = 'cart-contents'
+SESSION_SECONDS = 600  # saucedemo.com sessions last 10 minutes
+
+STATIC_DIR = os.path.join(os.path.dirname(__file__), 'static')
+
+# Pages that need a logged-in user
+PROTECTED_PATHS = ('/inventory.html', '/inventory-item.html', '/cart.html',
+                   '/checkout-step-one.html', '/checkout-step-two.html', '/checkout-complete.html')
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves the login, inventory, cart and checkout pages."""
+
+    server_version = "SauceDemoStandIn/1.0"
+
+    def log_message(self, format, *args):
+        """Keep test output quiet; enable with LocalApp(verbose=True)."""
+        if self.server.app.verbose:
+            super().log_message(format, *args)
+
+    # -- Request state -------------------------------------------------
+
+    def _cookies(self):
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        return {key: morsel.value for key, morsel in cookie.items()}
+
+    def _user(self):
+        """Return the logged-in username, or None."""
+        username = self._cookies().get(SESSION_COOKIE)
+        if username in USERNAMES and username not in LOCKED_OUT_USERS:
+            return username
+        return None
+
+    def _cart(self):
+        """Return the cart as a list of product ids, in the order they were added."""
+        raw = self._cookies().get(CART_COOKIE, '')
+        ids = [int(item) for item in raw.split('-') if item.isdigit()]
+        return [item for item in dict.fromkeys(ids) if item in PRODUCTS_BY_ID]
+
+    def _form(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        data = self.rfile.read(length).decode('utf-8') if length else ''
+        return {key: values[0] for key, values in parse_qs(data, keep_blank_values=True).items()}
+
+    def _delay(self, username):
+        """Apply the configured latency (plus the glitch delay for glitch users)."""
+        delay = self.server.app.latency
+        if username in GLITCH_USERS:
+            delay += self.server.app.glitch_delay
+        if delay > 0:
+            time.sleep(delay)
+
+    # -- Responses -----------------------------------------------------
+
+    def _send(self, status, body=b'', content_type='text/html; charset=utf-8', headers=()):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _redirect(self, location, cookies=()):
+        headers = [('Location', location)] + [('Set-Cookie', cookie) for cookie in cookies]
+        self._send(303, headers=headers)
+
+    @staticmethod
+    def _cart_cookie(cart):
+        return f"{CART_COOKIE}={'-'.join(str(item) for item in cart)}; Path=/"
+
+    # -- Routing -------------------------------------------------------
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path.startswith('/static/'):
+            return self._static(url.path[len('/static/'):])
+        if url.path in ('/', '/index.html'):
+            error = ERROR_NOT_LOGGED_IN.format(path=query['next']) if 'next' in query else ''
+            return self._send(200, pages.login_page(error))
+        if url.path == '/logout':
+            return self._redirect('/', [f"{SESSION_COOKIE}=; Path=/; Max-Age=0"])
+        if url.path not in PROTECTED_PATHS:
+            return self._send(404, "Not found", 'text/plain')
+
+        user = self._user()
+        if user is None:
+            return self._redirect(f"/?next={url.path}")
+        self._delay(user)
+        cart = self._cart()
+        products = [PRODUCTS_BY_ID[item] for item in cart]
+        if url.path == '/inventory.html':
+            return self._send(200, pages.inventory_page(cart, query.get('sort', 'az')))
+        if url.path == '/inventory-item.html':
+            product = PRODUCTS_BY_ID.get(int(query.get('id', '-1')) if query.get('id', '').isdigit() else -1)
+            if product is None:
+                return self._send(404, "Not found", 'text/plain')
+            return self._send(200, pages.item_page(product, cart))
+        if url.path == '/cart.html':
+            return self._send(200, pages.cart_page(cart, products))
+        if url.path == '/checkout-step-one.html':
+            return self._send(200, pages.checkout_step_one_page(cart))
+        if url.path == '/checkout-step-two.html':
+            return self._send(200, pages.checkout_step_two_page(cart, products))
+        return self._send(200, pages.checkout_complete_page())
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        form = self._form()
+        if path in ('/', '/index.html'):
+            return self._login(form)
+
+        user = self._user()
+        if user is None:
+            return self._redirect(f"/?next={path}")
+        self._delay(user)
+        if path == '/cart':
+            return self._update_cart(form)
+        if path == '/checkout-step-one.html':
+            return self._checkout_information(form)
+        if path == '/checkout-step-two.html':
+            # Finishing the order empties the cart
+            return self._redirect('/checkout-complete.html', [self._cart_cookie([])])
+        return self._send(404, "Not found", 'text/plain')
+
+    def _static(self, name):
+        path = os.path.join(STATIC_DIR, os.path.basename(name))
+        if not os.path.isfile(path):
+            return self._send(404, "Not found", 'text/plain')
+        with open(path, 'rb') as file:
+            self._send(200, file.read(), 'application/javascript; charset=utf-8')
+
+    def _login(self, form):
+        username = form.get('user-name', '')
+        error = check_login(username, form.get('password', ''))
+        self._delay(username)
+        if error:
+            return self._send(200, pages.login_page(error, username))
+        expires = time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime(time.time() + SESSION_SECONDS))
+        return self._redirect('/inventory.html', [f"{SESSION_COOKIE}={username}; Path=/; Expires={expires}"])
+
+    def _update_cart(self, form):
+        cart = self._cart()
+        item = int(form['id']) if form.get('id', '').isdigit() else None
+        if item in PRODUCTS_BY_ID:
+            if form.get('op') == 'add' and item not in cart:
+                cart.append(item)
+            elif form.get('op') == 'remove' and item in cart:
+                cart.remove(item)
+        back = form.get('back', '/inventory.html')
+        if not back.startswith('/'):
+            back = '/inventory.html'
+        return self._redirect(back, [self._cart_cookie(cart)])
+
+    def _checkout_information(self, form):
+        values = {name: form.get(name, '').strip() for name in ('firstName', 'lastName', 'postalCode')}
+        for name, label in (('firstName', "First Name"), ('lastName', "Last Name"), ('postalCode', "Postal Code")):
+            if not values[name]:
+                page = pages.checkout_step_one_page(self._cart(), f"Error: {label} is required", values)
+                return self._send(200, page)
+        return self._redirect('/checkout-step-two.html')
+
+
+class LocalApp:
+    """Runs the stand-in server on a background thread of the current process."""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, glitch_delay=1.0, verbose=False):
+        """
+        Initialize the launcher.
+
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind (0 picks a free port)
+            latency (float): Seconds added to every page/form response
+            glitch_delay (float): Extra seconds for performance_glitch_user requests
+            verbose (bool): Log every request to stderr
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.glitch_delay = glitch_delay
+        self.verbose = verbose
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        """Base URL of the running server (no trailing slash)."""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """Start serving; returns self so it can be chained."""
+        self._server = ThreadingHTTPServer((self.host, self.port), StandInHandler)
+        self._server.daemon_threads = True
+        self._server.app = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='local-app', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
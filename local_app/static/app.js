@@ -0,0 +1,123 @@
+/*
+ * Client-side behaviour of the local Sauce Demo stand-in.
+ *
+ * Like www.saucedemo.com, the cart lives in localStorage['cart-contents'] as a
+ * JSON array of product ids and add/remove/sort happen in-page. The cart is
+ * mirrored into a 'cart-contents' cookie so the server can render the cart and
+ * checkout pages, which also keeps every page usable without JavaScript.
+ */
+(function () {
+    var KEY = 'cart-contents';
+    var body = document.body;
+
+    function parseCookieCart(value) {
+        return value ? value.split('-').filter(Boolean).map(Number) : [];
+    }
+
+    function formatCart(ids) {
+        return ids.join('-');
+    }
+
+    function loadCart() {
+        try {
+            return JSON.parse(window.localStorage.getItem(KEY));
+        } catch (e) {
+            return null;
+        }
+    }
+
+    function saveCart(ids) {
+        window.localStorage.setItem(KEY, JSON.stringify(ids));
+        document.cookie = KEY + '=' + formatCart(ids) + '; path=/';
+    }
+
+    // -- Reconcile storage with what the server rendered
+    var serverCart = parseCookieCart(body.getAttribute('data-cart'));
+    var localCart = loadCart();
+    if (body.hasAttribute('data-cart-authoritative') || !Array.isArray(localCart)) {
+        saveCart(serverCart);
+    } else if (formatCart(localCart) !== formatCart(serverCart)) {
+        // Storage was changed directly (e.g. injected by a test): re-render from it
+        saveCart(localCart);
+        window.location.reload();
+        return;
+    }
+
+    function updateBadge(count) {
+        var link = document.querySelector('.shopping_cart_link');
+        if (!link) {
+            return;
+        }
+        var badge = link.querySelector('.shopping_cart_badge');
+        if (count === 0 && badge) {
+            link.removeChild(badge);
+        } else if (count > 0) {
+            if (!badge) {
+                badge = document.createElement('span');
+                badge.className = 'shopping_cart_badge';
+                badge.setAttribute('data-test', 'shopping-cart-badge');
+                link.appendChild(badge);
+            }
+            badge.textContent = String(count);
+        }
+    }
+
+    // -- Add / remove buttons
+    Array.prototype.forEach.call(document.querySelectorAll('form.cart-form'), function (form) {
+        form.addEventListener('submit', function (event) {
+            event.preventDefault();
+            var id = Number(form.elements.id.value);
+            var op = form.elements.op.value;
+            var cart = loadCart() || [];
+            var button = form.querySelector('button');
+            var slug = button.getAttribute('data-slug');
+            if (op === 'add') {
+                if (cart.indexOf(id) === -1) {
+                    cart.push(id);
+                }
+                form.elements.op.value = 'remove';
+                button.setAttribute('data-test', 'remove-' + slug);
+                button.id = 'remove-' + slug;
+                button.className = 'btn btn_secondary btn_small btn_inventory';
+                button.textContent = 'Remove';
+            } else {
+                cart = cart.filter(function (item) { return item !== id; });
+                var row = form.closest('.cart_item');
+                if (row) {
+                    row.parentNode.removeChild(row);
+                } else {
+                    form.elements.op.value = 'add';
+                    button.setAttribute('data-test', 'add-to-cart-' + slug);
+                    button.id = 'add-to-cart-' + slug;
+                    button.className = 'btn btn_primary btn_small btn_inventory';
+                    button.textContent = 'Add to cart';
+                }
+            }
+            saveCart(cart);
+            updateBadge(cart.length);
+        });
+    });
+
+    // -- Sorting happens in-page, like the real inventory
+    var sortSelect = document.querySelector('.product_sort_container');
+    var list = document.querySelector('.inventory_list');
+    if (sortSelect && list) {
+        sortSelect.addEventListener('change', function () {
+            var option = sortSelect.value;
+            var rows = Array.prototype.slice.call(list.querySelectorAll('.inventory_item'));
+            var name = function (row) { return row.getAttribute('data-name'); };
+            var price = function (row) { return Number(row.getAttribute('data-price')); };
+            rows.sort(function (a, b) {
+                if (option === 'lohi') { return price(a) - price(b); }
+                if (option === 'hilo') { return price(b) - price(a); }
+                var order = name(a) < name(b) ? -1 : (name(a) > name(b) ? 1 : 0);
+                return option === 'za' ? -order : order;
+            });
+            rows.forEach(function (row) { list.appendChild(row); });
+            var active = document.querySelector('.active_option');
+            if (active) {
+                active.textContent = sortSelect.options[sortSelect.selectedIndex].text;
+            }
+        });
+    }
+})();
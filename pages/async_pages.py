@@ -0,0 +1,444 @@
+"""Awaitable counterparts of the page objects, for AsyncWebDriver sessions.
+
+Locators, the snapshot script and the page-state probe are shared with the
+synchronous page objects; only the waiting differs: conditions are polled
+with asyncio.sleep, so other sessions on the event loop run in between.
+"""
+
+import asyncio
+import time
+
+from selenium.common.exceptions import (NoSuchElementException, StaleElementReferenceException,
+                                        TimeoutException, WebDriverException)
+
+from pages.cart_page import CartPage
+from pages.checkout_page import CheckoutCompletePage, CheckoutStepOnePage, CheckoutStepTwoPage
+from pages.login_page import LoginPage
+from pages.products_page import ProductsPage
+from pages.snapshot import SNAPSHOT_SCRIPT, build_snapshot
+from pages.wait_engine import NAVIGATION_MARK_SCRIPT, NAVIGATION_STATE_SCRIPT, PAGE_STATE_SCRIPT
+from utils import config
+from utils.config import EXPLICIT_WAIT, SETTLE_QUIET_MS, SETTLE_TIMEOUT
+from utils.instrumentation import recorder, timed
+from utils.session_cache import CAPTURE_STORAGE_SCRIPT, INJECT_STORAGE_SCRIPT, SessionCache, session_cache
+
+
+VISIBLE_SCRIPT = """
+var el = arguments[0], style = window.getComputedStyle(el);
+return style.visibility !== 'hidden' && style.display !== 'none'
+    && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+"""
+
+
+class AsyncBasePage:
+    """Base class for the awaitable page objects."""
+
+    def __init__(self, driver, timeout=EXPLICIT_WAIT, poll_frequency=0.05):
+        """
+        Initialize the page with an AsyncWebDriver.
+
+        Args:
+            driver (AsyncWebDriver): Session to drive
+            timeout (float): Default budget for waits in seconds
+            poll_frequency (float): Seconds between condition checks
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+
+    async def wait_for(self, condition, timeout=None, message=""):
+        """
+        Await condition() until it returns a truthy value.
+
+        Missing or stale elements count as "not yet", as in WebDriverWait.
+
+        Returns:
+            The condition's truthy return value
+        """
+        budget = timeout or self.timeout
+        name = getattr(condition, '__qualname__', 'condition').split('.<locals>')[0]
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            while True:
+                try:
+                    value = await condition()
+                    if value:
+                        return value
+                except (NoSuchElementException, StaleElementReferenceException):
+                    pass
+                if time.perf_counter() - start >= budget:
+                    timed_out = True
+                    raise TimeoutException(message)
+                await asyncio.sleep(self.poll_frequency)
+        finally:
+            recorder.record('wait', name, start, time.perf_counter() - start,
+                            budget_s=budget, timed_out=timed_out, transport='async')
+
+    async def settle(self, timeout=SETTLE_TIMEOUT):
+        """Best-effort wait until the page is loaded, quiet, network-idle and not animating."""
+        async def settled():
+            state = await self.driver.execute_script(PAGE_STATE_SCRIPT)
+            return (state['readyState'] in ('interactive', 'complete')
+                    and state['quietMs'] >= SETTLE_QUIET_MS
+                    and state['pendingRequests'] == 0
+                    and state['runningAnimations'] == 0)
+        try:
+            await self.wait_for(settled, timeout)
+            return True
+        except TimeoutException:
+            return False
+        except WebDriverException as e:
+            print(f"Could not read page state while settling: {e.msg}")
+            return False
+
+    async def load(self, url, timeout=None):
+        """Open a URL and wait until the new document has committed (see WaitEngine.load)."""
+        try:
+            await self.driver.execute_script(NAVIGATION_MARK_SCRIPT)
+        except WebDriverException:
+            pass  # No scriptable document yet; any document after get() is the new one
+        await self.driver.get(url)
+
+        async def loaded():
+            try:
+                return await self.driver.execute_script(NAVIGATION_STATE_SCRIPT) in ('interactive', 'complete')
+            except WebDriverException:
+                return False  # Read while the old document was being torn down
+        await self.wait_for(loaded, timeout, message=f"{url} did not load")
+
+    @timed('page')
+    async def find_element(self, locator):
+        """Find element, waiting for it to be present."""
+        return await self.wait_for(lambda: self.driver.find_element(*locator),
+                                   message=f"Element {locator} not found")
+
+    @timed('page')
+    async def find_elements(self, locator):
+        """Find multiple elements, waiting for at least one to be present."""
+        return await self.wait_for(lambda: self.driver.find_elements(*locator),
+                                   message=f"No elements {locator} found")
+
+    async def _visible_element(self, locator, timeout=None):
+        async def visible():
+            element = await self.driver.find_element(*locator)
+            return element if await self.driver.execute_script(VISIBLE_SCRIPT, element) else None
+        return await self.wait_for(visible, timeout, message=f"Element {locator} not visible")
+
+    @timed('page')
+    async def click(self, locator):
+        """Click on element once visible, then wait for the page to settle."""
+        element = await self._visible_element(locator)
+        await element.click()
+        await self.settle()
+
+    @timed('page')
+    async def enter_text(self, locator, text):
+        """Enter text into input field, verifying the value (with retries)."""
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                element = await self._visible_element(locator)
+                await element.click()
+                await element.clear()
+                await element.send_keys(text)
+
+                async def has_text():
+                    return await element.get_property('value') == text
+                await self.wait_for(has_text, timeout=2, message=f"Value of {locator} did not become {text!r}")
+                break
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    print(f"Retry {attempt + 1}/{max_retries} for enter_text: {e}")
+                    await self.settle()
+                else:
+                    print(f"Failed to enter text after {max_retries} attempts: {e}")
+                    raise
+
+    @timed('page')
+    async def get_text(self, locator):
+        """Get text from element."""
+        return await (await self.find_element(locator)).text()
+
+    @timed('page')
+    async def is_element_visible(self, locator, timeout=10):
+        """Check if element becomes visible within the timeout."""
+        try:
+            await self._visible_element(locator, timeout)
+            return True
+        except TimeoutException:
+            return False
+
+    @timed('page')
+    async def is_element_present(self, locator):
+        """Check if element is present in DOM (no waiting)."""
+        return bool(await self.driver.find_elements(*locator))
+
+    @timed('page')
+    async def snapshot(self, ready_locator=None):
+        """Read the page's structured data (PageSnapshot) in a single script execution."""
+        if ready_locator is not None:
+            await self.find_element(ready_locator)
+        return build_snapshot(await self.driver.execute_script(SNAPSHOT_SCRIPT))
+
+
+class AsyncLoginPage(AsyncBasePage):
+    """Awaitable LoginPage."""
+
+    USERNAME_INPUT = LoginPage.USERNAME_INPUT
+    PASSWORD_INPUT = LoginPage.PASSWORD_INPUT
+    LOGIN_BUTTON = LoginPage.LOGIN_BUTTON
+    ERROR_MESSAGE = LoginPage.ERROR_MESSAGE
+
+    def __init__(self, driver):
+        """Initialize login page."""
+        super().__init__(driver)
+        self.url = config.BASE_URL
+        self.inventory_url = f"{config.BASE_URL}/inventory.html"
+
+    async def navigate(self):
+        """Navigate to login page."""
+        await self.driver.get(self.url)
+
+    async def login(self, username, password):
+        """Complete login process."""
+        await self.enter_text(self.USERNAME_INPUT, username)
+        await self.enter_text(self.PASSWORD_INPUT, password)
+        await self.click(self.LOGIN_BUTTON)
+
+    async def fast_login(self, username, password, cache=session_cache):
+        """
+        Log in by injecting a cached session, using the UI only once per user.
+
+        Shares the process-wide session cache with LoginPage.fast_login().
+
+        Returns:
+            bool: True if a cached session was used, False if the UI was used
+        """
+        session = cache.get(username)
+        if session is not None:
+            await self.load(self.url)
+            for cookie in SessionCache.cookies_to_add(session):
+                await self.driver.add_cookie(cookie)
+            await self.driver.execute_script(INJECT_STORAGE_SCRIPT, *SessionCache.storage_arguments(session))
+            await self.load(self.inventory_url)
+            if (await self.driver.current_url()).startswith(self.inventory_url):
+                return True
+            cache.invalidate(username)
+
+        await self.navigate()
+        await self.login(username, password)
+
+        async def landed():
+            return ((await self.driver.current_url()).startswith(self.inventory_url)
+                    or await self.driver.find_elements(*self.ERROR_MESSAGE))
+        await self.wait_for(landed, message="Login did not finish")
+        if (await self.driver.current_url()).startswith(self.inventory_url):
+            storage = await self.driver.execute_script(CAPTURE_STORAGE_SCRIPT)
+            cache.store(username, SessionCache.build_session(await self.driver.get_cookies(), storage))
+        return False
+
+    async def get_error_message(self):
+        """Get error message text."""
+        return await self.get_text(self.ERROR_MESSAGE)
+
+    async def is_error_displayed(self):
+        """Check if error message is displayed."""
+        return await self.is_element_visible(self.ERROR_MESSAGE)
+
+
+class AsyncProductsPage(AsyncBasePage):
+    """Awaitable ProductsPage."""
+
+    TITLE = ProductsPage.TITLE
+    INVENTORY_ITEMS = ProductsPage.INVENTORY_ITEMS
+    ADD_TO_CART_BUTTONS = ProductsPage.ADD_TO_CART_BUTTONS
+    CART_LINK = ProductsPage.CART_LINK
+    SORT_DROPDOWN = ProductsPage.SORT_DROPDOWN
+
+    async def is_products_page_displayed(self):
+        """Check if products page is displayed."""
+        return await self.is_element_visible(self.TITLE) and "Products" in await self.get_text(self.TITLE)
+
+    async def get_products(self):
+        """Get all inventory items as ItemRecords in one round-trip."""
+        return (await self.snapshot(self.INVENTORY_ITEMS)).items
+
+    async def get_product_names(self):
+        """Get list of all product names."""
+        return [item.name for item in await self.get_products()]
+
+    async def get_product_prices(self):
+        """Get list of all product prices as floats."""
+        return [item.price for item in await self.get_products()]
+
+    async def get_cart_badge_count(self):
+        """Get cart badge count (0 without a badge)."""
+        return (await self.snapshot()).cart_badge
+
+    async def add_products_to_cart(self, count):
+        """Add products to cart by clicking their buttons (looked up once)."""
+        buttons = await self.find_elements(self.ADD_TO_CART_BUTTONS)
+        for button in buttons[:count]:
+            before = await self.get_cart_badge_count()
+            await button.click()
+
+            async def badge_changed():
+                return await self.get_cart_badge_count() != before
+            await self.wait_for(badge_changed, message="Cart badge did not change")
+
+    async def set_cart_contents(self, product_ids):
+        """Replace the cart in one storage write and one reload (see ProductsPage)."""
+        ids = [int(product_id) for product_id in product_ids]
+        await self.driver.execute_script(ProductsPage.SET_CART_SCRIPT, ids)
+
+        async def reloaded():
+            try:
+                return await self.driver.execute_script(ProductsPage.CART_RELOADED_SCRIPT)
+            except WebDriverException:
+                return False  # Old document being torn down
+        await self.wait_for(reloaded, message="Page did not reload after setting the cart")
+        await self.settle()
+
+        async def badge_matches():
+            try:
+                return await self.get_cart_badge_count() == len(ids)
+            except WebDriverException:
+                return False  # Still reloading
+        await self.wait_for(badge_matches, message=f"Cart badge did not show {len(ids)} after setting the cart")
+
+    async def fill_cart(self, count):
+        """Put the first `count` listed products in the cart."""
+        await self.set_cart_contents([item.id for item in (await self.get_products())[:count]])
+
+    async def click_cart(self):
+        """Click on cart icon."""
+        await self.click(self.CART_LINK)
+
+    async def select_sort_option(self, option_value):
+        """Select sorting option ('az', 'za', 'lohi', 'hilo') and wait for the list to re-render."""
+        items = await self.get_products()
+        dropdown = await self.find_element(self.SORT_DROPDOWN)
+        option = await self.driver.execute_script(
+            "return arguments[0].querySelector('option[value=\"' + arguments[1] + '\"]');", dropdown, option_value)
+        await option.click()
+        if ProductsPage.in_sort_order(items, option_value):
+            return  # Nothing to re-render
+        before = [item.id for item in items]
+
+        async def changed():
+            return [item.id for item in (await self.snapshot()).items] != before
+        try:
+            await self.wait_for(changed, SETTLE_TIMEOUT)
+        except TimeoutException:
+            print(f"Product list did not change after sorting by '{option_value}'")
+
+    async def is_sorted_by(self, option_value):
+        """Check whether the product list is currently in the given sort order."""
+        return ProductsPage.in_sort_order(await self.get_products(), option_value)
+
+
+class AsyncCartPage(AsyncBasePage):
+    """Awaitable CartPage."""
+
+    TITLE = CartPage.TITLE
+    REMOVE_BUTTONS = CartPage.REMOVE_BUTTONS
+    CHECKOUT_BUTTON = CartPage.CHECKOUT_BUTTON
+
+    async def is_cart_page_displayed(self):
+        """Check if cart page is displayed."""
+        return await self.is_element_visible(self.TITLE) and "Your Cart" in await self.get_text(self.TITLE)
+
+    async def get_cart_items(self):
+        """Get all cart rows as ItemRecords in one round-trip."""
+        return (await self.snapshot(self.TITLE)).items
+
+    async def get_cart_item_names(self):
+        """Get list of item names in cart."""
+        return [item.name for item in await self.get_cart_items()]
+
+    async def get_cart_item_count(self):
+        """Get number of items in cart."""
+        return len(await self.get_cart_items())
+
+    async def remove_item_by_index(self, index):
+        """Remove item from cart by index (0-based)."""
+        buttons = await self.driver.find_elements(*self.REMOVE_BUTTONS)
+        if index < len(buttons):
+            before = len(buttons)
+            await buttons[index].click()
+
+            async def removed():
+                return len(await self.driver.find_elements(*self.REMOVE_BUTTONS)) < before
+            await self.wait_for(removed, message="Cart item was not removed")
+
+    async def click_checkout(self):
+        """Click checkout button."""
+        await self.click(self.CHECKOUT_BUTTON)
+
+    async def is_cart_empty(self):
+        """Check if cart is empty."""
+        return await self.get_cart_item_count() == 0
+
+
+class AsyncCheckoutStepOnePage(AsyncBasePage):
+    """Awaitable CheckoutStepOnePage."""
+
+    TITLE = CheckoutStepOnePage.TITLE
+    FIRST_NAME_INPUT = CheckoutStepOnePage.FIRST_NAME_INPUT
+    LAST_NAME_INPUT = CheckoutStepOnePage.LAST_NAME_INPUT
+    POSTAL_CODE_INPUT = CheckoutStepOnePage.POSTAL_CODE_INPUT
+    CONTINUE_BUTTON = CheckoutStepOnePage.CONTINUE_BUTTON
+    ERROR_MESSAGE = CheckoutStepOnePage.ERROR_MESSAGE
+
+    async def fill_checkout_form(self, first_name, last_name, postal_code):
+        """Fill complete checkout form."""
+        await self.enter_text(self.FIRST_NAME_INPUT, first_name)
+        await self.enter_text(self.LAST_NAME_INPUT, last_name)
+        await self.enter_text(self.POSTAL_CODE_INPUT, postal_code)
+
+    async def click_continue(self):
+        """Click continue button."""
+        await self.click(self.CONTINUE_BUTTON)
+
+    async def get_error_message(self):
+        """Get error message."""
+        return await self.get_text(self.ERROR_MESSAGE)
+
+
+class AsyncCheckoutStepTwoPage(AsyncBasePage):
+    """Awaitable CheckoutStepTwoPage."""
+
+    TOTAL = CheckoutStepTwoPage.TOTAL
+    FINISH_BUTTON = CheckoutStepTwoPage.FINISH_BUTTON
+
+    async def get_overview(self):
+        """Get items and summary amounts (PageSnapshot) in one round-trip."""
+        return await self.snapshot(self.TOTAL)
+
+    async def get_summary(self):
+        """Get subtotal, tax and total as a SummaryRecord."""
+        return (await self.get_overview()).summary
+
+    async def verify_order_summary(self):
+        """Verify that subtotal + tax = total."""
+        subtotal, tax, total = await self.get_summary()
+        return abs(total - round(subtotal + tax, 2)) < 0.01
+
+    async def click_finish(self):
+        """Click finish button."""
+        await self.click(self.FINISH_BUTTON)
+
+
+class AsyncCheckoutCompletePage(AsyncBasePage):
+    """Awaitable CheckoutCompletePage."""
+
+    COMPLETE_HEADER = CheckoutCompletePage.COMPLETE_HEADER
+
+    async def get_success_message(self):
+        """Get success message."""
+        return await self.get_text(self.COMPLETE_HEADER)
+
+    async def is_order_successful(self):
+        """Check if order was successful."""
+        return "Thank you for your order" in await self.get_success_message()
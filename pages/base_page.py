@@ -1,10 +1,77 @@
 """Base page class with common methods for all page objects."""
 
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 import time
-from utils.config import SLOW_MO
+from contextlib import contextmanager
+from pages.snapshot import SNAPSHOT_SCRIPT, build_snapshot
+from pages.wait_engine import WaitEngine
+from utils.config import SLOW_MO, EXPLICIT_WAIT, IMPLICIT_WAIT
+from utils.frame_recorder import frame_recorder
+from utils.instrumentation import TimedWait, recorder, timed
+from utils.page_metrics import page_metrics
+
+
+# Counts the elements matching a locator (and how many are visible) in one
+# round-trip. Unlike find_elements it never blocks: no implicit wait, no presence wait.
+COUNT_SCRIPT = """
+var by = arguments[0], value = arguments[1], nodes = [];
+if (by === 'xpath') {
+    var found = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (var i = 0; i < found.snapshotLength; i++) { nodes.push(found.snapshotItem(i)); }
+} else {
+    nodes = Array.prototype.slice.call(document.querySelectorAll(value));
+}
+var visible = nodes.filter(function (node) {
+    return node.getClientRects().length > 0 && window.getComputedStyle(node).visibility !== 'hidden';
+}).length;
+return {count: nodes.length, visible: visible};
+"""
+
+# Sets form fields the way typing would (through the native value setter, so
+# frameworks such as React see the change, then input/change events) and reads
+# every value back in the same round-trip. One status per field: 'ok',
+# 'missing', 'not editable' or 'mismatch'. Inputs whose type is not in
+# arguments[1] (checkbox, radio, file, ...) are 'not editable': a value is not
+# how they are filled.
+FILL_FORM_SCRIPT = """
+var fields = arguments[0], textTypes = arguments[1], results = [];
+fields.forEach(function (field) {
+    var element = field[0] === 'xpath'
+        ? document.evaluate(field[1], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        : document.querySelector(field[1]);
+    if (!element) { results.push('missing'); return; }
+    if (element.disabled || element.readOnly || element.getClientRects().length === 0
+            || (element instanceof HTMLInputElement && textTypes.indexOf(element.type) < 0)) {
+        results.push('not editable');
+        return;
+    }
+    var prototype = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+        : element instanceof HTMLSelectElement ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+    element.focus();
+    Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, field[2]);
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+    element.blur();
+    results.push(element.value === field[2] ? 'ok' : 'mismatch');
+});
+return results;
+"""
+
+# Input types FILL_FORM_SCRIPT sets by value
+TEXT_INPUT_TYPES = ('text', 'password', 'email', 'number', 'search', 'tel', 'url')
+
+# Locator strategies as CSS selectors for the page scripts (XPath is evaluated as is)
+_CSS_FOR = {
+    By.CSS_SELECTOR: lambda value: value,
+    By.ID: lambda value: f'[id="{value}"]',
+    By.NAME: lambda value: f'[name="{value}"]',
+    By.CLASS_NAME: lambda value: f'.{value}',
+    By.TAG_NAME: lambda value: value,
+}
+# Strategies the page scripts cannot express: counted with find_elements instead
+_FIND_ONLY = (By.LINK_TEXT, By.PARTIAL_LINK_TEXT)
 
 
 class BasePage:
@@ -13,33 +80,61 @@ class BasePage:
     def __init__(self, driver):
         """Initialize base page with driver."""
         self.driver = driver
-        self.wait = WebDriverWait(driver, 15)
+        self.wait = TimedWait(driver, EXPLICIT_WAIT)
+        self.waits = WaitEngine(driver)
         self.slow_mo = SLOW_MO
+        self.last_check = None  # check, locator, result and ms of the latest count/presence/absence check
     
     def _slow_mo_delay(self):
-        """Add delay if slow motion is enabled."""
+        """Pause for human viewers in demo slow-motion mode (never needed for correctness)."""
         if self.slow_mo > 0:
-            time.sleep(self.slow_mo)
+            with recorder.span('sleep', 'slow_mo', seconds=self.slow_mo):
+                time.sleep(self.slow_mo)
+    
+    def _action_done(self, label):
+        """Buffer a frame of the finished action for failure replay, then apply demo slow motion."""
+        frame_recorder.capture(self.driver, label)
+        self._slow_mo_delay()
+    
+    def _after_action(self, label):
+        """Wait for the page to settle after an action, then finish it (see _action_done)."""
+        self.waits.settle()
+        self._action_done(label)
+    
+    @contextmanager
+    def transition(self, page):
+        """
+        Measure the move to another page caused by the wrapped action.
+
+        Collects Navigation/Resource Timing and long tasks (see utils.page_metrics)
+        and fails with PageBudgetExceeded if the page is over its budget.
+
+        Args:
+            page (str): Target page, its URL path without '.html' (e.g. 'inventory')
+        """
+        started = page_metrics.start(self.driver)
+        yield
+        page_metrics.finish(self.driver, page, started)
     
+    @timed('page')
     def find_element(self, locator):
         """Find element with explicit wait."""
-        element = self.wait.until(EC.presence_of_element_located(locator))
-        self._slow_mo_delay()
-        return element
+        return self.wait.until(EC.presence_of_element_located(locator))
     
+    @timed('page')
     def find_elements(self, locator):
         """Find multiple elements with explicit wait."""
         self.wait.until(EC.presence_of_element_located(locator))
-        elements = self.driver.find_elements(*locator)
-        self._slow_mo_delay()
-        return elements
+        return self.driver.find_elements(*locator)
     
+    @timed('page')
     def click(self, locator):
         """Click on element with explicit wait."""
         element = self.wait.until(EC.element_to_be_clickable(locator))
         element.click()
-        self._slow_mo_delay()
+        self._after_action(f"click {locator[1]}")
     
+    @timed('page')
     def enter_text(self, locator, text):
         """Enter text into input field with retry for security software."""
         max_retries = 3
@@ -51,26 +146,32 @@ class BasePage:
                 element.click()  # Focus the element
                 element.clear()
                 element.send_keys(text)
-                
-                self._slow_mo_delay()
+                # Expected post-action state: the field holds exactly the text
+                self.waits.wait_for(
+                    lambda driver: element.get_attribute('value') == text,
+                    timeout=2, message=f"Value of {locator} did not become {text!r}"
+                )
+                self._action_done(f"type {locator[1]}")
                 break  # Success, exit retry loop
                 
             except Exception as e:
                 if attempt < max_retries - 1:
                     print(f"Retry {attempt + 1}/{max_retries} for enter_text: {e}")
-                    time.sleep(1)  # Wait before retry
+                    self.waits.settle()  # Let whatever interfered finish before retrying
                 else:
                     print(f"Failed to enter text after {max_retries} attempts: {e}")
                     raise
 
+    @timed('page')
     def get_text(self, locator):
         """Get text from element."""
         return self.find_element(locator).text
     
+    @timed('page')
     def is_element_visible(self, locator, timeout=10):
         """Check if element is visible."""
         try:
-            WebDriverWait(self.driver, timeout).until(
+            TimedWait(self.driver, timeout).until(
                 EC.visibility_of_element_located(locator)
             )
             return True
@@ -78,14 +179,161 @@ class BasePage:
             print(f"TimeoutException in is_element_visible: {T}")
             return False
 
-    def is_element_present(self, locator):
-        """Check if element is present in DOM."""
-        try:
-            self.driver.find_element(*locator)
-            return True
-        except NoSuchElementException:
-            return False
+    @staticmethod
+    def _script_locator(locator):
+        """Return (strategy, selector) for the page scripts: CSS, or XPath as is."""
+        by, value = locator
+        if by == By.XPATH:
+            return by, value
+        if by not in _CSS_FOR:
+            raise ValueError(f"Locator strategy {by!r} cannot be used in page scripts")
+        return by, _CSS_FOR[by](value)
+
+    @timed('page')
+    def fill_form(self, fields, submit=None, typed=()):
+        """
+        Fill several fields in one script execution, then optionally submit.
+
+        Values are set with input/change events and verified in the same
+        round-trip. Fields the script could not fill (missing, not yet
+        editable, rejecting the value, or not a text input) and fields
+        listed in `typed` are filled by hand instead: typed key by key with
+        enter_text, checkboxes and radios clicked into the state their text
+        asks for ('true', 'on', 'yes' or '1' means checked), file inputs
+        sent the file path.
+
+        Args:
+            fields (dict): Locator -> text, filled in order
+            submit (tuple): Optional button to click afterwards
+            typed (iterable): Locators that need real keystrokes
+
+        Returns:
+            list: Locators that were typed instead of set by the script
+        """
+        batch = [(locator, str(text)) for locator, text in fields.items() if locator not in typed]
+        fallback = [locator for locator in fields if locator in typed]
+        if batch:
+            self.wait.until(EC.visibility_of_element_located(batch[0][0]))
+            statuses = self.driver.execute_script(
+                FILL_FORM_SCRIPT, [[*self._script_locator(locator), text] for locator, text in batch],
+                list(TEXT_INPUT_TYPES))
+            for (locator, _), status in zip(batch, statuses):
+                if status != 'ok':
+                    print(f"Batched fill of {locator[1]} failed ({status}), filling it by hand")
+                    fallback.append(locator)
+        for locator in fallback:
+            self._fill_by_hand(locator, str(fields[locator]))
+        self._action_done(f"fill {', '.join(locator[1] for locator in fields)}")
+        if submit is not None:
+            self.click(submit)
+        return fallback
+
+    def _fill_by_hand(self, locator, text):
+        """Type a field, click a checkbox/radio into the wanted state, or send a file input its path."""
+        element = self.wait.until(EC.presence_of_element_located(locator))
+        kind = (element.get_attribute('type') or '').lower() if element.tag_name.lower() == 'input' else ''
+        if kind in ('checkbox', 'radio'):
+            checked = text.strip().lower() in ('true', 'on', 'yes', '1')
+            if element.is_selected() != checked and (checked or kind == 'checkbox'):
+                self.click(locator)
+        elif kind == 'file':
+            element.send_keys(text)  # Clicking would open the file chooser
+            self._action_done(f"attach {locator[1]}")
+        else:
+            self.enter_text(locator, text)
+
+    def _count(self, locator, visible_only=False):
+        """Count matching elements now, in one script execution (one find_elements call for link texts)."""
+        if locator[0] in _FIND_ONLY:
+            # No implicit wait: a missing element must count as 0 now, not after IMPLICIT_WAIT
+            self.driver.implicitly_wait(0)
+            try:
+                elements = self.driver.find_elements(*locator)
+            finally:
+                self.driver.implicitly_wait(IMPLICIT_WAIT)
+            return sum(1 for element in elements if element.is_displayed()) if visible_only else len(elements)
+        counts = self.driver.execute_script(COUNT_SCRIPT, *self._script_locator(locator))
+        return counts['visible'] if visible_only else counts['count']
+
+    def _check(self, name, locator, ready_locator, decide):
+        """
+        Run a count/presence/absence check once the page is ready and settled.
+
+        The result and its duration are kept in last_check and recorded as a
+        'check' span, so slow checks show up in the timings report.
+        """
+        start = time.perf_counter()
+        if ready_locator is not None:
+            self.wait.until(EC.presence_of_element_located(ready_locator))
+        self.waits.settle()
+        result = decide()
+        elapsed = time.perf_counter() - start
+        recorder.record('check', name, start, elapsed, locator=locator[1], result=result)
+        self.last_check = {'check': name, 'locator': locator[1], 'result': result,
+                           'ms': round(elapsed * 1000, 1)}
+        return result
+
+    def count_elements(self, locator, visible_only=False, ready_locator=None):
+        """
+        Count matching elements without waiting for any to appear.
+
+        Args:
+            locator (tuple): Elements to count
+            visible_only (bool): Count only displayed elements
+            ready_locator (tuple): Optional element that marks the page as loaded
+                (present whether or not anything matches `locator`)
+
+        Returns:
+            int: Number of matching elements (0 without paying a timeout)
+        """
+        return self._check('count', locator, ready_locator, lambda: self._count(locator, visible_only))
+
+    def is_element_present(self, locator, ready_locator=None):
+        """Check if element is present in DOM (decided once the page has settled, without waiting for it)."""
+        return self._check('present', locator, ready_locator, lambda: self._count(locator) > 0)
+
+    def is_element_absent(self, locator, timeout=0, visible_only=False, ready_locator=None):
+        """
+        Check that no element matches, deciding as soon as the page has settled.
+
+        Args:
+            locator (tuple): Elements that should not be there
+            timeout (float): Extra seconds to wait for present elements to go away (0 = decide now)
+            visible_only (bool): Ignore matching elements that are not displayed
+            ready_locator (tuple): Optional element that marks the page as loaded
+
+        Returns:
+            bool: True if nothing matches
+        """
+        def decide():
+            if self._count(locator, visible_only) == 0:
+                return True
+            if not timeout:
+                return False
+            try:
+                self.waits.wait_for(lambda driver: self._count(locator, visible_only) == 0, timeout=timeout)
+                return True
+            except TimeoutException:
+                return False
+        return self._check('absent', locator, ready_locator, decide)
     
+    @timed('page')
     def get_attribute(self, locator, attribute):
         """Get attribute value from element."""
         return self.find_element(locator).get_attribute(attribute)
+
+    @timed('page')
+    def snapshot(self, ready_locator=None):
+        """
+        Read the page's structured data in a single script execution.
+
+        Args:
+            ready_locator (tuple): Optional locator to wait for before reading
+
+        Returns:
+            PageSnapshot: Items (id, name, price, button data-test), title,
+            cart badge count, button data-test ids and summary amounts
+        """
+        if ready_locator is not None:
+            self.wait.until(EC.presence_of_element_located(ready_locator))
+        return build_snapshot(self.driver.execute_script(SNAPSHOT_SCRIPT))
@@ -26,28 +26,37 @@ class CartPage(BasePage):
         return self.is_element_visible(self.TITLE) and "Your Cart" in self.get_text(self.TITLE)
     
     def get_cart_item_count(self):
-        """Get number of items in cart."""
-        try:
-            items = self.find_elements(self.CART_ITEMS)
-            return len(items)
-        except:
-            return 0
+        """Get number of items in cart (0 for an empty cart, without waiting for rows to appear)."""
+        return self.count_elements(self.CART_ITEMS, ready_locator=self.TITLE)
+    
+    def get_cart_items(self):
+        """Get all cart rows as ItemRecords in one round-trip."""
+        return self.snapshot(self.TITLE).items
     
     def get_cart_item_names(self):
         """Get list of item names in cart."""
-        elements = self.find_elements(self.CART_ITEM_NAMES)
-        return [elem.text for elem in elements]
+        return [item.name for item in self.get_cart_items()]
     
     def remove_item_by_index(self, index):
         """Remove item from cart by index (0-based)."""
         buttons = self.find_elements(self.REMOVE_BUTTONS)
         if index < len(buttons):
+            before = self._count_remove_buttons()
             buttons[index].click()
+            # Works on both the cart page and the products page
+            self.waits.wait_for(lambda driver: self._count_remove_buttons() < before,
+                                message="Cart item was not removed")
+            self._action_done(f"remove cart item {index}")
+    
+    def _count_remove_buttons(self):
+        """Count remove buttons currently on the page in one round-trip."""
+        return sum(1 for test_id in self.snapshot().buttons if test_id.startswith('remove'))
     
     def click_checkout(self):
         """Click checkout button."""
-        self.click(self.CHECKOUT_BUTTON)
+        with self.transition('checkout-step-one'):
+            self.click(self.CHECKOUT_BUTTON)
     
     def is_cart_empty(self):
         """Check if cart is empty."""
-        return self.get_cart_item_count() == 0
+        return self.is_element_absent(self.CART_ITEMS, ready_locator=self.TITLE)
@@ -37,14 +37,17 @@ class CheckoutStepOnePage(BasePage):
         self.enter_text(self.POSTAL_CODE_INPUT, postal_code)
     
     def fill_checkout_form(self, first_name, last_name, postal_code):
-        """Fill complete checkout form."""
-        self.enter_first_name(first_name)
-        self.enter_last_name(last_name)
-        self.enter_postal_code(postal_code)
+        """Fill complete checkout form in one round-trip."""
+        self.fill_form({
+            self.FIRST_NAME_INPUT: first_name,
+            self.LAST_NAME_INPUT: last_name,
+            self.POSTAL_CODE_INPUT: postal_code,
+        })
     
     def click_continue(self):
         """Click continue button."""
-        self.click(self.CONTINUE_BUTTON)
+        with self.transition('checkout-step-two'):
+            self.click(self.CONTINUE_BUTTON)
     
     def get_error_message(self):
         """Get error message."""
@@ -72,44 +75,40 @@ class CheckoutStepTwoPage(BasePage):
         """Check if checkout step two is displayed."""
         return self.is_element_visible(self.TITLE) and "Checkout: Overview" in self.get_text(self.TITLE)
     
+    def get_overview(self):
+        """Get items and summary amounts (PageSnapshot) in one round-trip."""
+        return self.snapshot(self.TOTAL)
+    
     def get_item_prices(self):
         """Get list of item prices."""
-        elements = self.find_elements(self.CART_ITEM_PRICES)
-        prices = []
-        for elem in elements:
-            price_text = elem.text.replace('$', '')
-            prices.append(float(price_text))
-        return prices
+        return [item.price for item in self.get_overview().items]
+    
+    def get_summary(self):
+        """Get subtotal, tax and total as a SummaryRecord."""
+        return self.get_overview().summary
     
     def get_subtotal(self):
         """Get subtotal amount."""
-        text = self.get_text(self.SUBTOTAL)
-        # Format: "Item total: $value"
-        return float(text.split('$')[1])
+        return self.get_summary().subtotal
     
     def get_tax(self):
         """Get tax amount."""
-        text = self.get_text(self.TAX)
-        # Format: "Tax: $value"
-        return float(text.split('$')[1])
+        return self.get_summary().tax
     
     def get_total(self):
         """Get total amount."""
-        text = self.get_text(self.TOTAL)
-        # Format: "Total: $value"
-        return float(text.split('$')[1])
+        return self.get_summary().total
     
     def verify_order_summary(self):
         """Verify that subtotal + tax = total."""
-        subtotal = self.get_subtotal()
-        tax = self.get_tax()
-        total = self.get_total()
+        subtotal, tax, total = self.get_summary()
         expected_total = round(subtotal + tax, 2)
         return abs(total - expected_total) < 0.01  # Allow for small floating point differences
     
     def click_finish(self):
         """Click finish button."""
-        self.click(self.FINISH_BUTTON)
+        with self.transition('checkout-complete'):
+            self.click(self.FINISH_BUTTON)
 
 
 class CheckoutCompletePage(BasePage):
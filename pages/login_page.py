@@ -1,7 +1,10 @@
 """Login page object."""
 
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
 from pages.base_page import BasePage
+from utils import config
+from utils.session_cache import session_cache
 
 
 class LoginPage(BasePage):
@@ -17,7 +20,9 @@ class LoginPage(BasePage):
     def __init__(self, driver):
         """Initialize login page."""
         super().__init__(driver)
-        self.url = "https://www.saucedemo.com"
+        # Read at call time: the hooks may point BASE_URL at the local stand-in
+        self.url = config.BASE_URL
+        self.inventory_url = f"{config.BASE_URL}/inventory.html"
     
     def navigate(self):
         """Navigate to login page."""
@@ -36,11 +41,44 @@ class LoginPage(BasePage):
         self.click(self.LOGIN_BUTTON)
     
     def login(self, username, password):
-        """Complete login process."""
-        self.enter_username(username)
-        self.enter_password(password)
-        self.click_login()
+        """Complete login process (both fields filled in one round-trip)."""
+        self.fill_form({self.USERNAME_INPUT: username, self.PASSWORD_INPUT: password})
+        with self.transition('inventory'):
+            self.click_login()
     
+    def fast_login(self, username, password, cache=session_cache):
+        """
+        Log in by injecting a cached session, using the UI only once per user.
+
+        The first call for a user performs a normal UI login and caches the
+        resulting cookies/storage. Later calls inject them and open the
+        inventory page directly. A rejected session falls back to UI login.
+
+        Returns:
+            bool: True if a cached session was used, False if the UI was used
+        """
+        session = cache.get(username)
+        if session is not None:
+            cache.inject(self.driver, self.url, session)
+            self.waits.load(self.inventory_url)
+            if self.driver.current_url.startswith(self.inventory_url):
+                return True
+            cache.invalidate(username)
+
+        self.navigate()
+        self.login(username, password)
+        # Wait for either the inventory page or a login error; the error is counted by
+        # script, so a poll before the redirect never sits out the implicit wait
+        def landed(driver):
+            try:
+                return driver.current_url.startswith(self.inventory_url) or self._count(self.ERROR_MESSAGE) > 0
+            except WebDriverException:
+                return False  # Read while the redirect was replacing the page
+        self.waits.wait_for(landed, message="Login did not finish")
+        if self.driver.current_url.startswith(self.inventory_url):
+            cache.store(username, cache.capture(self.driver))
+        return False
+
     def get_error_message(self):
         """Get error message text."""
         return self.get_text(self.ERROR_MESSAGE)
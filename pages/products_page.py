@@ -1,6 +1,7 @@
 """Products page object."""
 
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.support.ui import Select
 from pages.base_page import BasePage
 
@@ -19,6 +20,19 @@ class ProductsPage(BasePage):
     CART_LINK = (By.CLASS_NAME, "shopping_cart_link")
     SORT_DROPDOWN = (By.CLASS_NAME, "product_sort_container")
     
+    # Writes the cart the way the app stores it and reloads once. The local
+    # stand-in renders from a cookie mirror of the same key, so set that too.
+    # The marker tells the old document from the reloaded one (whose badge may
+    # show the same count).
+    SET_CART_SCRIPT = """
+        var ids = arguments[0];
+        window.localStorage.setItem('cart-contents', JSON.stringify(ids));
+        document.cookie = 'cart-contents=' + ids.join('-') + '; path=/';
+        window.__cartSet = true;
+        window.location.reload();
+    """
+    CART_RELOADED_SCRIPT = "return !window.__cartSet && document.readyState !== 'loading';"
+    
     def __init__(self, driver):
         """Initialize products page."""
         super().__init__(driver)
@@ -27,54 +41,115 @@ class ProductsPage(BasePage):
         """Check if products page is displayed."""
         return self.is_element_visible(self.TITLE) and "Products" in self.get_text(self.TITLE)
     
+    def get_products(self):
+        """Get all inventory items as ItemRecords in one round-trip."""
+        return self.snapshot(self.INVENTORY_ITEMS).items
+    
     def get_product_names(self):
         """Get list of all product names."""
-        elements = self.find_elements(self.INVENTORY_ITEM_NAMES)
-        return [elem.text for elem in elements]
+        return [item.name for item in self.get_products()]
     
     def get_product_prices(self):
         """Get list of all product prices as floats."""
-        elements = self.find_elements(self.INVENTORY_ITEM_PRICES)
-        prices = []
-        for elem in elements:
-            price_text = elem.text.replace('$', '')
-            prices.append(float(price_text))
-        return prices
+        return [item.price for item in self.get_products()]
+    
+    def _click_and_wait_for_badge(self, button):
+        """Click an add/remove button and wait until the cart badge count changes."""
+        before = self.snapshot().cart_badge
+        button.click()
+        self.waits.wait_for_change(lambda: self.snapshot().cart_badge, before,
+                                   message="Cart badge did not change")
+        self._action_done("click add/remove button")
     
     def add_product_to_cart_by_index(self, index):
         """Add product to cart by index (0-based)."""
         buttons = self.find_elements(self.ADD_TO_CART_BUTTONS)
         if index < len(buttons):
-            buttons[index].click()
-            self._slow_mo_delay()
+            self._click_and_wait_for_badge(buttons[index])
     
     def add_products_to_cart(self, count):
-        """Add specified number of products to cart."""
-        for i in range(count):
-            buttons = self.find_elements(self.ADD_TO_CART_BUTTONS)
-            if i < len(buttons):
-                buttons[i].click()
-                self._slow_mo_delay()
+        """Add specified number of products to cart by clicking their buttons."""
+        # Buttons are looked up once; each keeps its element when it turns into "Remove"
+        buttons = self.find_elements(self.ADD_TO_CART_BUTTONS)
+        for button in buttons[:count]:
+            self._click_and_wait_for_badge(button)
     
-    def get_cart_badge_count(self):
-        """Get cart badge count."""
+    def set_cart_contents(self, product_ids):
+        """
+        Replace the cart with the given products in one storage write and one reload.
+        
+        For scenarios that only need a filled cart as a precondition; use
+        add_products_to_cart() to test adding items.
+        
+        Args:
+            product_ids (list): Numeric product ids (see ItemRecord.id)
+        """
+        ids = [int(product_id) for product_id in product_ids]
+        self.driver.execute_script(self.SET_CART_SCRIPT, ids)
+        self.waits.wait_for(lambda driver: self._reloaded(), message="Page did not reload after setting the cart")
+        self.waits.settle()
+        self.waits.wait_for(lambda driver: self._badge_after_reload() == len(ids),
+                            message=f"Cart badge did not show {len(ids)} after setting the cart")
+    
+    def fill_cart(self, count):
+        """Put the first `count` listed products in the cart (see set_cart_contents)."""
+        self.set_cart_contents([item.id for item in self.get_products()[:count]])
+    
+    def _reloaded(self):
+        """True once the reload started by SET_CART_SCRIPT has replaced the document."""
+        try:
+            return self.driver.execute_script(self.CART_RELOADED_SCRIPT)
+        except WebDriverException:
+            return False  # Read while the old document was being torn down
+    
+    def _badge_after_reload(self):
+        """Cart badge count, or None while the page is still reloading."""
         try:
-            return int(self.get_text(self.CART_BADGE))
-        except:
-            return 0
+            return self.snapshot().cart_badge
+        except WebDriverException:
+            return None
+    
+    def get_cart_badge_count(self):
+        """Get cart badge count (0 without a badge, read in one round-trip instead of waiting for it)."""
+        return self.snapshot(self.CART_LINK).cart_badge
     
     def click_cart(self):
         """Click on cart icon."""
-        self.click(self.CART_LINK)
+        with self.transition('cart'):
+            self.click(self.CART_LINK)
     
     def select_sort_option(self, option_value):
         """
         Select sorting option.
         Options: 'az', 'za', 'lohi', 'hilo'
         """
+        items = self.get_products()
         dropdown_element = self.find_element(self.SORT_DROPDOWN)
         select = Select(dropdown_element)
         select.select_by_value(option_value)
+        # Expected post-action state: the list re-rendered (unless it was in that order
+        # already). Whether the new order is right is for the assertion step to check.
+        if not self.in_sort_order(items, option_value):
+            before = [item.id for item in items]
+            try:
+                self.waits.wait_for_change(lambda: [item.id for item in self.snapshot().items], before,
+                                           timeout=self.waits.settle_timeout)
+            except TimeoutException:
+                print(f"Product list did not change after sorting by '{option_value}'")
+        self._action_done(f"sort {option_value}")
+    
+    def is_sorted_by(self, option_value):
+        """Check whether the product list is currently in the given sort order."""
+        return self.in_sort_order(self.get_products(), option_value)
+    
+    @staticmethod
+    def in_sort_order(items, option_value):
+        """Check whether ItemRecords are in the given sort order ('az', 'za', 'lohi', 'hilo')."""
+        if option_value in ('lohi', 'hilo'):
+            values = [item.price for item in items]
+        else:
+            values = [item.name for item in items]
+        return values == sorted(values, reverse=option_value in ('hilo', 'za'))
     
     def sort_price_low_to_high(self):
         """Sort products by price: low to high."""
@@ -0,0 +1,90 @@
+"""Typed page snapshots collected in a single script execution."""
+
+from collections import namedtuple
+
+
+# One inventory/cart row: numeric product id, name, price and its button's data-test id
+ItemRecord = namedtuple('ItemRecord', ['id', 'name', 'price', 'button'])
+
+# Checkout overview amounts; fields are None when the page has no summary
+SummaryRecord = namedtuple('SummaryRecord', ['subtotal', 'tax', 'total'])
+
+PageSnapshot = namedtuple('PageSnapshot', ['url', 'title', 'items', 'cart_badge', 'buttons', 'summary'])
+
+
+# Reads everything the page objects extract from list pages in one round-trip
+SNAPSHOT_SCRIPT = """
+var text = function (root, selector) {
+    var el = root.querySelector(selector);
+    return el ? (el.innerText || el.textContent).trim() : null;
+};
+var items = Array.prototype.map.call(
+    document.querySelectorAll('.inventory_item, .cart_item'),
+    function (row) {
+        var link = row.querySelector('[id$="_title_link"], [id$="_img_link"]');
+        var button = row.querySelector('button[data-test]');
+        return {
+            id: link ? link.id.split('_')[1] : null,
+            name: text(row, '.inventory_item_name'),
+            price: text(row, '.inventory_item_price'),
+            button: button ? button.getAttribute('data-test') : null
+        };
+    });
+return {
+    url: window.location.href,
+    title: text(document, '.title'),
+    items: items,
+    cart_badge: text(document, '.shopping_cart_badge'),
+    buttons: Array.prototype.map.call(
+        document.querySelectorAll('button[data-test], input[type="submit"][data-test]'),
+        function (el) { return el.getAttribute('data-test'); }),
+    subtotal: text(document, '.summary_subtotal_label'),
+    tax: text(document, '.summary_tax_label'),
+    total: text(document, '.summary_total_label')
+};
+"""
+
+
+def parse_price(text):
+    """
+    Parse a price label such as "$29.99" or "Item total: $29.99".
+
+    Returns:
+        float: Amount, or None if text is None
+    """
+    if text is None:
+        return None
+    return float(text.split('$')[-1].replace(',', ''))
+
+
+def build_snapshot(raw):
+    """
+    Convert the raw dict returned by SNAPSHOT_SCRIPT into typed records.
+
+    Args:
+        raw (dict): Script result
+
+    Returns:
+        PageSnapshot: Snapshot with parsed prices and counts
+    """
+    items = tuple(
+        ItemRecord(
+            id=int(item['id']) if item['id'] and item['id'].isdigit() else None,
+            name=item['name'],
+            price=parse_price(item['price']),
+            button=item['button']
+        )
+        for item in raw['items']
+    )
+    return PageSnapshot(
+        url=raw['url'],
+        title=raw['title'],
+        items=items,
+        cart_badge=int(raw['cart_badge']) if raw['cart_badge'] else 0,
+        buttons=tuple(raw['buttons']),
+        summary=SummaryRecord(
+            subtotal=parse_price(raw['subtotal']),
+            tax=parse_price(raw['tax']),
+            total=parse_price(raw['total'])
+        )
+    )
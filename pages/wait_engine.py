@@ -0,0 +1,157 @@
+"""Condition-based waits used by BasePage instead of fixed sleeps."""
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from utils.config import EXPLICIT_WAIT, SETTLE_QUIET_MS, SETTLE_TIMEOUT
+from utils.instrumentation import TimedWait
+
+
+# Installs a per-document probe on first use and returns the page's activity state.
+# The probe tracks the time of the last DOM mutation and the number of in-flight
+# fetch/XHR requests; running animations are read from the Web Animations API.
+PAGE_STATE_SCRIPT = """
+var probe = window.__waitProbe;
+if (!probe) {
+    probe = window.__waitProbe = {lastMutation: performance.now(), pending: 0};
+    new MutationObserver(function () { probe.lastMutation = performance.now(); })
+        .observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            probe.pending++;
+            var done = function () { probe.pending--; };
+            var request = originalFetch.apply(this, arguments);
+            request.then(done, done);
+            return request;
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        probe.pending++;
+        this.addEventListener('loadend', function () { probe.pending--; });
+        return originalSend.apply(this, arguments);
+    };
+}
+var animations = document.getAnimations ? document.getAnimations().filter(function (a) {
+    return a.playState === 'running' && a.effect && a.effect.getTiming().iterations !== Infinity;
+}).length : 0;
+return {
+    readyState: document.readyState,
+    quietMs: performance.now() - probe.lastMutation,
+    pendingRequests: probe.pending,
+    runningAnimations: animations
+};
+"""
+
+
+# Marks the current document before a navigation, so the new one can be told apart
+# from it even when the URL does not change (e.g. a redirect back to the same page)
+NAVIGATION_MARK_SCRIPT = "window.__leavingPage = true;"
+NAVIGATION_STATE_SCRIPT = "return window.__leavingPage ? 'leaving' : document.readyState;"
+
+
+class WaitEngine:
+    """Waits on real page conditions: DOM quiescence, network idle, animations and state."""
+
+    def __init__(self, driver, timeout=EXPLICIT_WAIT, settle_timeout=SETTLE_TIMEOUT,
+                 quiet_ms=SETTLE_QUIET_MS, poll_frequency=0.05):
+        """
+        Initialize the wait engine.
+
+        Args:
+            driver: WebDriver instance
+            timeout (float): Budget for wait_for() conditions in seconds
+            settle_timeout (float): Budget for settle() in seconds
+            quiet_ms (int): DOM must be free of mutations this long to count as settled
+            poll_frequency (float): Seconds between condition checks
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.settle_timeout = settle_timeout
+        self.quiet_ms = quiet_ms
+        self.poll_frequency = poll_frequency
+
+    def page_state(self):
+        """Return readyState, ms since last DOM mutation, pending requests and running animations."""
+        return self.driver.execute_script(PAGE_STATE_SCRIPT)
+
+    def is_settled(self, state=None):
+        """Check whether the page is loaded, quiet, network-idle and not animating."""
+        state = state or self.page_state()
+        return (state['readyState'] in ('interactive', 'complete')
+                and state['quietMs'] >= self.quiet_ms
+                and state['pendingRequests'] == 0
+                and state['runningAnimations'] == 0)
+
+    def settle(self, timeout=None):
+        """
+        Wait until the page stops changing after an action.
+
+        Settling is best-effort: pages with endless activity are not an
+        error here, the caller's own condition wait decides correctness.
+
+        Returns:
+            bool: True if the page settled within the timeout
+        """
+        try:
+            TimedWait(self.driver, timeout or self.settle_timeout,
+                      poll_frequency=self.poll_frequency).until(lambda driver: self.is_settled())
+            return True
+        except TimeoutException:
+            return False
+        except WebDriverException as e:
+            # e.g. the action navigated away while the probe was being read
+            print(f"Could not read page state while settling: {e.msg}")
+            return False
+
+    def load(self, url, timeout=None):
+        """
+        Open a URL and wait until the new document has committed and is at least interactive.
+
+        With page_load_strategy 'none' (the minimal profile) driver.get returns
+        before the navigation commits, so current_url, cookies and storage would
+        still belong to the previous page.
+
+        Args:
+            url (str): Page to open
+            timeout (float): Override for the default budget
+        """
+        try:
+            self.driver.execute_script(NAVIGATION_MARK_SCRIPT)
+        except WebDriverException:
+            pass  # No scriptable document yet; any document after get() is the new one
+        self.driver.get(url)
+
+        def loaded(driver):
+            try:
+                return driver.execute_script(NAVIGATION_STATE_SCRIPT) in ('interactive', 'complete')
+            except WebDriverException:
+                return False  # Read while the old document was being torn down
+        self.wait_for(loaded, timeout, message=f"{url} did not load")
+
+    def wait_for(self, condition, timeout=None, message=""):
+        """
+        Wait until condition(driver) returns a truthy value.
+
+        Args:
+            condition (callable): Called with the driver on every poll
+            timeout (float): Override for the default budget
+            message (str): Included in the TimeoutException
+
+        Returns:
+            The condition's truthy return value
+        """
+        return TimedWait(self.driver, timeout or self.timeout,
+                         poll_frequency=self.poll_frequency).until(condition, message)
+
+    def wait_for_change(self, read, before, timeout=None, message=""):
+        """
+        Wait until read() returns something different from `before`.
+
+        Returns:
+            The new value
+        """
+        def changed(driver):
+            value = read()
+            return (value,) if value != before else False
+        return self.wait_for(changed, timeout, message)[0]
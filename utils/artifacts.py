@@ -0,0 +1,215 @@
+"""Asynchronous capture of failure artifacts (screenshot, DOM, console log, URL).
+
+`capture()` only talks to the browser: it grabs the raw screenshot, the DOM
+and URL, and the console log, then hands them to a background thread pool
+that decodes, compresses and writes the files. Teardown of the driver is not
+held up by disk I/O, and `flush()` at the end of the run waits for every
+pending write.
+
+Files of one capture share a base name that includes the worker id, a
+millisecond timestamp and a sequence number, so parallel workers never
+overwrite each other:
+
+    screenshots/Add_item_to_cart_w2_20240101-120000-123_0001.png
+    screenshots/Add_item_to_cart_w2_20240101-120000-123_0001.html.gz
+    screenshots/Add_item_to_cart_w2_20240101-120000-123_0001.json
+
+Frames from the action ring buffer (utils.frame_recorder), when given, are
+written next to them as a numbered sequence plus a replay page:
+
+    screenshots/Add_item_to_cart_w2_20240101-120000-123_0001_frames/01.jpg
+    screenshots/Add_item_to_cart_w2_20240101-120000-123_0001_replay.html
+"""
+
+import base64
+import gzip
+import html
+import itertools
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from utils.config import ARTIFACT_WRITERS, SCREENSHOT_DIR, WORKER_ID
+from utils.instrumentation import recorder
+
+
+# One round trip for everything the page itself can report
+PAGE_STATE_SCRIPT = "return [document.documentElement.outerHTML, window.location.href, document.title];"
+
+
+def clean_name(name):
+    """Make a scenario name safe for use in a file name."""
+    cleaned = "".join(c if c.isalnum() or c in (' ', '_') else '_' for c in name)
+    return cleaned.replace(' ', '_')[:80]
+
+
+class ArtifactPipeline:
+    """Captures failure artifacts and writes them on a background thread pool."""
+
+    def __init__(self, output_dir=SCREENSHOT_DIR, writers=ARTIFACT_WRITERS, worker_id=WORKER_ID):
+        """
+        Initialize the pipeline (threads are started on first use).
+
+        Args:
+            output_dir (str): Directory the artifacts are written to
+            writers (int): Background writer threads
+            worker_id (str): Parallel worker id used in file names
+        """
+        self.output_dir = output_dir
+        self.writers = writers
+        self.worker = f"w{worker_id}" if worker_id else f"p{os.getpid()}"
+        self._executor = None
+        self._futures = []
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _base_name(self, scenario_name):
+        timestamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')[:-3]
+        return f"{clean_name(scenario_name)}_{self.worker}_{timestamp}_{next(self._sequence):04d}"
+
+    def capture(self, driver, scenario_name, frames=(), **metadata):
+        """
+        Grab the artifacts of the current page and queue them for writing.
+
+        Args:
+            driver: WebDriver instance
+            scenario_name (str): Name used in the file names
+            frames (list): Buffered action frames (see utils.frame_recorder) to write as well
+            **metadata: Extra JSON-serializable fields for the metadata file
+
+        Returns:
+            str: Path of the screenshot that will be written
+        """
+        with recorder.span('artifact', 'capture'):
+            try:
+                screenshot = driver.get_screenshot_as_base64()
+            except Exception:
+                screenshot = None  # e.g. the browserless HTTP backend; keep the DOM and metadata
+            try:
+                dom, url, title = driver.execute_script(PAGE_STATE_SCRIPT)
+            except Exception as e:
+                dom, url, title = f"<!-- DOM unavailable: {e} -->", driver.current_url, ''
+            try:
+                console = driver.get_log('browser')
+            except Exception:
+                console = []  # Not every driver exposes console logs
+        return self.submit(scenario_name, screenshot, dom, url, title, console, frames=frames, **metadata)
+
+    def submit(self, scenario_name, screenshot, dom='', url='', title='', console=(), frames=(), **metadata):
+        """
+        Queue already captured artifacts for writing.
+
+        Args:
+            scenario_name (str): Name used in the file names
+            screenshot (str|bytes): Base64 string or raw PNG bytes (None: no screenshot)
+            frames (list): Buffered action frames, decoded and written on the writer thread
+
+        Returns:
+            str: Path of the screenshot (or, without one, the DOM) that will be written
+        """
+        base = os.path.join(self.output_dir, self._base_name(scenario_name))
+        record = dict(metadata, scenario=scenario_name, url=url, title=title, console=list(console),
+                      worker=self.worker, captured_at=datetime.now().isoformat(timespec='milliseconds'))
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.writers,
+                                                    thread_name_prefix='artifact-writer')
+            self._futures.append(self._executor.submit(self._write, base, screenshot, dom, record, list(frames)))
+        return f"{base}.png" if screenshot is not None else f"{base}.html.gz"
+
+    @staticmethod
+    def _write(base, screenshot, dom, record, frames=()):
+        """Decode, compress and write one capture (runs on a writer thread)."""
+        with recorder.span('artifact', 'write'):
+            os.makedirs(os.path.dirname(base) or '.', exist_ok=True)
+            record['files'] = []
+            if screenshot is not None:
+                png = base64.b64decode(screenshot) if isinstance(screenshot, str) else screenshot
+                with open(f"{base}.png", 'wb') as file:
+                    file.write(png)
+                record['files'].append(f"{base}.png")
+            with gzip.open(f"{base}.html.gz", 'wt', encoding='utf-8') as file:
+                file.write(dom)
+            record['files'].append(f"{base}.html.gz")
+            if frames:
+                record['frames'] = _write_frames(base, frames)
+                record['files'].append(f"{base}_replay.html")
+            with open(f"{base}.json", 'w', encoding='utf-8') as file:
+                json.dump(record, file, indent=2)
+        return record['files'][0]
+
+    def flush(self):
+        """
+        Wait for all queued writes and stop the writer threads.
+
+        Returns:
+            tuple: (written screenshot paths, error messages)
+        """
+        with self._lock:
+            futures, self._futures = self._futures, []
+            executor, self._executor = self._executor, None
+        written, errors = [], []
+        for future in futures:
+            try:
+                written.append(future.result())
+            except Exception as e:
+                errors.append(str(e))
+        if executor is not None:
+            executor.shutdown(wait=True)
+        return written, errors
+
+
+def _write_frames(base, frames):
+    """
+    Write buffered frames as a numbered sequence and a page that replays them.
+
+    Returns:
+        list: {'file', 'label', 'time'} per frame, oldest first
+    """
+    directory = f"{base}_frames"
+    os.makedirs(directory, exist_ok=True)
+    written = []
+    for index, frame in enumerate(frames, 1):
+        extension = 'jpg' if frame.mime == 'image/jpeg' else 'png'
+        path = os.path.join(directory, f"{index:02d}.{extension}")
+        with open(path, 'wb') as file:
+            file.write(base64.b64decode(frame.data))
+        written.append({'file': path, 'label': frame.label,
+                        'time': datetime.fromtimestamp(frame.time).isoformat(timespec='milliseconds')})
+    items = "".join(
+        f"<figure><img src='{html.escape(os.path.basename(directory))}/{html.escape(os.path.basename(entry['file']))}'>"
+        f"<figcaption>{index}/{len(written)} {html.escape(entry['time'])} {html.escape(entry['label'])}"
+        f"</figcaption></figure>"
+        for index, entry in enumerate(written, 1))
+    with open(f"{base}_replay.html", 'w', encoding='utf-8') as file:
+        file.write(_REPLAY_HTML.replace('{frames}', items))
+    return written
+
+
+# Shows one frame at a time (click to pause, arrow keys to step)
+_REPLAY_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Failure replay</title>
+<style>figure { display: none; margin: 0; } figure.on { display: block; } img { max-width: 100%; }
+figcaption { font-family: sans-serif; padding: .5em 0; }</style></head>
+<body>{frames}
+<script>
+var frames = document.querySelectorAll('figure'), current = 0, playing = true;
+function show(index) {
+  frames[current].className = '';
+  current = (index + frames.length) % frames.length;
+  frames[current].className = 'on';
+}
+show(0);
+setInterval(function () { if (playing) { show(current + 1); } }, 800);
+document.onclick = function () { playing = !playing; };
+document.onkeydown = function (e) {
+  if (e.key === 'ArrowRight' || e.key === 'ArrowLeft') { playing = false; show(current + (e.key === 'ArrowRight' ? 1 : -1)); }
+};
+</script></body></html>
+"""
+
+
+# Shared by the behave hooks of the current worker
+artifacts = ArtifactPipeline()
@@ -0,0 +1,361 @@
+"""asyncio WebDriver client for driving many browser sessions from one process.
+
+Speaks the classic W3C WebDriver HTTP protocol directly to the shared
+chromedriver/geckodriver services (see DriverServices), one keep-alive
+connection per session. While one session waits for the browser, the event
+loop serves the others, so a single worker can keep dozens of sessions busy
+without a thread per browser.
+
+Usage:
+    async def flow(driver):
+        page = AsyncLoginPage(driver)
+        await page.navigate()
+        await page.login("standard_user", "secret_sauce")
+
+    results = asyncio.run(run_concurrently(flow, sessions=20, concurrency=10))
+"""
+
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import (ElementClickInterceptedException, ElementNotInteractableException,
+                                        InvalidSessionIdException, JavascriptException,
+                                        NoSuchElementException, NoSuchWindowException,
+                                        StaleElementReferenceException, TimeoutException,
+                                        WebDriverException)
+from selenium.webdriver.common.by import By
+
+from utils.config import BROWSER, HEADLESS, PERF_PROFILE
+from utils.driver_factory import DriverFactory, driver_services
+from utils.instrumentation import recorder
+
+
+# W3C web element identifier
+ELEMENT_KEY = 'element-6066-11e4-a52f-4a4c6b0e7e19'
+
+# W3C error codes -> the exceptions the synchronous page objects already handle
+ERRORS = {
+    'no such element': NoSuchElementException,
+    'stale element reference': StaleElementReferenceException,
+    'element click intercepted': ElementClickInterceptedException,
+    'element not interactable': ElementNotInteractableException,
+    'invalid session id': InvalidSessionIdException,
+    'javascript error': JavascriptException,
+    'no such window': NoSuchWindowException,
+    'timeout': TimeoutException,
+    'script timeout': TimeoutException,
+}
+
+
+def w3c_locator(by, value):
+    """Translate a Selenium locator into a W3C strategy, as RemoteWebDriver does."""
+    if by == By.ID:
+        return 'css selector', f'[id="{value}"]'
+    if by == By.CLASS_NAME:
+        return 'css selector', f'.{value}'
+    if by == By.NAME:
+        return 'css selector', f'[name="{value}"]'
+    return by, value
+
+
+def _command_name(method, path):
+    """Span name of a command without session/element ids, e.g. 'POST /element/click'."""
+    parts = [part for part in path.split('/') if part]
+    if len(parts) > 2 and parts[0] in ('element', 'shadow'):
+        del parts[1]
+    return f"{method} /{'/'.join(parts)}"
+
+
+class AsyncElement:
+    """Reference to an element of an AsyncWebDriver session."""
+
+    def __init__(self, driver, element_id):
+        """Wrap a W3C element id."""
+        self.driver = driver
+        self.id = element_id
+
+    def _path(self, suffix=''):
+        return f"/element/{self.id}{suffix}"
+
+    async def click(self):
+        """Click the element."""
+        await self.driver.execute('POST', self._path('/click'), {})
+
+    async def clear(self):
+        """Clear an input."""
+        await self.driver.execute('POST', self._path('/clear'), {})
+
+    async def send_keys(self, text):
+        """Type text into the element."""
+        await self.driver.execute('POST', self._path('/value'), {'text': str(text)})
+
+    async def text(self):
+        """Return the rendered text."""
+        return await self.driver.execute('GET', self._path('/text'))
+
+    async def get_property(self, name):
+        """Return a DOM property."""
+        return await self.driver.execute('GET', self._path(f'/property/{name}'))
+
+    async def get_attribute(self, name):
+        """Return an HTML attribute."""
+        return await self.driver.execute('GET', self._path(f'/attribute/{name}'))
+
+
+class AsyncWebDriver:
+    """One browser session driven over an asyncio HTTP connection."""
+
+    def __init__(self, service_url, browser='chrome', service=None):
+        """
+        Prepare a client for a running driver service (no session yet).
+
+        Args:
+            service_url (str): e.g. http://localhost:9515
+            browser (str): 'chrome' or 'firefox'
+            service: DriverServices service to hand back on quit (geckodriver)
+        """
+        address = urlsplit(service_url)
+        self.host, self.port = address.hostname, address.port
+        self.browser = browser
+        self.service = service
+        self.session_id = None
+        self._reader = None
+        self._writer = None
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def create(cls, browser=BROWSER, headless=HEADLESS, profile=None):
+        """
+        Start a new session on the worker's shared driver service.
+
+        Args:
+            browser (str): 'chrome' or 'firefox'
+            headless (bool): Run browser in headless mode
+            profile (str): Performance profile name (default: PERF_PROFILE)
+
+        Returns:
+            AsyncWebDriver: Client with an open session
+        """
+        browser = browser.lower()
+        profile = DriverFactory.get_profile(profile or PERF_PROFILE)
+        if browser == 'chrome':
+            options = DriverFactory.chrome_options(headless, profile)
+        elif browser == 'firefox':
+            options = DriverFactory.firefox_options(headless, profile)
+        else:
+            raise ValueError(f"Unsupported browser: {browser}")
+        # May resolve the binary and start the service the first time: keep it off the loop
+        service = await asyncio.get_running_loop().run_in_executor(
+            None, driver_services.acquire, browser, options)
+        driver = cls(service.service_url, browser, service)
+        try:
+            with recorder.span('driver', 'async_start', browser=browser):
+                value = await driver.execute('POST', '/session', {
+                    'capabilities': {'alwaysMatch': options.to_capabilities(), 'firstMatch': [{}]}
+                })
+            driver.session_id = value['sessionId']
+            # Waits are explicit and non-blocking here; an implicit wait would hold the connection
+            await driver.execute('POST', '/timeouts', {'implicit': 0})
+            await driver.execute('POST', '/window/rect', {'width': 1920, 'height': 1080})
+            if browser == 'chrome' and (profile.blocked_urls or profile.disable_cache):
+                await driver.execute_cdp('Network.enable', {})
+                if profile.blocked_urls:
+                    await driver.execute_cdp('Network.setBlockedURLs', {'urls': list(profile.blocked_urls)})
+                await driver.execute_cdp('Network.setCacheDisabled', {'cacheDisabled': profile.disable_cache})
+        except Exception:
+            await driver.quit()
+            raise
+        return driver
+
+    # -- Transport ------------------------------------------------------
+
+    async def _connect(self):
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    def _disconnect(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def _read_response(self):
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Driver service closed the connection")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = (await self._reader.readline()).decode('latin-1').strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        if 'content-length' in headers:
+            body = await self._reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = b''
+            while True:
+                size = int((await self._reader.readline()).strip(), 16)
+                if size == 0:
+                    await self._reader.readline()
+                    break
+                body += await self._reader.readexactly(size)
+                await self._reader.readline()
+        else:
+            body = await self._reader.read()
+            self._disconnect()
+        if headers.get('connection', '').lower() == 'close':
+            self._disconnect()
+        return status, body
+
+    async def _request(self, method, path, payload):
+        data = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                "Accept: application/json\r\nContent-Type: application/json;charset=UTF-8\r\n"
+                f"Content-Length: {len(data)}\r\nConnection: keep-alive\r\n\r\n")
+        async with self._lock:
+            reused = self._writer is not None
+            await self._connect()
+            try:
+                self._writer.write(head.encode('latin-1') + data)
+                await self._writer.drain()
+                return await self._read_response()
+            except (ConnectionError, asyncio.IncompleteReadError):
+                self._disconnect()
+                if not reused:
+                    raise
+            # The service dropped an idle keep-alive connection: retry once on a new one
+            await self._connect()
+            self._writer.write(head.encode('latin-1') + data)
+            await self._writer.drain()
+            return await self._read_response()
+
+    async def execute(self, method, path, payload=None):
+        """
+        Send one WebDriver command.
+
+        Args:
+            method (str): HTTP method
+            path (str): Command path; session paths are relative to /session/{id}
+            payload (dict): JSON body for POST commands
+
+        Returns:
+            The command's 'value', with element references wrapped in AsyncElement
+        """
+        full_path = path if path == '/session' else f"/session/{self.session_id}{path}"
+        start = time.perf_counter()
+        status, body = await self._request(method, full_path, payload)
+        recorder.record('webdriver', _command_name(method, path), start, time.perf_counter() - start,
+                        transport='async')
+        value = json.loads(body.decode('utf-8') or 'null')
+        value = value.get('value') if isinstance(value, dict) else value
+        if status >= 400:
+            details = value if isinstance(value, dict) else {'message': str(value)}
+            raise ERRORS.get(details.get('error'), WebDriverException)(details.get('message', ''))
+        return self._unwrap(value)
+
+    def _unwrap(self, value):
+        if isinstance(value, list):
+            return [self._unwrap(item) for item in value]
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncElement(self, value[ELEMENT_KEY])
+            return {key: self._unwrap(item) for key, item in value.items()}
+        return value
+
+    @staticmethod
+    def _wrap(value):
+        if isinstance(value, AsyncElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, (list, tuple)):
+            return [AsyncWebDriver._wrap(item) for item in value]
+        return value
+
+    # -- Commands -------------------------------------------------------
+
+    async def get(self, url):
+        """Navigate to a URL (returns when the page-load strategy is satisfied)."""
+        await self.execute('POST', '/url', {'url': url})
+
+    async def current_url(self):
+        """Return the current URL."""
+        return await self.execute('GET', '/url')
+
+    async def find_element(self, by, value):
+        """Find one element now (no waiting); raises NoSuchElementException."""
+        using, selector = w3c_locator(by, value)
+        return await self.execute('POST', '/element', {'using': using, 'value': selector})
+
+    async def find_elements(self, by, value):
+        """Find all matching elements now (no waiting)."""
+        using, selector = w3c_locator(by, value)
+        return await self.execute('POST', '/elements', {'using': using, 'value': selector})
+
+    async def execute_script(self, script, *args):
+        """Run synchronous JavaScript; AsyncElement arguments are passed as elements."""
+        return await self.execute('POST', '/execute/sync', {'script': script, 'args': self._wrap(args)})
+
+    async def execute_cdp(self, command, params):
+        """Run a Chrome DevTools command (chromedriver only)."""
+        return await self.execute('POST', '/goog/cdp/execute', {'cmd': command, 'params': params})
+
+    async def get_cookies(self):
+        """Return all cookies of the current origin."""
+        return await self.execute('GET', '/cookie')
+
+    async def add_cookie(self, cookie):
+        """Add a cookie to the current origin."""
+        await self.execute('POST', '/cookie', {'cookie': cookie})
+
+    async def delete_all_cookies(self):
+        """Delete all cookies of the current origin."""
+        await self.execute('DELETE', '/cookie')
+
+    async def quit(self):
+        """End the session and close the connection (the service keeps running)."""
+        try:
+            if self.session_id is not None:
+                await self.execute('DELETE', '')
+        except Exception:
+            pass
+        finally:
+            self.session_id = None
+            self._disconnect()
+            if self.service is not None:
+                driver_services.release(self.browser, self.service)
+                self.service = None
+
+
+async def run_concurrently(flow, sessions, concurrency=None, browser=BROWSER, headless=HEADLESS):
+    """
+    Run `flow(driver)` in many sessions at once from one event loop.
+
+    Args:
+        flow (callable): async function taking an AsyncWebDriver
+        sessions (int): Number of flows to run
+        concurrency (int): Browsers open at the same time (default: all)
+        browser (str): 'chrome' or 'firefox'
+        headless (bool): Run browsers headless
+
+    Returns:
+        list: (result or exception, seconds) per session, in start order
+    """
+    limit = asyncio.Semaphore(concurrency or sessions)
+
+    async def one(index):
+        async with limit:
+            start = time.perf_counter()
+            driver = None
+            try:
+                driver = await AsyncWebDriver.create(browser, headless)
+                result = await flow(driver)
+            except Exception as e:
+                result = e
+            finally:
+                if driver is not None:
+                    await driver.quit()
+            return result, time.perf_counter() - start
+
+    return await asyncio.gather(*(one(index) for index in range(sessions)))
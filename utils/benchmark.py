@@ -0,0 +1,273 @@
+"""Benchmark the automation framework itself against the local stand-in app.
+
+Each workload is timed (median wall-clock over --repeat runs) and the number of
+WebDriver commands it sends is counted, so a new wait, sleep or extra lookup
+shows up as a regression even when the app itself did not get slower.
+
+Usage:
+    python -m utils.benchmark --save-baseline            # record benchmarks/baseline.json
+    python -m utils.benchmark --compare                  # exit 1 if a workload regressed
+    python -m utils.benchmark --compare --threshold 0.1 --only login --only checkout
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from local_app import LocalApp
+from pages.cart_page import CartPage
+from pages.checkout_page import CheckoutStepOnePage, CheckoutStepTwoPage
+from pages.login_page import LoginPage
+from pages.products_page import ProductsPage
+from utils import config
+from utils.driver_factory import DriverFactory, DriverPool, driver_services
+from utils.instrumentation import recorder
+
+
+BASELINE_PATH = "benchmarks/baseline.json"
+RESULTS_PATH = "reports/benchmark.json"
+
+
+class Meter:
+    """Measures wall-clock and WebDriver command count of one `with` block."""
+
+    def __init__(self):
+        """Initialize an unused meter."""
+        self.seconds = None
+        self.commands = None
+
+    def __enter__(self):
+        self._commands = recorder.count('webdriver')
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.seconds = time.perf_counter() - self._start
+        self.commands = recorder.count('webdriver') - self._commands
+
+
+class Bench:
+    """Shared state for workloads: one long-lived session plus settings."""
+
+    def __init__(self, browser, headless, items):
+        """Start the benchmark session."""
+        self.browser = browser
+        self.headless = headless
+        self.items = items
+        self.driver = DriverFactory.get_driver(browser=browser, headless=headless)
+        # Reuses DriverPool's reset so every workload starts from a blank session
+        self._cleaner = DriverPool(browser=browser, headless=headless)
+
+    def fresh(self):
+        """Reset the shared session (outside any measurement)."""
+        self._cleaner.reset(self.driver)
+        return self.driver
+
+    def close(self):
+        """Quit the shared session."""
+        self.driver.quit()
+
+
+# -- Workloads -------------------------------------------------------------
+# Each takes (bench, meter) and wraps only the part being measured in `with meter:`.
+
+def workload_cold_driver_start(bench, meter):
+    """Launch and quit a new browser session (on the shared driver service if enabled)."""
+    with meter:
+        driver = DriverFactory.get_driver(browser=bench.browser, headless=bench.headless)
+    driver.quit()
+
+
+def workload_pooled_checkout(bench, meter):
+    """Check a warm session out of a pool and return it (includes the reset)."""
+    pool = DriverPool(browser=bench.browser, headless=bench.headless, size=1)
+    pool.start()
+    try:
+        with meter:
+            driver = pool.checkout()
+            pool.release(driver)
+    finally:
+        pool.shutdown()
+
+
+def workload_login(bench, meter):
+    """UI login from the login page to the inventory."""
+    driver = bench.fresh()
+    login_page = LoginPage(driver)
+    with meter:
+        login_page.navigate()
+        login_page.login("standard_user", "secret_sauce")
+        ProductsPage(driver).get_products()
+
+
+def workload_add_to_cart(bench, meter):
+    """Add N products to the cart by clicking their buttons."""
+    driver = bench.fresh()
+    LoginPage(driver).fast_login("standard_user", "secret_sauce")
+    products_page = ProductsPage(driver)
+    with meter:
+        products_page.add_products_to_cart(bench.items)
+
+
+def workload_bulk_cart(bench, meter):
+    """Put N products in the cart with one storage write and reload."""
+    driver = bench.fresh()
+    LoginPage(driver).fast_login("standard_user", "secret_sauce")
+    products_page = ProductsPage(driver)
+    with meter:
+        products_page.fill_cart(bench.items)
+
+
+def workload_checkout(bench, meter):
+    """Full purchase: add N items, cart, information form, overview, finish."""
+    driver = bench.fresh()
+    LoginPage(driver).fast_login("standard_user", "secret_sauce")
+    with meter:
+        ProductsPage(driver).add_products_to_cart(bench.items)
+        ProductsPage(driver).click_cart()
+        CartPage(driver).click_checkout()
+        step_one = CheckoutStepOnePage(driver)
+        step_one.fill_checkout_form("Bench", "Mark", "12345")
+        step_one.click_continue()
+        step_two = CheckoutStepTwoPage(driver)
+        step_two.verify_order_summary()
+        step_two.click_finish()
+
+
+def workload_list_extraction(bench, meter):
+    """Read all product names and prices from the inventory page."""
+    driver = bench.fresh()
+    LoginPage(driver).fast_login("standard_user", "secret_sauce")
+    products_page = ProductsPage(driver)
+    with meter:
+        products_page.get_product_names()
+        products_page.get_product_prices()
+
+
+WORKLOADS = {
+    'cold_driver_start': workload_cold_driver_start,
+    'pooled_checkout': workload_pooled_checkout,
+    'login': workload_login,
+    'add_to_cart': workload_add_to_cart,
+    'bulk_cart': workload_bulk_cart,
+    'checkout': workload_checkout,
+    'list_extraction': workload_list_extraction,
+}
+
+
+# -- Running and comparing ---------------------------------------------------
+
+def run_benchmarks(names, repeat, browser, headless, items):
+    """
+    Run the selected workloads against a fresh local stand-in.
+
+    Returns:
+        dict: {'meta': {...}, 'workloads': {name: stats}}
+    """
+    recorder.enabled = True
+    app = LocalApp(glitch_delay=0).start()
+    config.BASE_URL = app.url
+    bench = Bench(browser, headless, items)
+    results = {}
+    try:
+        for name in names:
+            samples = []
+            for _ in range(repeat):
+                meter = Meter()
+                WORKLOADS[name](bench, meter)
+                samples.append({'seconds': meter.seconds, 'commands': meter.commands})
+            results[name] = {
+                'wall_s': round(statistics.median(sample['seconds'] for sample in samples), 4),
+                'min_s': round(min(sample['seconds'] for sample in samples), 4),
+                'commands': statistics.median(sample['commands'] for sample in samples),
+                'samples': samples,
+            }
+            print(f"  {name:<20} {results[name]['wall_s'] * 1000:9.1f} ms  "
+                  f"{results[name]['commands']:6g} commands")
+    finally:
+        bench.close()
+        driver_services.stop_all()
+        app.stop()
+    meta = {'timestamp': datetime.now().isoformat(timespec='seconds'), 'browser': browser,
+            'headless': headless, 'repeat': repeat, 'items': items,
+            'python': platform.python_version(), 'machine': platform.machine()}
+    return {'meta': meta, 'workloads': results}
+
+
+def compare(current, baseline, threshold):
+    """
+    Compare results with a baseline.
+
+    A workload regresses when its median wall-clock or its command count
+    grows by more than `threshold` (a fraction, e.g. 0.2 for 20%).
+
+    Returns:
+        list: (workload, metric, baseline value, current value) per regression
+    """
+    regressions = []
+    for name, result in current['workloads'].items():
+        reference = baseline['workloads'].get(name)
+        if reference is None:
+            continue
+        for metric in ('wall_s', 'commands'):
+            if result[metric] > reference[metric] * (1 + threshold):
+                regressions.append((name, metric, reference[metric], result[metric]))
+    return regressions
+
+
+def _write_json(data, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2)
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the automation framework.")
+    parser.add_argument('--only', action='append', choices=sorted(WORKLOADS),
+                        help="Run only this workload (may be repeated)")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per workload (median is used)")
+    parser.add_argument('--items', type=int, default=3, help="Products added in cart workloads")
+    parser.add_argument('--browser', default=config.BROWSER)
+    parser.add_argument('--headed', action='store_true', help="Show the browser")
+    parser.add_argument('--output', default=RESULTS_PATH, help="Where to write this run's results")
+    parser.add_argument('--save-baseline', nargs='?', const=BASELINE_PATH, metavar='PATH',
+                        help=f"Also save results as the baseline (default {BASELINE_PATH})")
+    parser.add_argument('--compare', nargs='?', const=BASELINE_PATH, metavar='PATH',
+                        help=f"Compare with a baseline (default {BASELINE_PATH})")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Allowed relative growth before a workload counts as regressed")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run benchmarks, save/compare results. Returns a process exit code."""
+    args = parse_args(argv)
+    names = args.only or list(WORKLOADS)
+    print(f"Benchmarking {len(names)} workloads x {args.repeat} on {args.browser}")
+    current = run_benchmarks(names, args.repeat, args.browser, not args.headed, args.items)
+    _write_json(current, args.output)
+    if args.save_baseline:
+        _write_json(current, args.save_baseline)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(current, baseline, args.threshold)
+        for name, metric, before, after in regressions:
+            print(f"REGRESSION {name}.{metric}: {before:g} -> {after:g} "
+                  f"(+{(after / before - 1) * 100 if before else float('inf'):.0f}%)")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,23 +1,81 @@
 """Configuration settings for the test framework."""
 
+import json
 import os
 
-# Base URL
-BASE_URL = "https://www.saucedemo.com"
+# Base URL (replaced with the stand-in's URL when LOCAL_APP is enabled)
+BASE_URL = os.getenv('BASE_URL', "https://www.saucedemo.com")
+
+# Local stand-in app settings (see local_app/)
+LOCAL_APP = os.getenv('LOCAL_APP', 'False').lower() == 'true'
+LOCAL_APP_PORT = int(os.getenv('LOCAL_APP_PORT', '0'))  # 0 = pick a free port
+LOCAL_APP_LATENCY = float(os.getenv('LOCAL_APP_LATENCY', '0'))  # Seconds added to every response
+LOCAL_APP_GLITCH_DELAY = float(os.getenv('LOCAL_APP_GLITCH_DELAY', '1'))  # Extra seconds for performance_glitch_user
+# Browserless HTTP backend for @http scenarios: auto (local stand-in only), on, off
+HTTP_BACKEND = os.getenv('HTTP_BACKEND', 'auto').lower()
 
 # Browser settings
 BROWSER = os.getenv('BROWSER', 'chrome')  # chrome or firefox
 HEADLESS = os.getenv('HEADLESS', 'False').lower() == 'true'
-SLOW_MO = float(os.getenv('SLOW_MO', '1'))  # Delay in seconds between actions (0 = no delay)
+SLOW_MO = float(os.getenv('SLOW_MO', '0'))  # Demo-only pause after each action in seconds (0 = off)
+
+# Driver pool settings (reuse warm browser sessions across scenarios)
+DRIVER_POOL = os.getenv('DRIVER_POOL', 'False').lower() == 'true'
+DRIVER_POOL_SIZE = int(os.getenv('DRIVER_POOL_SIZE', '1'))  # Sessions pre-launched at start of run
+DRIVER_POOL_MAX_USES = int(os.getenv('DRIVER_POOL_MAX_USES', '25'))  # Recycle a session after N scenarios
+
+# Resolve the driver binary once and keep one chromedriver/geckodriver service per worker
+SHARED_DRIVER_SERVICE = os.getenv('SHARED_DRIVER_SERVICE', 'True').lower() == 'true'
+
+# Performance profile: default, fast, minimal or cold (see PROFILES in utils/driver_factory.py)
+PERF_PROFILE = os.getenv('PERF_PROFILE', 'default')
+RESOURCE_SIZES_PATH = "reports/resource_sizes.json"  # Learned sizes used to estimate bytes saved by blocking
+RESOURCE_SIZES_MAX = int(os.getenv('RESOURCE_SIZES_MAX', '2000'))  # URLs kept (most recently seen first)
+
+# Restore the state a Background leaves behind instead of replaying its steps
+STATE_SNAPSHOTS = os.getenv('STATE_SNAPSHOTS', 'False').lower() == 'true'  # Opt-in; relies on behave internals
 
 # Timeout settings
 IMPLICIT_WAIT = 10
 EXPLICIT_WAIT = 15
+SETTLE_TIMEOUT = float(os.getenv('SETTLE_TIMEOUT', '5'))  # Max wait for the page to settle after an action
+SETTLE_QUIET_MS = int(os.getenv('SETTLE_QUIET_MS', '100'))  # DOM quiet period that counts as settled
 
 # Data file paths
 USERS_DATA_PATH = "data/users.json"
 CHECKOUT_DATA_PATH = "data/checkout_data.csv"
 
+# Parallel runner settings
+PARALLEL_WORKERS = int(os.getenv('PARALLEL_WORKERS', str(os.cpu_count() or 1)))
+REPORTS_DIR = "reports"
+WORKER_ID = os.getenv('WORKER_ID', '')  # Set by the parallel runner for each worker process
+SCENARIO_HISTORY_PATH = "reports/scenario_history.json"  # Durations/outcomes used for scheduling
+FAILED_SCENARIOS_PATH = "reports/failed_scenarios.json"  # Scenario ids for --rerun-failed
+COORDINATOR_HOST = os.getenv('COORDINATOR_HOST', '127.0.0.1')  # Distributed mode (utils.distributed)
+COORDINATOR_PORT = int(os.getenv('COORDINATOR_PORT', '8765'))
+
+# Instrumentation settings (per-run latency summary and trace-event file)
+INSTRUMENT = os.getenv('INSTRUMENT', 'False').lower() == 'true'
+TIMINGS_PATH = "reports/timings.json"
+TRACE_PATH = "reports/trace.json"
+
+# Page transition metrics (Navigation/Resource Timing, long tasks) and budgets
+PAGE_METRICS = os.getenv('PAGE_METRICS', 'False').lower() == 'true'  # Budgeted pages are always measured
+PAGE_METRICS_PATH = "reports/page_metrics.json"
+# Page name -> {metric: max ms}, e.g. '{"inventory": {"duration_ms": 3000}}'
+PAGE_BUDGETS = json.loads(os.getenv('PAGE_BUDGETS', '{}'))
+
+# Streaming results: one JSON line per finished step/scenario (see utils/result_stream.py)
+RESULTS_STREAM = os.getenv('RESULTS_STREAM', 'True').lower() == 'true'
+RESULTS_STREAM_PATH = "reports/results.jsonl"
+
 # Screenshot settings
 SCREENSHOT_ON_FAILURE = True
 SCREENSHOT_DIR = "screenshots"
+ARTIFACT_WRITERS = int(os.getenv('ARTIFACT_WRITERS', '2'))  # Background threads writing failure artifacts
+# Ring buffer of frames after each page-object action, written only for failed scenarios
+FRAME_RECORDER = os.getenv('FRAME_RECORDER', 'False').lower() == 'true'
+FRAME_BUFFER_SIZE = int(os.getenv('FRAME_BUFFER_SIZE', '15'))  # Frames kept per driver
+FRAME_QUALITY = int(os.getenv('FRAME_QUALITY', '30'))  # JPEG quality of frames (Chrome/Edge)
+FRAME_SCALE = float(os.getenv('FRAME_SCALE', '0.5'))  # Frame size relative to the viewport (Chrome/Edge)
+FRAME_BUFFER_BYTES = int(os.getenv('FRAME_BUFFER_BYTES', str(2 * 1024 * 1024)))  # Max encoded frame bytes per driver
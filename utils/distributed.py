@@ -0,0 +1,340 @@
+"""Coordinator/agent mode: scenarios pulled over a socket by any number of agents.
+
+The coordinator collects the scenarios, pre-assigns them longest-first to one
+queue per expected agent (see utils.scenario_history) and serves them over
+TCP as line-delimited JSON. Agents pull a batch from their own queue, run it
+in a behave process with their own DriverFactory drivers and send the behave
+JSON back. An agent whose queue is empty steals from the tail of the queue
+with the most predicted work left; work held by an agent that disconnects is
+put back. When every scenario has a result the coordinator writes one report.
+
+Usage (one host):
+    python -m utils.distributed coordinator --agents 3 --local-agents 3
+
+Usage (separate processes or containers):
+    python -m utils.distributed coordinator --host 0.0.0.0 --agents 3
+    python -m utils.distributed agent --host coordinator   # started 3 times
+
+Protocol (one JSON object per line):
+    agent -> {"type": "hello", "name": ...}      coordinator -> {"type": "welcome", "agent": N}
+    agent -> {"type": "pull"}                     coordinator -> {"type": "work", "scenarios": [...]}
+                                                                 | {"type": "wait"} | {"type": "done"}
+    agent -> {"type": "result", "locations": [...], "returncode": ..., "duration": ..., "features": [...]}
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+
+from utils.config import COORDINATOR_HOST, COORDINATOR_PORT, PARALLEL_WORKERS, REPORTS_DIR, SCENARIO_HISTORY_PATH
+from utils.parallel_runner import ScenarioRef, collect_scenarios, record_history, run_worker
+from utils.page_metrics import load_page_metrics
+from utils.reporting import (attach_page_metrics, load_json_results, merge_features, summarize,
+                             write_html_report, write_json_report)
+from utils.scenario_history import ScenarioHistory, split_longest_first, update_failed_ids
+
+
+class WorkQueue:
+    """Per-agent scenario deques with stealing, shared by the coordinator's connections."""
+
+    def __init__(self, shards, history):
+        """
+        Initialize the queues.
+
+        Args:
+            shards (list): One list of ScenarioRef per expected agent
+            history (ScenarioHistory): Predicted durations for choosing whom to steal from
+        """
+        self.history = history
+        self.queues = [deque(shard) for shard in shards]
+        self.owners = [None] * len(self.queues)
+        self.in_flight = {}
+        self.results = []
+        self.remaining = sum(len(shard) for shard in shards)
+        self.steals = 0
+        self.handed_out = {}
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+        if self.remaining == 0:
+            self.done.set()
+
+    def register(self, name):
+        """Give a connecting agent an unowned queue (or a new, empty one); returns its index."""
+        with self._lock:
+            for index, owner in enumerate(self.owners):
+                if owner is None:
+                    self.owners[index] = name
+                    return index
+            self.queues.append(deque())
+            self.owners.append(name)
+            return len(self.queues) - 1
+
+    def _predicted(self, queue):
+        return sum(self.history.estimate(ref.id) for ref in queue)
+
+    def pull(self, index, batch=1):
+        """
+        Take the next scenarios for an agent, stealing if its own queue is empty.
+
+        Returns:
+            list: ScenarioRefs, or None when nothing is left to hand out
+        """
+        with self._lock:
+            queue = self.queues[index]
+            if not queue:
+                victims = [other for other in self.queues if other]
+                if not victims:
+                    return None
+                victim = max(victims, key=self._predicted)
+                # Steal from the tail: the victim keeps working from its head undisturbed
+                for _ in range(min(batch, len(victim))):
+                    queue.append(victim.pop())
+                    self.steals += 1
+            work = [queue.popleft() for _ in range(min(batch, len(queue)))]
+            self.in_flight.setdefault(index, []).extend(work)
+            self.handed_out[index] = self.handed_out.get(index, 0) + len(work)
+            return work
+
+    def complete(self, index, result):
+        """Record an agent's result for the scenarios it was running."""
+        with self._lock:
+            locations = set(result['locations'])
+            finished = [ref for ref in self.in_flight.get(index, []) if ref.location in locations]
+            self.in_flight[index] = [ref for ref in self.in_flight.get(index, []) if ref not in finished]
+            self.results.append(dict(result, agent=index))
+            self.remaining -= len(finished)
+            if self.remaining <= 0:
+                self.done.set()
+
+    def abandon(self, index):
+        """Put back an agent's unfinished work and free its queue for another agent."""
+        with self._lock:
+            self.queues[index].extendleft(reversed(self.in_flight.pop(index, [])))
+            self.owners[index] = None
+
+    def has_in_flight(self):
+        """Whether some agent is still running scenarios."""
+        with self._lock:
+            return any(self.in_flight.values())
+
+
+class CoordinatorHandler(socketserver.StreamRequestHandler):
+    """Serves one agent connection."""
+
+    def _send(self, message):
+        self.wfile.write((json.dumps(message) + "\n").encode('utf-8'))
+        self.wfile.flush()
+
+    def handle(self):
+        queue, batch = self.server.work, self.server.batch
+        index = None
+        try:
+            for line in self.rfile:
+                message = json.loads(line)
+                if message['type'] == 'hello':
+                    index = queue.register(message['name'])
+                    print(f"  agent {index} connected: {message['name']}")
+                    self._send({'type': 'welcome', 'agent': index})
+                elif index is None:
+                    # Work is tracked per registered agent: nothing else is valid before hello
+                    print(f"  rejected {message['type']!r} before hello from {self.client_address[0]}")
+                    self._send({'type': 'error', 'message': "Send 'hello' first"})
+                    return
+                elif message['type'] == 'pull':
+                    work = queue.pull(index, batch)
+                    if work:
+                        self._send({'type': 'work', 'scenarios': [ref._asdict() for ref in work]})
+                    elif queue.done.is_set() or not queue.has_in_flight():
+                        self._send({'type': 'done'})
+                    else:
+                        # Others still running: their work may come back if they disconnect
+                        self._send({'type': 'wait'})
+                elif message['type'] == 'result':
+                    queue.complete(index, message)
+        except (ConnectionError, ValueError) as e:
+            print(f"  agent {index} connection error: {e}")
+        except KeyError as e:
+            print(f"  agent {index} sent a message without {e}; closing the connection")
+        finally:
+            if index is not None:
+                queue.abandon(index)
+
+
+class Coordinator(socketserver.ThreadingTCPServer):
+    """TCP server handing out scenarios from a WorkQueue."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, work, batch=1):
+        """Bind the server; serve_forever() starts handing out work."""
+        super().__init__(address, CoordinatorHandler)
+        self.work = work
+        self.batch = batch
+
+
+def run_agent(host=COORDINATOR_HOST, port=COORDINATOR_PORT, name=None, output_dir=None,
+              connect_timeout=60):
+    """
+    Pull and run scenarios until the coordinator says there is nothing left.
+
+    Args:
+        host (str): Coordinator host
+        port (int): Coordinator port
+        name (str): Agent name shown by the coordinator (default: host-pid)
+        output_dir (str): Directory for the agent's behave JSON and logs
+        connect_timeout (float): Seconds to keep retrying while the coordinator starts
+
+    Returns:
+        int: Number of scenarios run
+    """
+    name = name or f"{socket.gethostname()}-{os.getpid()}"
+    deadline = time.time() + connect_timeout
+    while True:
+        try:
+            connection = socket.create_connection((host, port))
+            break
+        except OSError:
+            if time.time() > deadline:
+                raise
+            time.sleep(1)
+
+    output_dir = output_dir or os.path.join(REPORTS_DIR, 'agents')
+    os.makedirs(output_dir, exist_ok=True)
+    stream = connection.makefile('rwb')
+
+    def send(message):
+        stream.write((json.dumps(message) + "\n").encode('utf-8'))
+        stream.flush()
+
+    def receive():
+        line = stream.readline()
+        if not line:
+            raise ConnectionError("Coordinator closed the connection")
+        reply = json.loads(line)
+        if reply['type'] == 'error':
+            raise ConnectionError(f"Coordinator rejected the agent: {reply['message']}")
+        return reply
+
+    send({'type': 'hello', 'name': name})
+    index = receive()['agent']
+    batches = ran = 0
+    with connection:
+        while True:
+            send({'type': 'pull'})
+            reply = receive()
+            if reply['type'] == 'done':
+                break
+            if reply['type'] == 'wait':
+                time.sleep(1)
+                continue
+            refs = [ScenarioRef(**scenario) for scenario in reply['scenarios']]
+            batches += 1
+            result = run_worker(f"{index}-{batches}", refs, output_dir)
+            features = load_json_results(result['json'])
+            attach_page_metrics(features, load_page_metrics(result['page_metrics']))
+            send({'type': 'result', 'locations': [ref.location for ref in refs],
+                  'returncode': result['returncode'], 'duration': result['duration'],
+                  'features': features})
+            ran += len(refs)
+    print(f"Agent {index} ({name}) finished: {ran} scenarios in {batches} batches")
+    return ran
+
+
+def run_coordinator(args):
+    """Serve the scenarios, wait for all results and write the report. Returns an exit code."""
+    scenarios = collect_scenarios(args.paths, args.tags)
+    if not scenarios:
+        print("No scenarios to run.")
+        return 0
+    history = ScenarioHistory(args.history)
+    shards, predicted = split_longest_first(scenarios, max(args.agents, 1), history)
+    work = WorkQueue(shards, history)
+    server = Coordinator((args.host, args.port), work, args.batch)
+    threading.Thread(target=server.serve_forever, name='coordinator', daemon=True).start()
+    print(f"Coordinator on {args.host}:{server.server_address[1]}: {len(scenarios)} scenarios for "
+          f"{args.agents} agents (predicted makespan {max(predicted):.1f}s)")
+
+    agents = []
+    for number in range(args.local_agents):
+        command = [sys.executable, '-m', 'utils.distributed', 'agent', '--host', '127.0.0.1',
+                   '--port', str(server.server_address[1]), '--name', f"local-{number}",
+                   '--reports-dir', args.reports_dir]
+        agents.append(subprocess.Popen(command))
+
+    start = time.perf_counter()
+    while not work.done.wait(1):
+        if agents and all(agent.poll() is not None for agent in agents) and not any(work.owners):
+            print("All local agents exited before every scenario had a result")
+            break
+    wall_clock = time.perf_counter() - start
+    for agent in agents:
+        agent.wait()
+    server.shutdown()
+    server.server_close()
+
+    features = merge_features([result['features'] for result in work.results],
+                              [set(result['locations']) for result in work.results])
+    outcomes = record_history(history, scenarios, features)
+    history.save()
+    update_failed_ids(outcomes)
+    per_agent = {str(index): count for index, count in sorted(work.handed_out.items())}
+    run_info = {'mode': 'distributed', 'agents': len(per_agent), 'steals': work.steals,
+                'scenarios_per_agent': per_agent, 'wall_clock_seconds': round(wall_clock, 2),
+                'predicted_makespan_seconds': round(max(predicted), 2),
+                'scenario_seconds_total': round(sum(duration for _, duration in outcomes.values()), 2)}
+    write_json_report(features, os.path.join(args.reports_dir, 'results.json'), extra=run_info)
+    write_html_report(features, os.path.join(args.reports_dir, 'report.html'), extra=run_info)
+
+    summary = summarize(features)
+    print(f"Scenarios: {summary['scenarios']}  wall-clock: {wall_clock:.1f}s  "
+          f"steals: {work.steals}  per agent: {per_agent}")
+    failed = summary['scenarios'].get('failed', 0) or any(r['returncode'] for r in work.results)
+    return 1 if failed else 0
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Distributed scenario execution.")
+    roles = parser.add_subparsers(dest='role', required=True)
+
+    coordinator = roles.add_parser('coordinator', help="Serve scenarios and assemble the report")
+    coordinator.add_argument('paths', nargs='*', default=['features'],
+                             help="Feature files or directories (default: features)")
+    coordinator.add_argument('-t', '--tags', action='append',
+                             help="Behave tag expression (may be repeated)")
+    coordinator.add_argument('--agents', type=int, default=PARALLEL_WORKERS,
+                             help="Expected agents (queues pre-assigned longest-first)")
+    coordinator.add_argument('--local-agents', type=int, default=0,
+                             help="Also start this many agent processes on this host")
+    coordinator.add_argument('--batch', type=int, default=1, help="Scenarios handed out per pull")
+    coordinator.add_argument('--history', default=SCENARIO_HISTORY_PATH)
+
+    agent = roles.add_parser('agent', help="Pull and run scenarios")
+    agent.add_argument('--name', help="Agent name (default: host-pid)")
+
+    for role in (coordinator, agent):
+        role.add_argument('--host', default=COORDINATOR_HOST)
+        role.add_argument('--port', type=int, default=COORDINATOR_PORT)
+        role.add_argument('--reports-dir', default=REPORTS_DIR)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run as coordinator or agent. Returns a process exit code."""
+    args = parse_args(argv)
+    if args.role == 'coordinator':
+        return run_coordinator(args)
+    run_agent(args.host, args.port, args.name, os.path.join(args.reports_dir, 'agents'))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,97 +5,552 @@ from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.chrome.options import Options as Options
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.common.driver_finder import DriverFinder
+from selenium.webdriver.firefox.remote_connection import FirefoxRemoteConnection
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+from selenium.common.exceptions import WebDriverException
+import json
 import os
-from datetime import datetime
+import threading
+import time
+from collections import deque, namedtuple
+from utils.config import (IMPLICIT_WAIT, PERF_PROFILE, RESOURCE_SIZES_MAX, RESOURCE_SIZES_PATH,
+                          SHARED_DRIVER_SERVICE)
+from utils.instrumentation import recorder
+
+
+# blocked_urls: DevTools URL patterns ('*' wildcard) that are never fetched
+# page_load_strategy: 'normal' waits for all assets, 'eager' for the DOM, 'none' returns at once
+PerformanceProfile = namedtuple('PerformanceProfile',
+                                ['name', 'blocked_urls', 'page_load_strategy', 'disable_cache'])
+
+_IMAGES_AND_FONTS = ('*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.webp', '*.ico',
+                     '*.woff', '*.woff2', '*.ttf', '*.otf')
+_THIRD_PARTY = ('*backtrace.io*', '*google-analytics.com*', '*googletagmanager.com*',
+                '*optimizely.com*', '*doubleclick.net*')
+
+PROFILES = {
+    'default': PerformanceProfile('default', (), 'normal', False),
+    'fast': PerformanceProfile('fast', _IMAGES_AND_FONTS + _THIRD_PARTY, 'eager', False),
+    'minimal': PerformanceProfile('minimal', _IMAGES_AND_FONTS + _THIRD_PARTY, 'none', False),
+    'cold': PerformanceProfile('cold', (), 'normal', True),
+}
+
+
+# The SharedService* drivers bypass the public constructors and set up the session
+# with Selenium internals (RemoteWebDriver.__init__, the *RemoteConnection classes,
+# options._ignore_local_proxy, _is_remote). They match the selenium version pinned in
+# requirements.txt; re-check them against the new source before upgrading.
+class SharedServiceChrome(webdriver.Chrome):
+    """Chrome session on an already running chromedriver; quit() leaves the service up."""
+
+    def __init__(self, options, service):
+        # Deliberately skips ChromiumDriver.__init__, which resolves and starts a new service
+        self.vendor_prefix = 'goog'
+        self.service = service
+        RemoteWebDriver.__init__(
+            self,
+            command_executor=ChromiumRemoteConnection(
+                remote_server_addr=service.service_url,
+                browser_name='chrome',
+                vendor_prefix='goog',
+                keep_alive=True,
+                ignore_proxy=options._ignore_local_proxy,
+            ),
+            options=options,
+        )
+        self._is_remote = False
+
+    def quit(self):
+        """End the browser session only."""
+        try:
+            RemoteWebDriver.quit(self)
+        except Exception as e:
+            print(f"Failed to end Chrome session {self.session_id}, browser may be left running: {e}")
+
+
+class SharedServiceFirefox(webdriver.Firefox):
+    """Firefox session on a running geckodriver; quit() hands the service back."""
+
+    def __init__(self, options, service, services):
+        # geckodriver serves one session at a time, so the service is borrowed, not shared
+        self.service = service
+        self._services = services
+        RemoteWebDriver.__init__(
+            self,
+            command_executor=FirefoxRemoteConnection(
+                remote_server_addr=service.service_url,
+                ignore_proxy=options._ignore_local_proxy,
+                keep_alive=True,
+            ),
+            options=options,
+        )
+        self._is_remote = False
+
+    def quit(self):
+        """End the browser session and return the service for the next one."""
+        try:
+            RemoteWebDriver.quit(self)
+        except Exception as e:
+            print(f"Failed to end Firefox session {self.session_id}, browser may be left running: {e}")
+        finally:
+            self._services.release('firefox', self.service)
+
+
+class DriverServices:
+    """
+    Long-lived chromedriver/geckodriver processes shared by one worker's sessions.
+
+    The driver binary is resolved by Selenium Manager once per browser and
+    each service process is started once, instead of both happening for every
+    new session. Both costs are recorded separately ('driver' spans
+    'binary_lookup' and 'service_start') so the saving is visible.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._locations = {}  # browser -> (driver path, browser path)
+        self._chrome = None
+        self._idle_firefox = []
+        self._services = []
+        self.lookup_times = []
+        self.start_times = []
+        self.sessions = 0
+
+    def _resolve(self, browser, service, options):
+        """Resolve driver (and browser) binaries once per browser."""
+        if browser not in self._locations:
+            start = time.perf_counter()
+            with recorder.span('driver', 'binary_lookup', browser=browser):
+                driver_path = DriverFinder.get_path(service, options)
+            self.lookup_times.append(time.perf_counter() - start)
+            self._locations[browser] = (driver_path, getattr(options, 'binary_location', None))
+        driver_path, browser_path = self._locations[browser]
+        if browser_path and not options.binary_location:
+            options.binary_location = browser_path
+        return driver_path
+
+    def _start(self, browser, service, options):
+        """Start a new service process."""
+        service.path = self._resolve(browser, service, options)
+        start = time.perf_counter()
+        with recorder.span('driver', 'service_start', browser=browser):
+            service.start()
+        self.start_times.append(time.perf_counter() - start)
+        self._services.append(service)
+        return service
+
+    @staticmethod
+    def _is_running(service):
+        return service.process is not None and service.process.poll() is None
+
+    def acquire(self, browser, options):
+        """
+        Get a running service for a new session.
+
+        Args:
+            browser (str): 'chrome' or 'firefox'
+            options: Browser options of the session (binary location is filled in)
+
+        Returns:
+            Service: Running chromedriver/geckodriver service
+        """
+        with self._lock:
+            self.sessions += 1
+            if browser == 'chrome':
+                if self._chrome is None or not self._is_running(self._chrome):
+                    self._chrome = self._start(browser, ChromeService(), options)
+                else:
+                    self._resolve(browser, self._chrome, options)
+                return self._chrome
+            while self._idle_firefox:
+                service = self._idle_firefox.pop()
+                if self._is_running(service):
+                    self._resolve(browser, service, options)
+                    return service
+            return self._start(browser, FirefoxService(), options)
+
+    def release(self, browser, service):
+        """Return a borrowed (geckodriver) service."""
+        if browser == 'firefox':
+            with self._lock:
+                self._idle_firefox.append(service)
+
+    def stop_all(self):
+        """Stop every service process started by this registry."""
+        with self._lock:
+            for service in self._services:
+                try:
+                    service.stop()
+                except Exception as e:
+                    print(f"Failed to stop driver service: {e}")
+            self._services.clear()
+            self._idle_firefox.clear()
+            self._chrome = None
+
+    def format_stats(self):
+        """Return a one-line summary of lookups, service starts and reuse."""
+        lookup = sum(self.lookup_times)
+        started = sum(self.start_times)
+        per_session = (lookup / max(len(self.lookup_times), 1)) + (started / max(len(self.start_times), 1))
+        reused = self.sessions - len(self.start_times)
+        return (f"Driver services: {self.sessions} sessions, {len(self.lookup_times)} binary lookups "
+                f"({lookup * 1000:.0f} ms), {len(self.start_times)} service starts ({started * 1000:.0f} ms), "
+                f"~{max(reused, 0) * per_session:.1f}s saved by reuse")
+
+
+driver_services = DriverServices()
 
 
 class DriverFactory:
     """Factory class to create WebDriver instances."""
     
     @staticmethod
-    def get_driver(browser='chrome', headless=False):
+    def get_driver(browser='chrome', headless=False, profile=None):
         """
         Create and return a WebDriver instance.
         
         Args:
             browser (str): Browser type ('chrome' or 'firefox')
             headless (bool): Run browser in headless mode
+            profile (str): Performance profile name from PROFILES (default: PERF_PROFILE)
             
         Returns:
             WebDriver: Configured WebDriver instance
         """
+        profile = DriverFactory.get_profile(profile or PERF_PROFILE)
         if browser.lower() == 'chrome':
-            options = Options()
-            if headless:
-                options.add_argument('--headless=new')
-            
-            # Essential arguments for Linux environments
-            options.add_argument('--no-sandbox')  # Required for Docker/CI environments
-            options.add_argument('--disable-dev-shm-usage')  # Overcome limited resource problems
-            options.add_argument('--disable-gpu')  # Disable GPU hardware acceleration
-            # Logging suppression
-            options.add_argument('--log-level=3')  # Suppress console logs
-            options.add_argument('--disable-logging')  # Disable Chrome logging
-            options.add_argument('--silent')  # Suppress Chrome messages
-            
-            # Launch Chrome as guest to avoid password manager pop-ups
-            options.add_argument('--guest')
-            
-            # Additional arguments to disable password manager completely
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            
-            # Disable password manager pop-ups via preferences
-            prefs = {
-                "credentials_enable_service": False,
-                "profile.password_manager_enabled": False,
-                "profile.password_leak_detection_enabled": False,
-                "profile.default_content_setting_values.notifications": 2,
-                "autofill.profile_enabled": False
-            }
-            options.add_experimental_option("prefs", prefs)
-            
-            # Exclude automation switches
-            options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
-            options.add_experimental_option('useAutomationExtension', False)
-            
+            options = DriverFactory.chrome_options(headless, profile)
             # Use Selenium Manager (automatic driver management in Selenium 4.6+)
-            driver = webdriver.Chrome(options=options)
+            with recorder.span('driver', 'start', browser='chrome'):
+                if SHARED_DRIVER_SERVICE:
+                    driver = SharedServiceChrome(options, driver_services.acquire('chrome', options))
+                else:
+                    driver = webdriver.Chrome(options=options)
+            DriverFactory._apply_network_profile(driver, profile)
             
         elif browser.lower() == 'firefox':
-            options = FirefoxOptions()
-            if headless:
-                options.add_argument('--headless')
-            
+            options = DriverFactory.firefox_options(headless, profile)
             # Use Selenium Manager
-            driver = webdriver.Firefox(options=options)
+            with recorder.span('driver', 'start', browser='firefox'):
+                if SHARED_DRIVER_SERVICE:
+                    service = driver_services.acquire('firefox', options)
+                    try:
+                        driver = SharedServiceFirefox(options, service, driver_services)
+                    except Exception:
+                        driver_services.release('firefox', service)
+                        raise
+                else:
+                    driver = webdriver.Firefox(options=options)
             
         else:
             raise ValueError(f"Unsupported browser: {browser}")
         
-        driver.implicitly_wait(10)
+        driver.perf_profile = profile
+        recorder.instrument_driver(driver)
+        driver.implicitly_wait(IMPLICIT_WAIT)
         driver.maximize_window()
         return driver
     
     @staticmethod
-    def take_screenshot(driver, scenario_name):
+    def chrome_options(headless=False, profile=PROFILES['default']):
         """
-        Take a screenshot and save it with timestamp.
+        Build the Chrome options used for every session.
         
         Args:
-            driver: WebDriver instance
-            scenario_name (str): Name of the scenario for the screenshot filename
+            headless (bool): Run browser in headless mode
+            profile (PerformanceProfile): Page-load strategy to apply
+            
+        Returns:
+            Options: Chrome options
         """
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        screenshot_dir = 'screenshots'
+        options = Options()
+        options.page_load_strategy = profile.page_load_strategy
+        # The browser (console) log is kept for failure artifacts; the performance
+        # log (every DevTools network event) only feeds blocked-request stats
+        logging_prefs = {'browser': 'ALL'}
+        if profile.blocked_urls:
+            logging_prefs['performance'] = 'ALL'
+        options.set_capability('goog:loggingPrefs', logging_prefs)
+        if headless:
+            options.add_argument('--headless=new')
+        
+        # Essential arguments for Linux environments
+        options.add_argument('--no-sandbox')  # Required for Docker/CI environments
+        options.add_argument('--disable-dev-shm-usage')  # Overcome limited resource problems
+        options.add_argument('--disable-gpu')  # Disable GPU hardware acceleration
+        # Logging suppression
+        options.add_argument('--log-level=3')  # Suppress console logs
+        options.add_argument('--disable-logging')  # Disable Chrome logging
+        options.add_argument('--silent')  # Suppress Chrome messages
         
-        if not os.path.exists(screenshot_dir):
-            os.makedirs(screenshot_dir)
+        # Launch Chrome as guest to avoid password manager pop-ups
+        options.add_argument('--guest')
         
-        # Clean scenario name for filename
-        clean_name = "".join(c if c.isalnum() or c in (' ', '_') else '_' for c in scenario_name)
-        clean_name = clean_name.replace(' ', '_')
+        # Additional arguments to disable password manager completely
+        options.add_argument('--disable-blink-features=AutomationControlled')
         
-        filepath = os.path.join(screenshot_dir, f"{clean_name}_{timestamp}.png")
-        driver.save_screenshot(filepath)
-        print(f"Screenshot saved: {filepath}")
-        return filepath
+        # Disable password manager pop-ups via preferences
+        prefs = {
+            "credentials_enable_service": False,
+            "profile.password_manager_enabled": False,
+            "profile.password_leak_detection_enabled": False,
+            "profile.default_content_setting_values.notifications": 2,
+            "autofill.profile_enabled": False
+        }
+        options.add_experimental_option("prefs", prefs)
+        
+        # Exclude automation switches
+        options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
+        options.add_experimental_option('useAutomationExtension', False)
+        return options
+    
+    @staticmethod
+    def firefox_options(headless=False, profile=PROFILES['default']):
+        """
+        Build the Firefox options used for every session.
+        
+        Args:
+            headless (bool): Run browser in headless mode
+            profile (PerformanceProfile): Page-load strategy and content blocking to apply
+            
+        Returns:
+            FirefoxOptions: Firefox options
+        """
+        options = FirefoxOptions()
+        options.page_load_strategy = profile.page_load_strategy
+        if headless:
+            options.add_argument('--headless')
+        # No DevTools URL blocking in Firefox: approximate with content prefs
+        if set(_IMAGES_AND_FONTS) <= set(profile.blocked_urls):
+            options.set_preference('permissions.default.image', 2)
+            options.set_preference('gfx.downloadable_fonts.enabled', False)
+        if profile.disable_cache:
+            options.set_preference('browser.cache.disk.enable', False)
+            options.set_preference('browser.cache.memory.enable', False)
+        return options
+    
+    @staticmethod
+    def get_profile(name):
+        """Look up a performance profile by name."""
+        try:
+            return PROFILES[name]
+        except KeyError:
+            raise ValueError(f"Unknown performance profile: {name} (choose from {', '.join(PROFILES)})")
+    
+    @staticmethod
+    def _apply_network_profile(driver, profile):
+        """Apply URL blocking and cache settings over DevTools (Chrome)."""
+        if not profile.blocked_urls and not profile.disable_cache:
+            return  # Browser defaults: no DevTools round-trips, no network events
+        driver.execute_cdp_cmd('Network.enable', {})
+        if profile.blocked_urls:
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(profile.blocked_urls)})
+        driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': profile.disable_cache})
+    
+    @staticmethod
+    def collect_network_stats(driver):
+        """
+        Summarize network activity since the last call (Chrome only).
+
+        Bytes saved are estimated from the sizes the same URLs had when they
+        were last downloaded unblocked (kept in RESOURCE_SIZES_PATH).
+
+        Returns:
+            dict: profile, requests, blocked, bytes_saved and blocked URLs
+            with unknown size, or None if the profile blocks nothing or the
+            browser has no performance log
+        """
+        profile = getattr(driver, 'perf_profile', PROFILES['default'])
+        if not profile.blocked_urls:
+            return None  # Performance log is off (see chrome_options)
+        try:
+            entries = driver.get_log('performance')
+        except Exception:
+            return None
+        sizes = _load_resource_sizes()
+        urls, blocked, changed = {}, [], False
+        for entry in entries:
+            message = json.loads(entry['message'])['message']
+            params = message.get('params', {})
+            if message['method'] == 'Network.requestWillBeSent':
+                urls[params['requestId']] = params['request']['url']
+            elif message['method'] == 'Network.loadingFailed' and params.get('blockedReason'):
+                blocked.append(urls.get(params['requestId']))
+            elif message['method'] == 'Network.loadingFinished' and params['requestId'] in urls:
+                url = urls[params['requestId']]
+                sizes.pop(url, None)  # Re-insert: the table is trimmed oldest first
+                sizes[url] = params.get('encodedDataLength', 0)
+                changed = True
+        if changed:
+            _save_resource_sizes(sizes)
+        blocked = [url for url in blocked if url]
+        return {
+            'profile': profile.name,
+            'requests': len(urls),
+            'blocked': len(blocked),
+            'bytes_saved': sum(sizes.get(url, 0) for url in blocked),
+            'unknown_size': sum(1 for url in blocked if url not in sizes),
+        }
+
+
+def _load_resource_sizes():
+    """Load the URL -> downloaded bytes table used to estimate savings (empty if missing or unreadable)."""
+    try:
+        with open(RESOURCE_SIZES_PATH, 'r', encoding='utf-8') as file:
+            sizes = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return sizes if isinstance(sizes, dict) else {}
+
+
+def _save_resource_sizes(sizes):
+    """
+    Persist the URL -> downloaded bytes table, keeping the RESOURCE_SIZES_MAX newest URLs.
+
+    Parallel workers share the file: each writes a private temp file and
+    swaps it in atomically, so readers never see a partial table (the last
+    writer wins, which only costs a few learned sizes).
+    """
+    if len(sizes) > RESOURCE_SIZES_MAX:
+        sizes = dict(list(sizes.items())[-RESOURCE_SIZES_MAX:])
+    os.makedirs(os.path.dirname(RESOURCE_SIZES_PATH) or '.', exist_ok=True)
+    temp_path = f"{RESOURCE_SIZES_PATH}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(sizes, file)
+    os.replace(temp_path, RESOURCE_SIZES_PATH)
+
+
+class DriverPool:
+    """Pool of pre-launched WebDriver sessions reused across scenarios."""
+
+    def __init__(self, browser='chrome', headless=False, size=1, max_uses=25):
+        """
+        Initialize an empty pool.
+
+        Args:
+            browser (str): Browser type ('chrome' or 'firefox')
+            headless (bool): Run browsers in headless mode
+            size (int): Number of sessions to pre-launch in start()
+            max_uses (int): Recycle a session after this many checkouts
+        """
+        self.browser = browser
+        self.headless = headless
+        self.size = size
+        self.max_uses = max_uses
+        self._idle = deque()
+        self._uses = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.recycled = 0
+        self.crashed = 0
+        self.reset_times = []
+
+    def _launch(self):
+        """Cold-start a new session and register it with the pool."""
+        driver = DriverFactory.get_driver(browser=self.browser, headless=self.headless)
+        self._uses[id(driver)] = 0
+        return driver
+
+    def start(self):
+        """Pre-launch the configured number of sessions."""
+        for _ in range(self.size):
+            self._idle.append(self._launch())
+
+    def checkout(self):
+        """
+        Get a ready-to-use session, launching one if none is idle.
+
+        Returns:
+            WebDriver: Session positioned on about:blank with no state
+        """
+        with self._lock:
+            while self._idle:
+                driver = self._idle.popleft()
+                if self.is_healthy(driver):
+                    self.hits += 1
+                    return driver
+                self.crashed += 1
+                self._discard(driver)
+            self.misses += 1
+        return self._launch()
+
+    def release(self, driver):
+        """
+        Return a session to the pool after a scenario.
+
+        The session is reset and kept for reuse unless it reached max_uses,
+        crashed, or cannot be reset cleanly, in which case it is quit.
+
+        Args:
+            driver: WebDriver instance obtained from checkout()
+        """
+        uses = self._uses.get(id(driver), 0) + 1
+        self._uses[id(driver)] = uses
+        if uses >= self.max_uses:
+            self.recycled += 1
+            self._discard(driver)
+            return
+        try:
+            self.reset(driver)
+        except WebDriverException as e:
+            print(f"Discarding pooled driver after failed reset: {e}")
+            self.crashed += 1
+            self._discard(driver)
+            return
+        with self._lock:
+            self._idle.append(driver)
+
+    def reset(self, driver):
+        """Clear cookies, storage and extra windows and return to about:blank."""
+        start = time.perf_counter()
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        # Storage is per-origin, so clear it before leaving the app page
+        if driver.current_url.startswith('http'):
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        driver.delete_all_cookies()
+        if self.browser.lower() == 'chrome':
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        driver.get('about:blank')
+        duration = time.perf_counter() - start
+        self.reset_times.append(duration)
+        recorder.record('driver', 'pool_reset', start, duration)
+
+    @staticmethod
+    def is_healthy(driver):
+        """Check that the session still responds to commands."""
+        try:
+            driver.window_handles
+            return True
+        except WebDriverException:
+            return False
+
+    def _discard(self, driver):
+        """Quit a session and forget its use count."""
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Failed to quit pooled driver: {e}")
+
+    def shutdown(self):
+        """Quit all idle sessions."""
+        with self._lock:
+            while self._idle:
+                self._discard(self._idle.popleft())
+
+    def format_stats(self):
+        """Return a one-line summary of pool hit/miss and reset-time stats."""
+        resets = len(self.reset_times)
+        mean = (sum(self.reset_times) / resets * 1000) if resets else 0.0
+        worst = max(self.reset_times) * 1000 if resets else 0.0
+        return (f"Driver pool: {self.hits} hits, {self.misses} misses, "
+                f"{self.recycled} recycled, {self.crashed} crashed, "
+                f"{resets} resets (mean {mean:.0f} ms, max {worst:.0f} ms)")
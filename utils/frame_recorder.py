@@ -0,0 +1,95 @@
+"""In-memory ring buffer of screenshots taken after each page-object action.
+
+A single end-of-scenario screenshot rarely shows what went wrong mid-flow,
+and recording video for every scenario is too expensive. With
+FRAME_RECORDER enabled, BasePage grabs a compressed frame after each action
+into a buffer per driver, bounded by frame count and by encoded bytes. On
+Chrome/Edge a frame is the visible viewport, downscaled by FRAME_SCALE.
+Frames are kept exactly as the browser
+returned them (base64): nothing is decoded or written unless the scenario
+fails, when the buffer is handed to the artifact pipeline and written as a
+frame sequence plus a replay page (see utils.artifacts).
+"""
+
+import time
+import weakref
+from collections import deque, namedtuple
+
+from utils.config import FRAME_BUFFER_BYTES, FRAME_BUFFER_SIZE, FRAME_QUALITY, FRAME_RECORDER, FRAME_SCALE
+from utils.instrumentation import recorder
+
+
+# data: base64 image as returned by the browser; mime: its image type
+Frame = namedtuple('Frame', ['label', 'time', 'data', 'mime'])
+
+
+class FrameRecorder:
+    """Keeps the last action frames of every driver, up to a frame count and a byte size."""
+
+    def __init__(self, enabled=FRAME_RECORDER, size=FRAME_BUFFER_SIZE, quality=FRAME_QUALITY,
+                 scale=FRAME_SCALE, max_bytes=FRAME_BUFFER_BYTES):
+        """
+        Args:
+            enabled (bool): Capture frames at all
+            size (int): Frames kept per driver (older ones are dropped)
+            quality (int): JPEG quality (0-100) where the browser supports it
+            scale (float): Frame size relative to the viewport where the browser supports it
+            max_bytes (int): Encoded bytes kept per driver (older frames are dropped)
+        """
+        self.enabled = enabled
+        self.size = size
+        self.quality = quality
+        self.scale = scale
+        self.max_bytes = max_bytes
+        self.captured = 0
+        self._buffers = weakref.WeakKeyDictionary()  # A driver's buffer goes away with the driver
+
+    def capture(self, driver, label):
+        """
+        Add a frame of the current page to the driver's buffer.
+
+        Args:
+            driver: WebDriver instance
+            label (str): What just happened (e.g. 'click login-button')
+        """
+        if not self.enabled:
+            return
+        with recorder.span('artifact', 'frame'):
+            try:
+                data, mime = self._grab(driver)
+            except Exception:
+                return  # No screenshots (e.g. the HTTP backend) or no window: keep going without a frame
+        buffer = self._buffers.get(driver)
+        if buffer is None:
+            buffer = self._buffers[driver] = deque(maxlen=self.size)
+        buffer.append(Frame(label, time.time(), data, mime))
+        while len(buffer) > 1 and sum(len(frame.data) for frame in buffer) > self.max_bytes:
+            buffer.popleft()
+        self.captured += 1
+
+    def _grab(self, driver):
+        """Take a screenshot, as a small JPEG over DevTools on Chrome/Edge, else the WebDriver PNG."""
+        if hasattr(driver, 'execute_cdp_cmd'):
+            # Clip to what is on screen (page coordinates) so the browser encodes a scaled-down viewport
+            metrics = driver.execute_cdp_cmd('Page.getLayoutMetrics', {})
+            viewport = metrics.get('cssLayoutViewport') or metrics['layoutViewport']
+            clip = {'x': viewport['pageX'], 'y': viewport['pageY'], 'width': viewport['clientWidth'],
+                    'height': viewport['clientHeight'], 'scale': self.scale}
+            result = driver.execute_cdp_cmd('Page.captureScreenshot',
+                                            {'format': 'jpeg', 'quality': self.quality, 'clip': clip})
+            return result['data'], 'image/jpeg'
+        return driver.get_screenshot_as_base64(), 'image/png'
+
+    def take(self, driver):
+        """
+        Remove and return a driver's buffered frames.
+
+        Returns:
+            list: Frame entries, oldest first
+        """
+        buffer = self._buffers.pop(driver, None)
+        return list(buffer) if buffer else []
+
+
+# Shared by the page objects and the environment hooks of one behave process
+frame_recorder = FrameRecorder()
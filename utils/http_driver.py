@@ -0,0 +1,715 @@
+"""Browserless backend for the page objects: an HTTP client plus an HTML parser.
+
+HttpDriver implements the part of the Selenium WebDriver API the page
+objects use (get, find_element(s), click, send_keys, cookies, ...) on top of
+urllib and html.parser, so the same page objects and step definitions run
+without a browser. It suits server-rendered pages such as the local
+stand-in, where every action is a link or a form:
+
+* clicking a link follows it; clicking a submit button submits its form;
+* choosing an <option> submits the select's form (the stand-in renders the
+  sort order the app would apply in-page);
+* a form that re-renders the same page keeps the elements found before it
+  usable, as the in-page updates of the real app do.
+
+JavaScript is not run. The scripts the framework itself sends (page state,
+snapshots, element counts, form fills, cart storage, session storage, page
+metrics) are answered in Python instead; any other script raises
+WebDriverException.
+
+Scenarios tagged @http use this backend (see use_http_backend()); all others
+keep the Selenium driver.
+"""
+
+import json
+import re
+import time
+from html.parser import HTMLParser
+from http.cookiejar import Cookie, CookieJar
+from urllib.error import HTTPError
+from urllib.parse import urlencode, urljoin, urlsplit
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+
+from selenium.common.exceptions import (InvalidSelectorException, NoSuchElementException,
+                                        StaleElementReferenceException, WebDriverException)
+from selenium.webdriver.common.by import By
+
+from pages.base_page import COUNT_SCRIPT, FILL_FORM_SCRIPT
+from pages.products_page import ProductsPage
+from pages.snapshot import SNAPSHOT_SCRIPT
+from pages.wait_engine import NAVIGATION_MARK_SCRIPT, NAVIGATION_STATE_SCRIPT, PAGE_STATE_SCRIPT
+from utils import artifacts
+from utils import config
+from utils.config import HTTP_BACKEND
+from utils.instrumentation import recorder
+from utils.page_metrics import CLOCK_SCRIPT, METRICS_SCRIPT
+from utils.session_cache import CAPTURE_STORAGE_SCRIPT, INJECT_STORAGE_SCRIPT
+
+
+HTTP_TAG = 'http'
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+HIDDEN_TAGS = {'head', 'script', 'style', 'template', 'title', 'meta', 'link'}
+
+
+def use_http_backend(tags):
+    """
+    Whether a scenario with these tags runs on HttpDriver.
+
+    HTTP_BACKEND 'auto' uses it for @http scenarios against the local
+    stand-in only (saucedemo.com renders in the browser); 'on' for every
+    @http scenario; 'off' never.
+    """
+    if HTTP_TAG not in tags or HTTP_BACKEND == 'off':
+        return False
+    return HTTP_BACKEND == 'on' or config.LOCAL_APP
+
+
+# -- Document model --------------------------------------------------------
+
+class Node:
+    """An element (or the document root) of a parsed page."""
+
+    def __init__(self, tag, attrs=None, parent=None):
+        """Create a node; appended to its parent's children."""
+        self.tag = tag
+        self.attrs = dict(attrs or {})
+        self.parent = parent
+        self.children = []  # Nodes and text strings
+        self.value = self.attrs.get('value', '')  # Current value of form fields
+        self.selected = 'selected' in self.attrs
+        if parent is not None:
+            parent.children.append(self)
+
+    def elements(self):
+        """Child elements (without text)."""
+        return [child for child in self.children if isinstance(child, Node)]
+
+    def descendants(self):
+        """All descendant elements in document order."""
+        for child in self.elements():
+            yield child
+            yield from child.descendants()
+
+    def ancestors(self):
+        """Parent, grandparent, ... up to the root."""
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def text_content(self):
+        """Concatenated text of the node and its descendants."""
+        return "".join(child if isinstance(child, str) else child.text_content() for child in self.children)
+
+    def rendered_text(self):
+        """Text as a browser would render it: hidden parts dropped, whitespace collapsed."""
+        parts = []
+        for child in self.children:
+            if isinstance(child, str):
+                parts.append(child)
+            elif child.tag not in HIDDEN_TAGS and not _hidden(child):
+                parts.append(child.rendered_text())
+        return re.sub(r'\s+', ' ', "".join(parts)).strip()
+
+    def path(self):
+        """Child-element indexes from the root, used to find this node in a re-rendered page."""
+        indexes, node = [], self
+        while node.parent is not None:
+            indexes.append(node.parent.elements().index(node))
+            node = node.parent
+        return indexes[::-1]
+
+    def outer_html(self):
+        """Serialize the node back to HTML."""
+        if self.tag == '#document':
+            return "".join(child.outer_html() if isinstance(child, Node) else child for child in self.children)
+        attrs = "".join(f' {name}="{value}"' if value is not None else f' {name}'
+                        for name, value in self.attrs.items())
+        if self.tag in VOID_TAGS:
+            return f"<{self.tag}{attrs}>"
+        inner = "".join(child.outer_html() if isinstance(child, Node) else child for child in self.children)
+        return f"<{self.tag}{attrs}>{inner}</{self.tag}>"
+
+
+def _hidden(node):
+    style = node.attrs.get('style') or ''
+    return ('hidden' in node.attrs or re.search(r'display\s*:\s*none', style) is not None
+            or (node.tag == 'input' and (node.attrs.get('type') or '').lower() == 'hidden'))
+
+
+class _TreeBuilder(HTMLParser):
+    """Builds a Node tree from HTML."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node('#document')
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, attrs, self.current)
+        if tag not in VOID_TAGS:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        Node(tag, attrs, self.current)
+
+    def handle_endtag(self, tag):
+        for node in [self.current, *self.current.ancestors()]:
+            if node.tag == tag:
+                self.current = node.parent or self.root
+                return
+
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+
+def parse_html(markup):
+    """Parse HTML into a Node tree; returns the document root."""
+    builder = _TreeBuilder()
+    builder.feed(markup)
+    builder.close()
+    return builder.root
+
+
+# -- CSS selectors ---------------------------------------------------------
+# Supports what the page objects use: tag, #id, .class, [attr], [attr=v],
+# [attr^=v], [attr$=v], [attr*=v], [attr~=v], descendant and child
+# combinators, and selector lists.
+
+_ATTRIBUTE = re.compile(r'\[\s*([\w-]+)\s*(?:([~^$*]?=)\s*(?:"([^"]*)"|\'([^\']*)\'|([^\]\s]+))\s*)?\]')
+_SIMPLE = re.compile(r'#([\w-]+)|\.([\w-]+)|([\w-]+|\*)')
+
+
+def _split_outside_brackets(selector, separator):
+    parts, depth, quote, current = [], 0, None, ''
+    for char in selector:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in '"\'':
+            quote = char
+        elif char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(current)
+            current = ''
+            continue
+        current += char
+    parts.append(current)
+    return parts
+
+
+def _parse_compound(text):
+    """Parse 'tag#id.class[attr=v]' into a list of (kind, name, operator, value) tests."""
+    tests, position = [], 0
+    while position < len(text):
+        match = _ATTRIBUTE.match(text, position)
+        if match:
+            name, operator, *values = match.groups()
+            value = next((v for v in values if v is not None), None)
+            tests.append(('attr', name.lower(), operator, value))
+        else:
+            match = _SIMPLE.match(text, position)
+            if not match:
+                raise InvalidSelectorException(f"Unsupported CSS selector: {text!r}")
+            element_id, css_class, tag = match.groups()
+            if element_id:
+                tests.append(('attr', 'id', '=', element_id))
+            elif css_class:
+                tests.append(('attr', 'class', '~=', css_class))
+            elif tag != '*':
+                tests.append(('tag', tag.lower(), None, None))
+        position = match.end()
+    return tests
+
+
+def parse_selector(selector):
+    """
+    Parse a CSS selector list.
+
+    Returns:
+        list: One list of (combinator, tests) pairs per selector, rightmost last
+    """
+    selectors = []
+    for part in _split_outside_brackets(selector, ','):
+        tokens = re.findall(r'\[[^\]]*\]|>|[^\s>\[]+|\s+', part.strip())
+        steps, compound, combinator = [], '', ' '
+        for token in tokens + [' ']:
+            if token.isspace() or token == '>':
+                if compound:
+                    steps.append((combinator, _parse_compound(compound)))
+                    compound, combinator = '', ' '
+                if token == '>':
+                    combinator = '>'
+            else:
+                compound += token
+        if not steps:
+            raise InvalidSelectorException(f"Empty CSS selector: {selector!r}")
+        selectors.append(steps)
+    return selectors
+
+
+def _matches_tests(node, tests):
+    for kind, name, operator, value in tests:
+        if kind == 'tag':
+            if node.tag != name:
+                return False
+            continue
+        actual = node.attrs.get(name)
+        if actual is None and name not in node.attrs:
+            return False
+        actual = actual or ''
+        if operator is None:
+            continue
+        if ((operator == '=' and actual != value) or (operator == '^=' and not actual.startswith(value))
+                or (operator == '$=' and not actual.endswith(value)) or (operator == '*=' and value not in actual)
+                or (operator == '~=' and value not in actual.split())):
+            return False
+    return True
+
+
+def _matches(node, steps):
+    combinator, tests = steps[-1]
+    if not _matches_tests(node, tests):
+        return False
+    if len(steps) == 1:
+        return True
+    rest = steps[:-1]
+    if combinator == '>':
+        return node.parent is not None and node.parent.tag != '#document' and _matches(node.parent, rest)
+    return any(_matches(ancestor, rest) for ancestor in node.ancestors() if ancestor.tag != '#document')
+
+
+def select_all(root, selector):
+    """All descendants of root matching a CSS selector list, in document order."""
+    selectors = parse_selector(selector)
+    return [node for node in root.descendants() if any(_matches(node, steps) for steps in selectors)]
+
+
+def select_one(root, selector):
+    """First descendant matching a CSS selector list, or None."""
+    found = select_all(root, selector)
+    return found[0] if found else None
+
+
+def _css_for(by, value):
+    if by == By.CSS_SELECTOR:
+        return value
+    if by == By.ID:
+        return f'[id="{value}"]'
+    if by == By.CLASS_NAME:
+        return f'.{value}'
+    if by == By.NAME:
+        return f'[name="{value}"]'
+    if by == By.TAG_NAME:
+        return value
+    raise InvalidSelectorException(f"The HTTP backend does not support {by} locators")
+
+
+# -- WebDriver surface -----------------------------------------------------
+
+class HttpElement:
+    """WebElement look-alike for a node of the driver's current page."""
+
+    def __init__(self, driver, node):
+        """Wrap a node of the driver's current document."""
+        self._driver = driver
+        self._node = node
+        self._generation = driver.generation
+
+    @property
+    def node(self):
+        """The live node; re-bound after a form re-rendered the same page, else stale."""
+        driver = self._driver
+        if self._generation != driver.generation:
+            node = driver.rebind(self._node, self._generation)
+            if node is None:
+                raise StaleElementReferenceException("Element is not attached to the current page")
+            self._node, self._generation = node, driver.generation
+        return self._node
+
+    @property
+    def tag_name(self):
+        """Lower-case tag name."""
+        return self.node.tag
+
+    @property
+    def text(self):
+        """Rendered text."""
+        return self.node.rendered_text() if self.is_displayed() else ''
+
+    def get_attribute(self, name):
+        """Attribute value; 'value' is the current value of a form field."""
+        node = self.node
+        if name == 'value' and node.tag in ('input', 'textarea', 'select', 'option', 'button'):
+            return self._value(node)
+        if name in ('selected', 'checked'):
+            return 'true' if node.selected else None
+        value = node.attrs.get(name)
+        return ('true' if value is None else value) if name in node.attrs else None
+
+    def get_dom_attribute(self, name):
+        """Attribute as written in the HTML."""
+        return self.node.attrs.get(name) if name in self.node.attrs else None
+
+    def get_property(self, name):
+        """A few DOM properties (value, textContent, tagName)."""
+        if name == 'textContent':
+            return self.node.text_content()
+        if name == 'tagName':
+            return self.node.tag.upper()
+        return self.get_attribute(name)
+
+    def is_displayed(self):
+        """False for hidden inputs and nodes inside hidden/display:none ancestors."""
+        node = self.node
+        return not any(_hidden(item) or item.tag in HIDDEN_TAGS for item in [node, *node.ancestors()])
+
+    def is_enabled(self):
+        """False for disabled controls."""
+        return 'disabled' not in self.node.attrs
+
+    def is_selected(self):
+        """Selected <option> or checked checkbox/radio."""
+        return self.node.selected
+
+    def find_element(self, by=By.ID, value=None):
+        """First matching descendant."""
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"No element for {by}={value!r}")
+        return found[0]
+
+    def find_elements(self, by=By.ID, value=None):
+        """All matching descendants."""
+        return [HttpElement(self._driver, node) for node in select_all(self.node, _css_for(by, value))]
+
+    def clear(self):
+        """Empty a text field."""
+        self.node.value = ''
+
+    def send_keys(self, *values):
+        """Type into a text field."""
+        self.node.value += "".join(str(value) for value in values)
+
+    def click(self):
+        """Follow a link, submit a form or choose an option (see module docstring)."""
+        node = self.node
+        if node.tag == 'option':
+            return self._driver.choose_option(node)
+        link = next((item for item in [node, *node.ancestors()] if item.tag == 'a' and 'href' in item.attrs), None)
+        if link is not None:
+            return self._driver.get(urljoin(self._driver.current_url, link.attrs['href']))
+        if self._submits(node):
+            form = next((item for item in node.ancestors() if item.tag == 'form'), None)
+            if form is not None:
+                return self._driver.submit(form, node)
+        if node.tag == 'input' and (node.attrs.get('type') or '').lower() in ('checkbox', 'radio'):
+            node.selected = not node.selected
+
+    @staticmethod
+    def _submits(node):
+        kind = (node.attrs.get('type') or '').lower()
+        return (node.tag == 'button' and kind in ('', 'submit')) or (node.tag == 'input' and kind in ('submit', 'image'))
+
+    @staticmethod
+    def _value(node):
+        if node.tag == 'select':
+            options = [item for item in node.descendants() if item.tag == 'option']
+            chosen = next((item for item in options if item.selected), options[0] if options else None)
+            return HttpElement._value(chosen) if chosen is not None else ''
+        if node.tag == 'option' and 'value' not in node.attrs:
+            return node.rendered_text()
+        if node.tag == 'textarea' and node.value == '':
+            return node.text_content()
+        return node.value
+
+    def screenshot_as_base64(self):
+        """Not available without a browser."""
+        raise WebDriverException("The HTTP backend cannot take screenshots")
+
+
+class HttpDriver:
+    """Duck-typed WebDriver that fetches pages over HTTP (see module docstring)."""
+
+    def __init__(self, timeout=30):
+        """
+        Create a driver with an empty cookie jar.
+
+        Args:
+            timeout (float): Seconds to wait for each HTTP response
+        """
+        self.timeout = timeout
+        self.cookie_jar = CookieJar()
+        self._opener = build_opener(HTTPCookieProcessor(self.cookie_jar))
+        self.current_url = 'about:blank'
+        self.document = parse_html('')
+        self.generation = 0
+        self._previous = {}  # generation -> (url path, document) kept for re-binding elements
+        self.local_storage = {}  # origin -> {key: value}
+        self.session_storage = {}
+        self.timing = None  # Epoch ms of the last document load: start, first byte, end
+        self.requests = 0
+        self._scripts = {
+            PAGE_STATE_SCRIPT: self._page_state,
+            NAVIGATION_MARK_SCRIPT: lambda: None,
+            NAVIGATION_STATE_SCRIPT: lambda: 'complete',  # get() returns with the new page loaded
+            SNAPSHOT_SCRIPT: self._snapshot,
+            COUNT_SCRIPT: self._count,
+            FILL_FORM_SCRIPT: self._fill_form,
+            ProductsPage.SET_CART_SCRIPT: self._set_cart,
+            ProductsPage.CART_RELOADED_SCRIPT: lambda: True,  # _set_cart reloads synchronously
+            CAPTURE_STORAGE_SCRIPT: self._capture_storage,
+            INJECT_STORAGE_SCRIPT: self._inject_storage,
+            CLOCK_SCRIPT: lambda: time.time() * 1000.0,
+            artifacts.PAGE_STATE_SCRIPT: lambda: [self.page_source, self.current_url, self.title],
+        }
+
+    # -- Navigation -----------------------------------------------------
+
+    def _load(self, request):
+        """Send a request (following redirects) and make the response the current page."""
+        start = time.time() * 1000.0
+        with recorder.span('webdriver', f"http {request.get_method()}", transport='http'):
+            try:
+                response = self._opener.open(request, timeout=self.timeout)
+            except HTTPError as e:
+                response = e  # 4xx/5xx pages are still pages
+            first_byte = time.time() * 1000.0
+            body = response.read().decode(response.headers.get_content_charset() or 'utf-8', 'replace')
+            url = response.geturl()
+            response.close()
+        self.requests += 1
+        self._previous = {self.generation: (urlsplit(self.current_url).path, self.document)}
+        self.generation += 1
+        self.current_url = url
+        self.document = parse_html(body)
+        self.timing = {'start': start, 'first_byte': first_byte, 'end': time.time() * 1000.0,
+                       'bytes': len(body.encode('utf-8'))}
+
+    def get(self, url):
+        """Load a page."""
+        self._load(Request(url, headers={'Accept': 'text/html'}))
+
+    def refresh(self):
+        """Reload the current page."""
+        self.get(self.current_url)
+
+    def submit(self, form, submitter=None):
+        """Submit a form like a browser would (successful controls, urlencoded)."""
+        fields = []
+        for node in form.descendants():
+            name = node.attrs.get('name')
+            if not name or 'disabled' in node.attrs:
+                continue
+            kind = (node.attrs.get('type') or '').lower()
+            if node.tag == 'input' and kind in ('submit', 'image', 'button', 'reset'):
+                if node is submitter:
+                    fields.append((name, node.value))
+            elif node.tag == 'button':
+                if node is submitter:
+                    fields.append((name, node.value))
+            elif node.tag == 'input' and kind in ('checkbox', 'radio'):
+                if node.selected or 'checked' in node.attrs:
+                    fields.append((name, node.value or 'on'))
+            elif node.tag in ('input', 'select', 'textarea'):
+                fields.append((name, HttpElement._value(node)))
+        method = (form.attrs.get('method') or 'get').upper()
+        action = urljoin(self.current_url, form.attrs.get('action') or self.current_url)
+        data = urlencode(fields)
+        if method == 'POST':
+            request = Request(action, data=data.encode('utf-8'), method='POST',
+                              headers={'Content-Type': 'application/x-www-form-urlencoded', 'Accept': 'text/html'})
+        else:
+            request = Request(f"{action.split('?')[0]}?{data}", headers={'Accept': 'text/html'})
+        self._load(request)
+
+    def choose_option(self, option):
+        """Select an option; its select's form is submitted to apply the choice."""
+        select = next((item for item in option.ancestors() if item.tag == 'select'), None)
+        if select is not None and 'multiple' not in select.attrs:
+            for item in select.descendants():
+                item.selected = False
+        option.selected = True
+        form = next((item for item in option.ancestors() if item.tag == 'form'), None)
+        if form is not None:
+            self.submit(form)
+
+    def rebind(self, node, generation):
+        """Find an element of an earlier page in the current one (same path, same tag), or None."""
+        path, document = self._previous.get(generation, (None, None))
+        if document is None or path != urlsplit(self.current_url).path:
+            return None
+        current = self.document
+        for index in node.path():
+            children = current.elements()
+            if index >= len(children):
+                return None
+            current = children[index]
+        return current if current.tag == node.tag else None
+
+    # -- Elements and page ----------------------------------------------
+
+    def find_element(self, by=By.ID, value=None):
+        """First matching element; raises NoSuchElementException."""
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"No element for {by}={value!r}")
+        return found[0]
+
+    def find_elements(self, by=By.ID, value=None):
+        """All matching elements."""
+        return [HttpElement(self, node) for node in select_all(self.document, _css_for(by, value))]
+
+    def implicitly_wait(self, seconds):
+        """Accepted and ignored: the page is complete once loaded, so lookups never wait."""
+
+    @property
+    def title(self):
+        """Document title."""
+        node = select_one(self.document, 'title')
+        return node.text_content().strip() if node is not None else ''
+
+    @property
+    def page_source(self):
+        """HTML of the current page (with current form values)."""
+        return self.document.outer_html()
+
+    def _origin(self):
+        parts = urlsplit(self.current_url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    # -- Scripts --------------------------------------------------------
+
+    def execute_script(self, script, *args):
+        """Answer one of the framework's own scripts in Python."""
+        handler = self._scripts.get(script)
+        if handler is None:
+            raise WebDriverException("The HTTP backend does not run JavaScript; use a browser for this scenario")
+        return handler(*args)
+
+    def execute_async_script(self, script, *args):
+        """Answer the page-metrics script from the timing of the last page load."""
+        if script != METRICS_SCRIPT:
+            raise WebDriverException("The HTTP backend does not run JavaScript; use a browser for this scenario")
+        start, timing = args[0], self.timing or {}
+        navigated = timing.get('start', 0) >= start
+        return {
+            'path': urlsplit(self.current_url).path,
+            'navigated': navigated,
+            'duration_ms': round(timing.get('end', start) - start, 1) if navigated else 0.0,
+            'resources': 0, 'transfer_bytes': 0, 'resource_ms': 0, 'slowest_resource': None,
+            'long_tasks': None, 'long_task_ms': None,
+            'ttfb_ms': round(timing.get('first_byte', 0) - timing.get('start', 0), 1),
+            'dom_content_loaded_ms': round(timing.get('end', 0) - timing.get('start', 0), 1),
+            'load_ms': round(timing.get('end', 0) - timing.get('start', 0), 1),
+            'document_bytes': timing.get('bytes', 0),
+        }
+
+    def _page_state(self):
+        # Nothing runs after a response has been parsed: always settled
+        return {'readyState': 'complete', 'quietMs': float('inf'), 'pendingRequests': 0, 'runningAnimations': 0}
+
+    def _count(self, by, value):
+        """Python version of COUNT_SCRIPT (CSS locators only)."""
+        if by == By.XPATH:
+            raise WebDriverException("The HTTP backend does not support XPath locators")
+        elements = [HttpElement(self, node) for node in select_all(self.document, value)]
+        return {'count': len(elements), 'visible': sum(1 for element in elements if element.is_displayed())}
+
+    def _fill_form(self, fields, text_types):
+        """Python version of FILL_FORM_SCRIPT."""
+        statuses = []
+        for by, value, text in fields:
+            node = select_one(self.document, value) if by != By.XPATH else None
+            if node is None:
+                statuses.append('missing')
+            elif (not HttpElement(self, node).is_displayed() or {'disabled', 'readonly'} & set(node.attrs)
+                  or (node.tag == 'input' and node.attrs.get('type', 'text').lower() not in text_types)):
+                statuses.append('not editable')
+            else:
+                node.value = text
+                statuses.append('ok')
+        return statuses
+
+    def _snapshot(self):
+        """Python version of SNAPSHOT_SCRIPT."""
+        def text(root, selector):
+            node = select_one(root, selector)
+            return node.rendered_text() if node is not None else None
+
+        items = []
+        for row in select_all(self.document, '.inventory_item, .cart_item'):
+            link = select_one(row, '[id$="_title_link"], [id$="_img_link"]')
+            button = select_one(row, 'button[data-test]')
+            items.append({'id': link.attrs['id'].split('_')[1] if link is not None else None,
+                          'name': text(row, '.inventory_item_name'),
+                          'price': text(row, '.inventory_item_price'),
+                          'button': button.attrs['data-test'] if button is not None else None})
+        return {
+            'url': self.current_url,
+            'title': text(self.document, '.title'),
+            'items': items,
+            'cart_badge': text(self.document, '.shopping_cart_badge'),
+            'buttons': [node.attrs['data-test'] for node in
+                        select_all(self.document, 'button[data-test], input[type="submit"][data-test]')],
+            'subtotal': text(self.document, '.summary_subtotal_label'),
+            'tax': text(self.document, '.summary_tax_label'),
+            'total': text(self.document, '.summary_total_label'),
+        }
+
+    def _set_cart(self, ids):
+        """ProductsPage.SET_CART_SCRIPT: write the cart to storage and its cookie, then reload."""
+        self.local_storage.setdefault(self._origin(), {})['cart-contents'] = json.dumps(ids)
+        self.add_cookie({'name': 'cart-contents', 'value': '-'.join(str(item) for item in ids), 'path': '/'})
+        self.refresh()
+
+    def _capture_storage(self):
+        origin = self._origin()
+        return [dict(self.local_storage.get(origin, {})), dict(self.session_storage.get(origin, {}))]
+
+    def _inject_storage(self, local, session):
+        origin = self._origin()
+        self.local_storage.setdefault(origin, {}).update(local)
+        self.session_storage.setdefault(origin, {}).update(session)
+
+    # -- Cookies and lifecycle ------------------------------------------
+
+    def get_cookies(self):
+        """Cookies in WebDriver format."""
+        return [{'name': cookie.name, 'value': cookie.value, 'path': cookie.path, 'domain': cookie.domain,
+                 'secure': cookie.secure, 'httpOnly': cookie.has_nonstandard_attr('HttpOnly'),
+                 **({'expiry': cookie.expires} if cookie.expires else {})}
+                for cookie in self.cookie_jar]
+
+    def add_cookie(self, cookie):
+        """Add a cookie for the current host (WebDriver cookie dict)."""
+        domain = cookie.get('domain') or urlsplit(self.current_url).hostname or ''
+        self.cookie_jar.set_cookie(Cookie(
+            version=0, name=cookie['name'], value=cookie['value'], port=None, port_specified=False,
+            domain=domain, domain_specified=False, domain_initial_dot=domain.startswith('.'),
+            path=cookie.get('path', '/'), path_specified=True, secure=cookie.get('secure', False),
+            expires=cookie.get('expiry'), discard=cookie.get('expiry') is None, comment=None,
+            comment_url=None, rest={'HttpOnly': None} if cookie.get('httpOnly') else {}))
+
+    def delete_all_cookies(self):
+        """Drop every cookie."""
+        self.cookie_jar.clear()
+
+    def get_log(self, log_type):
+        """No browser logs without a browser."""
+        raise WebDriverException("The HTTP backend has no browser logs")
+
+    def get_screenshot_as_base64(self):
+        """No screenshots without a browser."""
+        raise WebDriverException("The HTTP backend cannot take screenshots")
+
+    def maximize_window(self):
+        """Nothing to do."""
+
+    def quit(self):
+        """Forget the session."""
+        self.cookie_jar.clear()
+        self.document = parse_html('')
+        self._previous = {}
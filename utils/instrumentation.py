@@ -0,0 +1,247 @@
+"""Latency instrumentation for steps, page actions, waits and WebDriver commands.
+
+Spans are collected in memory by the process-wide `recorder` and written at
+the end of the run as a JSON summary (p50/p95 and histograms per category)
+and as a Chrome trace-event file that opens in Perfetto or about:tracing.
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from utils.config import INSTRUMENT
+
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000)
+
+
+def percentile(values, fraction):
+    """Return the nearest-rank percentile of a list of numbers (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def histogram(values_ms):
+    """Bucket millisecond values into HISTOGRAM_BOUNDS_MS."""
+    buckets = {f"<={bound}": 0 for bound in HISTOGRAM_BOUNDS_MS}
+    buckets[f">{HISTOGRAM_BOUNDS_MS[-1]}"] = 0
+    for value in values_ms:
+        for bound in HISTOGRAM_BOUNDS_MS:
+            if value <= bound:
+                buckets[f"<={bound}"] += 1
+                break
+        else:
+            buckets[f">{HISTOGRAM_BOUNDS_MS[-1]}"] += 1
+    return buckets
+
+
+def latency_stats(values_ms):
+    """Return count, total, p50, p95, max and histogram for millisecond values."""
+    return {
+        'count': len(values_ms),
+        'total_ms': round(sum(values_ms), 2),
+        'p50_ms': round(percentile(values_ms, 0.50), 2),
+        'p95_ms': round(percentile(values_ms, 0.95), 2),
+        'max_ms': round(max(values_ms), 2) if values_ms else 0.0,
+        'histogram_ms': histogram(values_ms),
+    }
+
+
+class Recorder:
+    """Collects timed spans from any thread of the current process."""
+
+    def __init__(self, enabled=INSTRUMENT):
+        """Initialize an empty recorder."""
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Drop all recorded spans and restart the clock."""
+        with self._lock:
+            self.origin = time.perf_counter()
+            self.spans = []
+
+    def record(self, category, name, start, duration, **args):
+        """
+        Record a finished span.
+
+        Args:
+            category (str): e.g. 'step', 'page', 'wait', 'webdriver', 'driver', 'sleep'
+            name (str): Span name within the category
+            start (float): time.perf_counter() value when the span started
+            duration (float): Span length in seconds
+            **args: Extra JSON-serializable attributes
+        """
+        if not self.enabled:
+            return
+        span = {'cat': category, 'name': name, 'start': start, 'dur': duration,
+                'tid': threading.get_ident(), 'args': args}
+        with self._lock:
+            self.spans.append(span)
+
+    @contextmanager
+    def span(self, category, name, **args):
+        """Context manager that records the duration of its block."""
+        if not self.enabled:
+            yield args
+            return
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.record(category, name, start, time.perf_counter() - start, **args)
+
+    def instrument_driver(self, driver):
+        """
+        Record every WebDriver command sent by a driver instance.
+
+        RemoteWebDriver routes all commands through execute(), so an
+        instance-level wrapper sees each HTTP round-trip to the driver.
+        """
+        execute = driver.execute
+
+        def timed_execute(driver_command, params=None):
+            with self.span('webdriver', driver_command):
+                return execute(driver_command, params)
+
+        driver.execute = timed_execute
+        return driver
+
+    def count(self, category, name=None):
+        """Count recorded spans of a category (and optionally a name)."""
+        with self._lock:
+            return sum(1 for span in self.spans
+                       if span['cat'] == category and (name is None or span['name'] == name))
+
+    def summary(self):
+        """
+        Build the per-run summary.
+
+        Returns:
+            dict: Latency stats per category and per category:name, plus a
+            'waits' section comparing blocked time with each wait's budget
+        """
+        with self._lock:
+            spans = list(self.spans)
+        by_category, by_name = {}, {}
+        for span in spans:
+            value = span['dur'] * 1000
+            by_category.setdefault(span['cat'], []).append(value)
+            by_name.setdefault(f"{span['cat']}:{span['name']}", []).append(value)
+
+        waits = [span for span in spans if span['cat'] == 'wait']
+        worst = sorted(waits, key=lambda span: span['dur'], reverse=True)[:10]
+        return {
+            'run': {'pid': os.getpid(), 'spans': len(spans),
+                    'elapsed_s': round(time.perf_counter() - self.origin, 3)},
+            'categories': {cat: latency_stats(values) for cat, values in sorted(by_category.items())},
+            'names': {name: latency_stats(values) for name, values in sorted(by_name.items())},
+            'waits': {
+                'count': len(waits),
+                'blocked_ms_total': round(sum(span['dur'] for span in waits) * 1000, 2),
+                'budget_ms_total': round(sum(span['args'].get('budget_s', 0) for span in waits) * 1000, 2),
+                'timeouts': sum(1 for span in waits if span['args'].get('timed_out')),
+                'worst': [{'name': span['name'], 'blocked_ms': round(span['dur'] * 1000, 2),
+                           'budget_ms': round(span['args'].get('budget_s', 0) * 1000, 2),
+                           'timed_out': span['args'].get('timed_out', False)} for span in worst],
+            },
+        }
+
+    def trace_events(self):
+        """Convert spans into Chrome trace-event 'complete' (ph=X) events."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        return [{'name': span['name'], 'cat': span['cat'], 'ph': 'X', 'pid': pid, 'tid': span['tid'],
+                 'ts': round((span['start'] - self.origin) * 1e6, 1),
+                 'dur': round(span['dur'] * 1e6, 1), 'args': span['args']}
+                for span in spans]
+
+    def write(self, summary_path, trace_path):
+        """Write the JSON summary and the trace-event file."""
+        for path in (summary_path, trace_path):
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(summary_path, 'w', encoding='utf-8') as file:
+            json.dump(self.summary(), file, indent=2)
+        with open(trace_path, 'w', encoding='utf-8') as file:
+            json.dump({'traceEvents': self.trace_events(), 'displayTimeUnit': 'ms'}, file)
+
+
+# Shared by the page objects, the driver factory and the behave hooks
+recorder = Recorder()
+
+
+# Categories of the @timed calls running in the current thread (or asyncio task)
+_active_timed = contextvars.ContextVar('active_timed', default=frozenset())
+
+
+def timed(category):
+    """
+    Decorator recording each call of a method (or coroutine method) as a span named Class.method.
+
+    Calls made inside another call of the same category (e.g. fill_form
+    falling back to enter_text) are not recorded: the outer span already
+    covers their time, and recording both would count it twice.
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                active = _active_timed.get()
+                if category in active:
+                    return await func(self, *args, **kwargs)
+                token = _active_timed.set(active | {category})
+                try:
+                    with recorder.span(category, f"{type(self).__name__}.{func.__name__}"):
+                        return await func(self, *args, **kwargs)
+                finally:
+                    _active_timed.reset(token)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            active = _active_timed.get()
+            if category in active:
+                return func(self, *args, **kwargs)
+            token = _active_timed.set(active | {category})
+            try:
+                with recorder.span(category, f"{type(self).__name__}.{func.__name__}"):
+                    return func(self, *args, **kwargs)
+            finally:
+                _active_timed.reset(token)
+        return wrapper
+    return decorator
+
+
+class TimedWait(WebDriverWait):
+    """WebDriverWait that records how long each until() blocked against its budget."""
+
+    def until(self, method, message=""):
+        """Wait like WebDriverWait.until and record the blocked time."""
+        # "presence_of_element_located.<locals>._predicate" -> "presence_of_element_located"
+        name = getattr(method, '__qualname__', type(method).__name__).split('.<locals>')[0]
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super().until(method, message)
+        except TimeoutException:
+            timed_out = True
+            raise
+        finally:
+            recorder.record('wait', name, start, time.perf_counter() - start,
+                            budget_s=self._timeout, timed_out=timed_out)
@@ -0,0 +1,396 @@
+"""Load generation: virtual users walking a shop journey through the page objects.
+
+Every virtual user (VU) owns one AsyncWebDriver session and repeats a named
+journey, a list of steps built from the awaitable page objects, so the flow
+is exactly the one the scenarios test. All VUs run on one event loop.
+
+The number of active VUs follows a ramp schedule of stages, each ramping
+linearly to a target over some seconds (like k6's stages). VUs above the
+current target finish their iteration and wait. The run ends when the
+schedule (or --duration) is over, or after --iterations per VU; with
+--iterations, VUs above the final target stop when the schedule ends.
+
+Usage:
+    python -m utils.load_test --journey purchase --users 10 --ramp-up 20 --duration 60
+    python -m utils.load_test --journey browse --stages 10:5,30:5,10:20,30:20 --local-latency 0.05
+    python -m utils.load_test --journey login --users 4 --iterations 25 --target https://staging.example
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+from selenium.common.exceptions import InvalidSessionIdException
+
+from local_app import LocalApp
+from pages.async_pages import (AsyncCartPage, AsyncCheckoutCompletePage, AsyncCheckoutStepOnePage,
+                               AsyncCheckoutStepTwoPage, AsyncLoginPage, AsyncProductsPage)
+from utils import config
+from utils.async_webdriver import AsyncWebDriver
+from utils.driver_factory import driver_services
+from utils.instrumentation import percentile
+from utils.test_data import test_data
+
+
+LOAD_TEST_PATH = "reports/load_test.json"
+
+
+# -- Journeys ----------------------------------------------------------------
+# Each step is an async function taking the VirtualUser; a step fails by raising.
+
+async def step_open_login(vu):
+    """Open the login page."""
+    await AsyncLoginPage(vu.driver).navigate()
+
+
+async def step_login(vu):
+    """Log in through the form and land on the products page."""
+    login_page = AsyncLoginPage(vu.driver)
+    await login_page.login(vu.username, vu.password)
+    if not await AsyncProductsPage(vu.driver).is_products_page_displayed():
+        raise AssertionError("Products page not displayed after login")
+
+
+async def step_browse(vu):
+    """Read the product list."""
+    products = await AsyncProductsPage(vu.driver).get_products()
+    if not products:
+        raise AssertionError("No products listed")
+
+
+async def step_add_to_cart(vu):
+    """Add products to the cart by clicking their buttons."""
+    await AsyncProductsPage(vu.driver).add_products_to_cart(vu.items)
+
+
+async def step_open_cart(vu):
+    """Open the cart page."""
+    await AsyncProductsPage(vu.driver).click_cart()
+    if not await AsyncCartPage(vu.driver).is_cart_page_displayed():
+        raise AssertionError("Cart page not displayed")
+
+
+async def step_checkout(vu):
+    """Start the checkout."""
+    await AsyncCartPage(vu.driver).click_checkout()
+
+
+async def step_fill_information(vu):
+    """Fill in the customer information and continue."""
+    step_one = AsyncCheckoutStepOnePage(vu.driver)
+    await step_one.fill_checkout_form(*vu.customer)
+    await step_one.click_continue()
+
+
+async def step_finish(vu):
+    """Check the order summary and finish the order."""
+    step_two = AsyncCheckoutStepTwoPage(vu.driver)
+    if not await step_two.verify_order_summary():
+        raise AssertionError("Order summary does not add up")
+    await step_two.click_finish()
+    if not await AsyncCheckoutCompletePage(vu.driver).is_order_successful():
+        raise AssertionError("Order was not completed")
+
+
+JOURNEYS = {
+    'login': [('open_login', step_open_login), ('login', step_login)],
+    'browse': [('open_login', step_open_login), ('login', step_login), ('browse', step_browse)],
+    'purchase': [('open_login', step_open_login), ('login', step_login), ('add_to_cart', step_add_to_cart),
+                 ('open_cart', step_open_cart), ('checkout', step_checkout),
+                 ('fill_information', step_fill_information), ('finish', step_finish)],
+}
+
+
+# -- Schedule ----------------------------------------------------------------
+
+def parse_stages(text):
+    """
+    Parse "seconds:target,..." into [(seconds, target), ...].
+
+    Example: "10:5,30:5,10:0" ramps to 5 VUs in 10 s, holds 30 s, ramps down in 10 s.
+    """
+    stages = []
+    for part in text.split(','):
+        seconds, _, target = part.partition(':')
+        stages.append((float(seconds), int(target)))
+    return stages
+
+
+def target_users(stages, elapsed):
+    """Number of VUs that should be active `elapsed` seconds into the schedule."""
+    previous = 0
+    for seconds, target in stages:
+        if elapsed < seconds:
+            return int(round(previous + (target - previous) * (elapsed / seconds if seconds else 1)))
+        elapsed -= seconds
+        previous = target
+    return previous
+
+
+# -- Running -----------------------------------------------------------------
+
+class LoadStats:
+    """Step latencies, errors and completed iterations of a run."""
+
+    def __init__(self, steps):
+        """Initialize empty stats for the journey's step names (plus browser 'session' starts)."""
+        steps = ['session', *steps]
+        self.latencies = {name: [] for name in steps}
+        self.errors = {name: {} for name in steps}
+        self.iterations = 0
+        self.failed_iterations = 0
+        self.active = []  # (seconds into the run, active VUs), sampled once per second
+
+    def record(self, step, seconds, error=None):
+        """Record one step execution."""
+        self.latencies[step].append(seconds * 1000.0)
+        if error is not None:
+            kind = type(error).__name__
+            self.errors[step][kind] = self.errors[step].get(kind, 0) + 1
+
+    def report(self, wall_clock):
+        """Summary dict: throughput, per-step percentiles and error rates."""
+        steps = {}
+        for name, values in self.latencies.items():
+            errors = sum(self.errors[name].values())
+            steps[name] = {
+                'count': len(values),
+                'errors': errors,
+                'error_rate': round(errors / len(values), 4) if values else 0.0,
+                'error_types': self.errors[name],
+                'p50_ms': round(percentile(values, 0.50), 1),
+                'p90_ms': round(percentile(values, 0.90), 1),
+                'p95_ms': round(percentile(values, 0.95), 1),
+                'p99_ms': round(percentile(values, 0.99), 1),
+                'max_ms': round(max(values), 1) if values else 0.0,
+            }
+        completed = self.iterations + self.failed_iterations
+        return {
+            'wall_clock_seconds': round(wall_clock, 2),
+            'iterations': self.iterations,
+            'failed_iterations': self.failed_iterations,
+            'error_rate': round(self.failed_iterations / completed, 4) if completed else 0.0,
+            'iterations_per_second': round(self.iterations / wall_clock, 3) if wall_clock else 0.0,
+            'steps_per_second': round(sum(len(values) for name, values in self.latencies.items()
+                                          if name != 'session') / wall_clock, 3) if wall_clock else 0.0,
+            'peak_users': max((users for _, users in self.active), default=0),
+            'active_users': self.active,
+            'steps': steps,
+        }
+
+
+class VirtualUser:
+    """One simulated user: a browser session repeating the journey."""
+
+    def __init__(self, index, username, password, customer, items=1, browser=config.BROWSER,
+                 headless=config.HEADLESS):
+        """
+        Initialize the VU (the session is started on its first iteration).
+
+        Args:
+            index (int): VU number; VU i is active while the target exceeds i
+            username (str): Login name
+            password (str): Login password
+            customer (tuple): first name, last name, postal code for checkout
+            items (int): Products added to the cart
+            browser (str): 'chrome' or 'firefox'
+            headless (bool): Run the browser headless
+        """
+        self.index = index
+        self.username = username
+        self.password = password
+        self.customer = customer
+        self.items = items
+        self.browser = browser
+        self.headless = headless
+        self.driver = None
+
+    async def reset(self):
+        """
+        Start the session if needed, else clear cookies and storage for a new iteration.
+
+        Returns:
+            bool: True if a new session was started
+        """
+        if self.driver is None:
+            self.driver = await AsyncWebDriver.create(self.browser, self.headless)
+            return True
+        await self.driver.delete_all_cookies()
+        await self.driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        return False
+
+    async def iterate(self, journey, stats, think_time=0.0):
+        """
+        Run the journey once; the first failing step ends the iteration.
+
+        Returns:
+            bool: True if every step passed
+        """
+        start = time.perf_counter()
+        try:
+            if await self.reset():
+                stats.record('session', time.perf_counter() - start)
+        except Exception as e:
+            stats.record('session', time.perf_counter() - start, e)
+            await self.close()
+            await asyncio.sleep(1)  # Do not hammer a driver service that cannot start browsers
+            return False
+        for name, step in journey:
+            start = time.perf_counter()
+            try:
+                await step(self)
+            except Exception as e:
+                stats.record(name, time.perf_counter() - start, e)
+                if isinstance(e, InvalidSessionIdException):
+                    self.driver = None  # The browser is gone; start a new one next iteration
+                return False
+            stats.record(name, time.perf_counter() - start)
+            if think_time:
+                await asyncio.sleep(think_time)
+        return True
+
+    async def close(self):
+        """Quit the VU's session."""
+        if self.driver is not None:
+            await self.driver.quit()
+            self.driver = None
+
+
+async def run_load(journey, stages, iterations=None, users=None, think_time=0.0, items=1,
+                   browser=config.BROWSER, headless=config.HEADLESS):
+    """
+    Run virtual users on the current event loop.
+
+    Args:
+        journey (list): (step name, async step) pairs, see JOURNEYS
+        stages (list): (seconds, target VUs) ramp schedule
+        iterations (int): Stop each VU after this many iterations (default: run the schedule)
+        users (list): (username, password) pairs assigned to VUs round-robin
+        think_time (float): Seconds a VU pauses between steps
+        items (int): Products added to the cart in purchase journeys
+        browser (str): 'chrome' or 'firefox'
+        headless (bool): Run the browsers headless
+
+    Returns:
+        dict: LoadStats.report()
+    """
+    users = users or [("standard_user", "secret_sauce")]
+    customers = [(row['first_name'], row['last_name'], row['postal_code']) for row in test_data.rows()]
+    stats = LoadStats([name for name, _ in journey])
+    peak = max(target for _, target in stages)
+    duration = sum(seconds for seconds, _ in stages)
+    start = time.perf_counter()
+
+    def elapsed():
+        return time.perf_counter() - start
+
+    def finished():
+        return iterations is None and elapsed() >= duration
+
+    async def run_vu(vu):
+        done = 0
+        try:
+            while not finished() and (iterations is None or done < iterations):
+                if target_users(stages, elapsed()) <= vu.index:
+                    if elapsed() >= duration:
+                        break  # Ramped out for good: the target no longer changes after the schedule
+                    await vu.close()  # Ramped down (or not ramped up yet): free the browser
+                    await asyncio.sleep(0.1)
+                    continue
+                if await vu.iterate(journey, stats, think_time):
+                    stats.iterations += 1
+                else:
+                    stats.failed_iterations += 1
+                done += 1
+        finally:
+            await vu.close()
+
+    async def sample_active():
+        while True:
+            stats.active.append((round(elapsed()), sum(1 for vu in vus if vu.driver is not None)))
+            await asyncio.sleep(1)
+
+    vus = [VirtualUser(index, *users[index % len(users)], customers[index % len(customers)], items,
+                       browser, headless)
+           for index in range(peak)]
+    sampler = asyncio.ensure_future(sample_active())
+    try:
+        await asyncio.gather(*(run_vu(vu) for vu in vus))
+    finally:
+        sampler.cancel()
+    return stats.report(elapsed())
+
+
+def format_report(report):
+    """Human-readable table of a load-test report."""
+    lines = [f"{'step':<18}{'count':>7}{'errors':>8}{'p50 ms':>9}{'p90 ms':>9}{'p95 ms':>9}"
+             f"{'p99 ms':>9}{'max ms':>9}"]
+    for name, step in report['steps'].items():
+        lines.append(f"{name:<18}{step['count']:>7}{step['errors']:>8}{step['p50_ms']:>9.0f}"
+                     f"{step['p90_ms']:>9.0f}{step['p95_ms']:>9.0f}{step['p99_ms']:>9.0f}{step['max_ms']:>9.0f}")
+    lines.append(f"Iterations: {report['iterations']} passed, {report['failed_iterations']} failed "
+                 f"(error rate {report['error_rate']:.1%}) in {report['wall_clock_seconds']:.1f}s; "
+                 f"{report['iterations_per_second']:.2f} iterations/s, {report['steps_per_second']:.2f} steps/s, "
+                 f"peak {report['peak_users']} users")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run virtual users through a shop journey.")
+    parser.add_argument('--journey', choices=sorted(JOURNEYS), default='purchase')
+    parser.add_argument('--users', type=int, default=5, help="Concurrent virtual users")
+    parser.add_argument('--ramp-up', type=float, default=0.0, help="Seconds to ramp up to --users")
+    parser.add_argument('--duration', type=float, default=60.0,
+                        help="Seconds to run at --users after the ramp-up")
+    parser.add_argument('--stages', type=parse_stages,
+                        help="Ramp schedule 'seconds:target,...' (overrides --users/--ramp-up/--duration)")
+    parser.add_argument('--iterations', type=int, help="Iterations per virtual user instead of a duration")
+    parser.add_argument('--think-time', type=float, default=0.0, help="Seconds between steps")
+    parser.add_argument('--items', type=int, default=1, help="Products added to the cart (purchase)")
+    parser.add_argument('--user', action='append',
+                        help="Username to log in with (may be repeated; default standard_user)")
+    parser.add_argument('--browser', default=config.BROWSER)
+    parser.add_argument('--headed', action='store_true', help="Show the browsers")
+    parser.add_argument('--target', help="Application URL (default: start the local stand-in)")
+    parser.add_argument('--local-latency', type=float, default=0.0,
+                        help="Seconds the local stand-in adds to every response")
+    parser.add_argument('--output', default=LOAD_TEST_PATH, help="Where to write the JSON report")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run a load test and write the report. Returns a process exit code."""
+    args = parse_args(argv)
+    stages = args.stages or [(args.ramp_up, args.users), (args.duration, args.users)]
+    users = [(username, test_data.password_for(username, default="secret_sauce"))
+             for username in (args.user or ["standard_user"])]
+    app = None
+    if args.target:
+        config.BASE_URL = args.target.rstrip('/')
+    else:
+        app = LocalApp(latency=args.local_latency).start()
+        config.BASE_URL = app.url
+    print(f"Load test '{args.journey}' against {config.BASE_URL}: stages {stages}"
+          + (f", {args.iterations} iterations per user" if args.iterations else ""))
+    try:
+        report = asyncio.run(run_load(JOURNEYS[args.journey], stages, args.iterations, users,
+                                      args.think_time, args.items, args.browser, not args.headed))
+    finally:
+        driver_services.stop_all()
+        if app:
+            app.stop()
+    report.update(journey=args.journey, target=config.BASE_URL, stages=stages, browser=args.browser)
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    print(format_report(report))
+    print(f"Report written to {args.output}")
+    return 1 if report['failed_iterations'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""Browser-side performance metrics per page-object transition, with latency budgets.
+
+Page objects wrap the actions that move to another page (login -> inventory,
+inventory -> cart, the checkout steps) in BasePage.transition(). The browser
+clock is read before the action; afterwards one script reads Navigation
+Timing (for a full page load), the resources fetched and the long tasks run
+since then. Single-page-app route changes, which do not create a new
+document, are measured up to the moment the new page was read.
+
+Budgets are per page and metric, in milliseconds, e.g.
+    PAGE_BUDGETS='{"inventory": {"duration_ms": 3000, "long_task_ms": 200}}'
+or for one scenario in Gherkin:
+    Given the "inventory" page has a budget of 3000 ms
+A transition over budget fails the step with the measured numbers.
+
+Measuring costs two script round-trips per transition, so it is off unless
+PAGE_METRICS is set; a budget (from PAGE_BUDGETS or the scenario) turns it
+on, since a budget cannot be checked without it.
+"""
+
+import json
+import os
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.config import PAGE_BUDGETS, PAGE_METRICS
+from utils.instrumentation import recorder
+
+
+# Browser epoch time in ms, read before the transition's action
+CLOCK_SCRIPT = "return performance.timeOrigin + performance.now();"
+
+# arguments[0]: browser epoch ms at the start of the transition. Long tasks are
+# delivered to a buffered observer asynchronously, hence the async script.
+METRICS_SCRIPT = """
+var start = arguments[0];
+var done = arguments[arguments.length - 1];
+var since = start - performance.timeOrigin;
+var navigated = since < 0;  // this document was created after the transition started
+var from = Math.max(since, 0);
+var nav = performance.getEntriesByType('navigation')[0];
+function round(value) { return Math.round(value * 10) / 10; }
+function build(longTasks) {
+    var resources = performance.getEntriesByType('resource').filter(function (r) { return r.startTime >= from; });
+    var slowest = resources.reduce(function (a, b) { return !a || b.duration > a.duration ? b : a; }, null);
+    var result = {
+        path: location.pathname,
+        navigated: navigated,
+        duration_ms: round(navigated && nav && nav.loadEventEnd
+            ? performance.timeOrigin + nav.loadEventEnd - start : performance.now() - from),
+        resources: resources.length,
+        transfer_bytes: resources.reduce(function (sum, r) { return sum + (r.transferSize || 0); }, 0),
+        resource_ms: slowest ? round(slowest.duration) : 0,
+        slowest_resource: slowest ? slowest.name : null,
+        long_tasks: longTasks === null ? null : longTasks.length,
+        long_task_ms: longTasks === null ? null
+            : round(longTasks.reduce(function (sum, t) { return sum + t.duration; }, 0))
+    };
+    if (navigated && nav) {
+        result.ttfb_ms = round(nav.responseStart - nav.requestStart);
+        result.dom_content_loaded_ms = round(nav.domContentLoadedEventEnd);
+        result.load_ms = round(nav.loadEventEnd);
+        result.document_bytes = nav.transferSize || 0;
+    }
+    return result;
+}
+if (window.PerformanceObserver && (PerformanceObserver.supportedEntryTypes || []).indexOf('longtask') >= 0) {
+    var tasks = [];
+    var observer = new PerformanceObserver(function (list) { tasks = tasks.concat(list.getEntries()); });
+    observer.observe({type: 'longtask', buffered: true});
+    setTimeout(function () {
+        tasks = tasks.concat(observer.takeRecords());
+        observer.disconnect();
+        done(build(tasks.filter(function (t) { return t.startTime >= from; })));
+    }, 0);
+} else {
+    done(build(null));  // e.g. Firefox: no Long Tasks API
+}
+"""
+
+
+class PageBudgetExceeded(AssertionError):
+    """A page transition was slower than its latency budget."""
+
+
+def format_metrics(metrics):
+    """One-line summary of a transition's metrics."""
+    parts = [f"{metrics['duration_ms']:.0f} ms"]
+    if metrics.get('navigated'):
+        parts.append(f"ttfb {metrics.get('ttfb_ms', 0):.0f} ms, "
+                     f"DOMContentLoaded {metrics.get('dom_content_loaded_ms', 0):.0f} ms, "
+                     f"load {metrics.get('load_ms', 0):.0f} ms")
+    else:
+        parts.append("in-page route change")
+    parts.append(f"{metrics['resources']} resources ({metrics['transfer_bytes'] / 1024:.1f} KiB, "
+                 f"slowest {metrics['resource_ms']:.0f} ms)")
+    if metrics.get('long_tasks') is not None:
+        parts.append(f"{metrics['long_tasks']} long tasks ({metrics['long_task_ms']:.0f} ms)")
+    return f"{metrics['page']}: " + ", ".join(parts)
+
+
+class PageMetrics:
+    """Collects transition metrics and checks them against budgets."""
+
+    def __init__(self, budgets=PAGE_BUDGETS, enabled=PAGE_METRICS):
+        """
+        Initialize the collector.
+
+        Args:
+            budgets (dict): Page name -> {metric: max ms} applying to every scenario
+            enabled (bool): Measure every transition, not only budgeted ones
+        """
+        self.enabled = enabled
+        self.budgets = budgets
+        self.overrides = {}  # Budgets declared by the current scenario
+        self.pending = []  # Metrics of the current step
+        self.entries = []  # Metrics per step for the whole run
+
+    def reset_scenario(self):
+        """Forget the budgets and metrics of the previous scenario."""
+        self.overrides = {}
+        self.pending = []
+
+    def set_budget(self, page, budget_ms, metric='duration_ms'):
+        """Set a budget for the current scenario only."""
+        self.overrides.setdefault(page, {})[metric] = budget_ms
+
+    def budget_for(self, page):
+        """Effective budgets of a page (scenario overrides win)."""
+        return dict(self.budgets.get(page, {}), **self.overrides.get(page, {}))
+
+    @property
+    def measuring(self):
+        """True if transitions are measured now: enabled, or a budget applies to this scenario."""
+        return self.enabled or bool(self.budgets) or bool(self.overrides)
+
+    def start(self, driver):
+        """
+        Read the browser clock before a transition's action.
+
+        Returns:
+            float: Browser epoch ms, or None when not measuring or unavailable
+        """
+        if not self.measuring:
+            return None
+        try:
+            return driver.execute_script(CLOCK_SCRIPT)
+        except WebDriverException as e:
+            print(f"Could not read the browser clock: {e.msg}")
+            return None
+
+    def finish(self, driver, page, started):
+        """
+        Measure a transition and check its budget.
+
+        Args:
+            driver: WebDriver instance
+            page (str): Page name, the last URL path segment without '.html'
+            started (float): Value returned by start()
+
+        Returns:
+            dict: Metrics, or None if the browser did not end up on `page`
+            (e.g. a rejected login) or metrics are unavailable
+
+        Raises:
+            PageBudgetExceeded: A metric is over the page's budget
+        """
+        if started is None:
+            return None
+        begin = time.perf_counter()
+        try:
+            metrics = driver.execute_async_script(METRICS_SCRIPT, started)
+        except WebDriverException as e:
+            print(f"Could not read page metrics for {page}: {e.msg}")
+            return None
+        if os.path.basename(metrics['path']).replace('.html', '') != page:
+            return None
+        metrics['page'] = page
+        recorder.record('page_load', page, begin - metrics['duration_ms'] / 1000.0,
+                        metrics['duration_ms'] / 1000.0, navigated=metrics['navigated'])
+        self.pending.append(metrics)
+        over = {metric: limit for metric, limit in self.budget_for(page).items()
+                if (metrics.get(metric) or 0) > limit}
+        if over:
+            budgets = ", ".join(f"{metric} {metrics[metric]:.0f} > {limit} ms" for metric, limit in over.items())
+            raise PageBudgetExceeded(f"Page budget exceeded for {page} ({budgets}). "
+                                     f"Measured {format_metrics(metrics)}")
+        return metrics
+
+    def take(self, scenario_location, step_location):
+        """
+        Hand over the metrics collected during a step and keep them for the run report.
+
+        Returns:
+            list: Metrics of the step's transitions
+        """
+        metrics, self.pending = self.pending, []
+        if metrics:
+            self.entries.append({'scenario': scenario_location, 'step': step_location,
+                                 'transitions': metrics})
+        return metrics
+
+    def write(self, path):
+        """Write the per-step metrics of the run."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.entries, file, indent=2)
+
+
+def load_page_metrics(path):
+    """Load a file written by PageMetrics.write() (empty list if missing)."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return []
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+# Process-wide collector used by the page objects and the hooks
+page_metrics = PageMetrics()
@@ -0,0 +1,327 @@
+"""Run behave scenarios in parallel worker processes and merge the results.
+
+Usage:
+    python -m utils.parallel_runner --workers 4
+    python -m utils.parallel_runner --workers 2 --tags=-@wip features/cart.feature
+    python -m utils.parallel_runner --schedule round-robin
+    python -m utils.parallel_runner --rerun-failed
+    python -m utils.parallel_runner --quarantine
+
+Scenarios are scheduled longest-first from the durations recorded in
+previous runs (SCENARIO_HISTORY_PATH); the history is updated after each run.
+The ids of failed scenarios are kept in FAILED_SCENARIOS_PATH for
+--rerun-failed. Scenarios whose outcome keeps flipping are reported as flaky;
+with --quarantine they run in a separate lane that does not fail the run.
+While the workers run, their result streams are merged into live-report.html
+and live-summary.json in the reports directory.
+"""
+
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from behave.parser import parse_file
+from behave.tag_expression import TagExpression
+
+from utils.config import (FAILED_SCENARIOS_PATH, PAGE_METRICS_PATH, PARALLEL_WORKERS, REPORTS_DIR,
+                          RESULTS_STREAM, RESULTS_STREAM_PATH, SCENARIO_HISTORY_PATH)
+from utils.page_metrics import load_page_metrics
+from utils.result_stream import StreamMerger, follow
+from utils.reporting import (attach_page_metrics, merge_json_results, scenario_duration, summarize,
+                             write_html_report, write_json_report)
+from utils.scenario_history import ScenarioHistory, load_failed_ids, split_longest_first, update_failed_ids
+
+
+# id: stable key "feature file::scenario name" (outline rows carry their "-- @1.2" suffix)
+# location: "feature file:line" argument understood by behave
+ScenarioRef = namedtuple('ScenarioRef', ['id', 'location', 'feature', 'name', 'tags'])
+
+
+def collect_scenarios(paths=('features',), tags=None):
+    """
+    Collect runnable scenarios, expanding Scenario Outline example rows.
+
+    Args:
+        paths (iterable): Feature files or directories containing them
+        tags (list): Optional behave tag expressions used to filter scenarios
+
+    Returns:
+        list: ScenarioRef entries in file order
+    """
+    tag_expression = TagExpression(tags or [])
+    scenarios = []
+    for feature_file in _feature_files(paths):
+        feature = parse_file(feature_file)
+        if feature is None:
+            continue
+        for scenario in feature.walk_scenarios():
+            if tags and not tag_expression.check(scenario.effective_tags):
+                continue
+            scenarios.append(ScenarioRef(
+                id=f"{feature_file}::{scenario.name}",
+                location=f"{feature_file}:{scenario.line}",
+                feature=feature_file,
+                name=scenario.name,
+                tags=list(scenario.effective_tags)
+            ))
+    return scenarios
+
+
+def _feature_files(paths):
+    """Expand directories into their *.feature files."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*.feature'))))
+        else:
+            files.append(path)
+    return [os.path.relpath(path).replace(os.sep, '/') for path in files]
+
+
+def split_round_robin(scenarios, workers):
+    """
+    Split scenarios into at most `workers` non-empty shards.
+
+    Args:
+        scenarios (list): ScenarioRef entries
+        workers (int): Number of worker processes
+
+    Returns:
+        list: One list of ScenarioRef per worker
+    """
+    shards = [scenarios[i::workers] for i in range(workers)]
+    return [shard for shard in shards if shard]
+
+
+def record_history(history, scenarios, features):
+    """
+    Add the outcome and duration of every scenario that ran to the history.
+
+    Returns:
+        dict: Scenario id -> (status, actual seconds)
+    """
+    by_location = {ref.location: ref for ref in scenarios}
+    outcomes = {}
+    for feature in features:
+        for element in feature.get('elements', []):
+            ref = by_location.get(element['location'])
+            if ref is None or element.get('status') in (None, 'skipped', 'untested'):
+                continue
+            outcomes[ref.id] = (element['status'], scenario_duration(element))
+            history.record(ref.id, outcomes[ref.id][1], element['status'])
+    return outcomes
+
+
+def run_worker(worker_id, shard, output_dir):
+    """
+    Run one shard in its own behave process.
+
+    Each process runs the regular environment hooks, so it gets its own
+    driver (or driver pool) from DriverFactory.
+
+    Args:
+        worker_id (int): Worker number, exported as WORKER_ID
+        shard (list): ScenarioRef entries to run
+        output_dir (str): Directory for the worker's JSON result and log
+
+    Returns:
+        dict: Worker id, exit code, wall-clock seconds and output paths
+    """
+    json_path = os.path.join(output_dir, f"worker-{worker_id}.json")
+    log_path = os.path.join(output_dir, f"worker-{worker_id}.log")
+    # Written by the worker's after_all hook (see features/environment.py); drop a stale one
+    metrics_path = PAGE_METRICS_PATH.replace('.json', f'-worker-{worker_id}.json')
+    if os.path.exists(metrics_path):
+        os.remove(metrics_path)
+    command = [sys.executable, '-m', 'behave', *[ref.location for ref in shard],
+               '-f', 'json', '-o', json_path, '-f', 'progress']
+    env = dict(os.environ, WORKER_ID=str(worker_id))
+    start = time.perf_counter()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        returncode = subprocess.call(command, stdout=log, stderr=subprocess.STDOUT, env=env)
+    return {
+        'worker': worker_id,
+        'returncode': returncode,
+        'duration': time.perf_counter() - start,
+        'scenarios': len(shard),
+        'json': json_path,
+        'log': log_path,
+        'page_metrics': metrics_path,
+    }
+
+
+def run_shards(shards, output_dir):
+    """
+    Run every shard concurrently, one behave process per shard.
+
+    Returns:
+        list: Worker results from run_worker(), ordered by worker id
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max(len(shards), 1)) as executor:
+        futures = [executor.submit(run_worker, worker_id, shard, output_dir)
+                   for worker_id, shard in enumerate(shards)]
+        return [future.result() for future in futures]
+
+
+def _start_live_report(workers, reports_dir):
+    """
+    Merge the workers' result streams into a live report on a background thread.
+
+    Returns:
+        tuple: (thread, stop event)
+    """
+    paths = [RESULTS_STREAM_PATH.replace('.jsonl', f'-worker-{worker_id}.jsonl') for worker_id in range(workers)]
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)  # Left by an earlier run
+    merger = StreamMerger(paths)
+    html_path = os.path.join(reports_dir, 'live-report.html')
+    stop = threading.Event()
+
+    def run():
+        try:
+            follow(merger, html_path, os.path.join(reports_dir, 'live-summary.json'), stop=stop,
+                   title="Sauce Demo Test Report (live)")
+        except Exception as e:
+            print(f"Live report stopped: {e}")
+        finally:
+            merger.close()
+
+    thread = threading.Thread(target=run, name='live-report', daemon=True)
+    thread.start()
+    print(f"Live report: {html_path}")
+    return thread, stop
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run behave scenarios in parallel.")
+    parser.add_argument('paths', nargs='*', default=['features'],
+                        help="Feature files or directories (default: features)")
+    parser.add_argument('-w', '--workers', type=int, default=PARALLEL_WORKERS,
+                        help="Number of worker processes")
+    parser.add_argument('-t', '--tags', action='append',
+                        help="Behave tag expression (may be repeated)")
+    parser.add_argument('--reports-dir', default=REPORTS_DIR,
+                        help="Directory for report.html, results.json and worker output")
+    parser.add_argument('--schedule', choices=('longest-first', 'round-robin'), default='longest-first',
+                        help="How scenarios are assigned to workers")
+    parser.add_argument('--history', default=SCENARIO_HISTORY_PATH,
+                        help="Per-scenario duration/outcome history file")
+    parser.add_argument('--failed-file', default=FAILED_SCENARIOS_PATH,
+                        help="File the ids of failed scenarios are kept in")
+    parser.add_argument('--rerun-failed', action='store_true',
+                        help="Run only the scenarios that failed in their latest run")
+    parser.add_argument('--quarantine', action='store_true',
+                        help="Run flaky scenarios in a separate lane that does not fail the run")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Collect, shard, run and merge. Returns a process exit code."""
+    args = parse_args(argv)
+    scenarios = collect_scenarios(args.paths, args.tags)
+    history = ScenarioHistory(args.history)
+    workers = max(args.workers, 1)
+    full_predicted = None
+    if args.rerun_failed and scenarios:
+        failed_ids = load_failed_ids(args.failed_file)
+        # What running everything would have cost, for the time-saved figure
+        full_predicted = max(split_longest_first(scenarios, workers, history)[1])
+        total = len(scenarios)
+        scenarios = [ref for ref in scenarios if ref.id in failed_ids]
+        print(f"Rerunning {len(scenarios)} of {total} scenarios that failed last time")
+    if not scenarios:
+        print("No scenarios to run.")
+        return 0
+
+    flaky = [ref for ref in scenarios if history.is_flaky(ref.id)]
+    quarantined = flaky if args.quarantine else []
+    lane = [ref for ref in scenarios if ref not in quarantined]
+    if args.schedule == 'longest-first':
+        shards, predicted = split_longest_first(lane, workers, history) if lane else ([], [])
+    else:
+        shards = split_round_robin(lane, workers)
+        predicted = [sum(history.estimate(ref.id) for ref in shard) for shard in shards]
+    if quarantined:
+        # One extra worker, so quarantined scenarios neither wait for nor delay the others
+        shards.append(quarantined)
+        predicted.append(sum(history.estimate(ref.id) for ref in quarantined))
+    print(f"Running {len(scenarios)} scenarios on {len(shards)} workers ({args.schedule}, "
+          f"predicted makespan {max(predicted):.1f}s)")
+    for ref in flaky:
+        print(f"  flaky ({history.flips(ref.id)} flips"
+              f"{', quarantined' if ref in quarantined else ''}): {ref.id}")
+    live = _start_live_report(len(shards), args.reports_dir) if RESULTS_STREAM else None
+    start = time.perf_counter()
+    try:
+        results = run_shards(shards, os.path.join(args.reports_dir, 'workers'))
+    finally:
+        if live:
+            live[1].set()
+            live[0].join()
+    wall_clock = time.perf_counter() - start
+
+    for result, load in zip(results, predicted):
+        lane_name = " [quarantine]" if quarantined and result['worker'] == len(shards) - 1 else ""
+        print(f"  worker {result['worker']}{lane_name}: {result['scenarios']} scenarios in "
+              f"{result['duration']:.1f}s, predicted {load:.1f}s "
+              f"(exit {result['returncode']}, log {result['log']})")
+
+    features = merge_json_results([result['json'] for result in results],
+                                  locations=[{ref.location for ref in shard} for shard in shards])
+    attach_page_metrics(features, [entry for result in results
+                                   for entry in load_page_metrics(result['page_metrics'])])
+    outcomes = record_history(history, scenarios, features)
+    history.save()
+    still_failing = update_failed_ids(outcomes, args.failed_file)
+    makespan = max(result['duration'] for result in results)
+    # Share of worker time spent running scenarios (1.0 = perfectly balanced, no overhead)
+    seconds = sum(duration for _, duration in outcomes.values())
+    efficiency = seconds / (len(shards) * makespan) if makespan else 0.0
+    run_info = {'workers': len(shards), 'wall_clock_seconds': round(wall_clock, 2),
+                'schedule': args.schedule,
+                'predicted_makespan_seconds': round(max(predicted), 2),
+                'actual_makespan_seconds': round(makespan, 2),
+                'scheduling_efficiency': round(efficiency, 3),
+                'flaky': [ref.id for ref in flaky]}
+    quarantined_ids = {ref.id for ref in quarantined}
+    if quarantined:
+        run_info['quarantined'] = sorted(quarantined_ids)
+        run_info['quarantine_failed'] = sorted(scenario_id for scenario_id in quarantined_ids
+                                               if outcomes.get(scenario_id, ('',))[0] == 'failed')
+    if full_predicted is not None:
+        run_info['rerun_full_suite_predicted_seconds'] = round(full_predicted, 2)
+        run_info['rerun_time_saved_seconds'] = round(max(full_predicted - wall_clock, 0.0), 2)
+        run_info['rerun_still_failing'] = len(still_failing & {ref.id for ref in scenarios})
+    write_json_report(features, os.path.join(args.reports_dir, 'results.json'), extra=run_info)
+    write_html_report(features, os.path.join(args.reports_dir, 'report.html'), extra=run_info)
+
+    summary = summarize(features)
+    print(f"Scenarios: {summary['scenarios']}  wall-clock: {wall_clock:.1f}s")
+    print(f"Makespan: predicted {max(predicted):.1f}s, actual {makespan:.1f}s, "
+          f"efficiency {efficiency:.0%}")
+    if full_predicted is not None:
+        print(f"Rerun: {run_info['rerun_still_failing']} of {len(scenarios)} still failing, "
+              f"saved ~{run_info['rerun_time_saved_seconds']:.1f}s against the full suite "
+              f"(predicted {full_predicted:.1f}s)")
+    if quarantined:
+        print(f"Quarantine: {len(run_info['quarantine_failed'])} of {len(quarantined)} failed "
+              f"(not counted in the exit code)")
+    # Quarantined scenarios are reported but never fail the run
+    failed = any(status == 'failed' for scenario_id, (status, _) in outcomes.items()
+                 if scenario_id not in quarantined_ids)
+    failed = failed or any(result['returncode'] for result, shard in zip(results, shards)
+                           if shard is not quarantined)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""Merge per-worker behave JSON results into a single JSON and HTML report.
+
+The HTML renderers are shared with the streaming merge in utils/result_stream.py.
+"""
+
+import html
+import json
+import os
+
+from utils.page_metrics import format_metrics
+
+
+def load_json_results(path):
+    """
+    Load a behave JSON formatter output file.
+
+    Args:
+        path (str): Path to the JSON file written by `behave -f json`
+
+    Returns:
+        list: Feature dicts, or an empty list if the file is missing/empty
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return []
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def merge_json_results(paths, locations=None):
+    """
+    Merge behave JSON results from several workers.
+
+    Scenarios of the same feature that ran on different workers are folded
+    back into one feature entry and ordered by their line in the file.
+
+    Args:
+        paths (list): JSON result files, one per worker
+        locations (list): Optional set of "file:line" locations per path.
+            Behave also reports the scenarios it skipped for not being
+            selected, so only the ones a worker was given are kept.
+
+    Returns:
+        list: Merged feature dicts in behave JSON format
+    """
+    return merge_features([load_json_results(path) for path in paths], locations)
+
+
+def merge_features(results, locations=None):
+    """
+    Merge already loaded behave JSON results (see merge_json_results).
+
+    Args:
+        results (list): One list of feature dicts per run
+        locations (list): Optional set of selected "file:line" locations per run
+
+    Returns:
+        list: Merged feature dicts in behave JSON format
+    """
+    features = {}
+    for index, result in enumerate(results):
+        selected = locations[index] if locations is not None else None
+        for feature in result:
+            filename = feature['location'].split(':')[0]
+            merged = features.setdefault(filename, dict(feature, elements=[]))
+            merged['elements'].extend(
+                element for element in feature.get('elements', [])
+                if element.get('type') == 'scenario'
+                and (selected is None or element['location'] in selected)
+            )
+    for feature in features.values():
+        feature['elements'].sort(key=lambda element: _line_of(element['location']))
+        statuses = {element.get('status') for element in feature['elements']}
+        feature['status'] = 'failed' if 'failed' in statuses else 'passed'
+    return [features[name] for name in sorted(features)]
+
+
+def attach_page_metrics(features, entries):
+    """
+    Attach page transition metrics to the steps that caused them.
+
+    Args:
+        features (list): Feature dicts in behave JSON format (changed in place)
+        entries (list): Entries written by PageMetrics.write()
+
+    Returns:
+        int: Number of steps that got metrics
+    """
+    by_step = {(entry['scenario'], entry['step']): entry['transitions'] for entry in entries}
+    attached = 0
+    for feature in features:
+        for element in feature.get('elements', []):
+            for step in element.get('steps', []):
+                transitions = by_step.get((element['location'], step.get('location')))
+                if transitions:
+                    step['page_metrics'] = transitions
+                    attached += 1
+    return attached
+
+
+def _line_of(location):
+    """Return the line number part of a 'file:line' location."""
+    return int(location.rsplit(':', 1)[1])
+
+
+def scenario_duration(element):
+    """Return the summed step duration of a scenario element in seconds."""
+    return sum(step.get('result', {}).get('duration', 0.0) for step in element.get('steps', []))
+
+
+def summarize(features):
+    """
+    Count scenarios and steps by status.
+
+    Args:
+        features (list): Merged feature dicts
+
+    Returns:
+        dict: {'scenarios': {status: count}, 'steps': {status: count}}
+    """
+    summary = {'scenarios': {}, 'steps': {}}
+    for feature in features:
+        for element in feature.get('elements', []):
+            status = element.get('status') or 'untested'
+            summary['scenarios'][status] = summary['scenarios'].get(status, 0) + 1
+            for step in element.get('steps', []):
+                step_status = step.get('result', {}).get('status', 'skipped')
+                summary['steps'][step_status] = summary['steps'].get(step_status, 0) + 1
+    return summary
+
+
+def write_json_report(features, path, extra=None):
+    """
+    Write merged results plus a summary as machine-readable JSON.
+
+    Args:
+        features (list): Merged feature dicts
+        path (str): Output file path
+        extra (dict): Optional run metadata (wall-clock, workers, ...)
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    data = {'summary': summarize(features), 'features': features}
+    if extra:
+        data['run'] = extra
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2)
+
+
+def write_html_report(features, path, title="Sauce Demo Test Report", extra=None):
+    """
+    Render merged results as a self-contained HTML report.
+
+    Args:
+        features (list): Merged feature dicts
+        path (str): Output file path
+        title (str): Report heading
+        extra (dict): Optional run metadata shown under the heading
+    """
+    write_html_page(path, summarize(features), (_feature_html(feature) for feature in features), title, extra)
+
+
+def write_html_page(path, summary, sections, title="Sauce Demo Test Report", extra=None):
+    """
+    Write the HTML report page around already rendered sections.
+
+    Args:
+        path (str): Output file path
+        summary (dict): Counters in the format returned by summarize()
+        sections (iterable): HTML chunks (e.g. one per feature), written as they are produced
+        title (str): Report heading
+        extra (dict): Optional run metadata shown under the heading
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(_HTML_HEAD.format(title=html.escape(title)))
+        file.write(f"<h1>{html.escape(title)}</h1>\n")
+        file.write(_summary_html(summary, extra))
+        for section in sections:
+            file.write(section)
+        file.write("</body></html>\n")
+
+
+def _summary_html(summary, extra):
+    """Render the scenario/step counters and run metadata."""
+    parts = []
+    for kind in ('scenarios', 'steps'):
+        counts = ", ".join(f"{count} {status}" for status, count in sorted(summary[kind].items()))
+        parts.append(f"<p><b>{kind.title()}:</b> {html.escape(counts) or 'none'}</p>")
+    for key, value in (extra or {}).items():
+        parts.append(f"<p><b>{html.escape(str(key))}:</b> {html.escape(str(value))}</p>")
+    return "<div class='summary'>" + "".join(parts) + "</div>\n"
+
+
+def _feature_html(feature):
+    """Render one feature with its scenarios and steps."""
+    rows = [feature_heading_html(feature)]
+    for element in feature.get('elements', []):
+        rows.append(scenario_html(element))
+    return "<div class='feature'>" + "\n".join(rows) + "</div>\n"
+
+
+def feature_heading_html(feature):
+    """Render the heading of a feature (dict with keyword, name and status)."""
+    return (f"<h2 class='{feature.get('status')}'>{html.escape(feature['keyword'])}: "
+            f"{html.escape(feature['name'])}</h2>")
+
+
+def scenario_html(element):
+    """Render one scenario with its steps."""
+    status = element.get('status') or 'untested'
+    rows = [f"<h3 class='{status}'>{html.escape(element['name'])} "
+            f"<small>({html.escape(element['location'])}, {scenario_duration(element):.2f}s)</small></h3>",
+            "<ul>"]
+    for step in element.get('steps', []):
+        result = step.get('result', {})
+        step_status = result.get('status', 'skipped')
+        rows.append(f"<li class='{step_status}'>{html.escape(step['keyword'])} "
+                    f"{html.escape(step['name'])} <small>{result.get('duration', 0.0):.2f}s</small>")
+        for metrics in step.get('page_metrics', []):
+            rows.append(f"<div class='metrics'><small>{html.escape(format_metrics(metrics))}</small></div>")
+        error = result.get('error_message')
+        if error:
+            if isinstance(error, list):
+                error = "\n".join(error)
+            rows.append(f"<pre>{html.escape(error)}</pre>")
+        rows.append("</li>")
+    rows.append("</ul>")
+    return "\n".join(rows)
+
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+.passed {{ color: #2e7d32; }} .failed {{ color: #c62828; }}
+.skipped, .untested, .undefined {{ color: #757575; }}
+.feature {{ border-top: 1px solid #ccc; margin-top: 1em; }}
+.metrics {{ color: #455a64; }}
+pre {{ background: #fbe9e7; padding: .5em; white-space: pre-wrap; }}
+</style></head><body>
+"""
@@ -0,0 +1,329 @@
+"""Streaming JSONL results and an incremental merge into the HTML report.
+
+Each behave process writes one JSON line per finished step and scenario
+(RESULTS_STREAM_PATH, with a -worker-N suffix under the parallel runner):
+
+    {"type": "run", "event": "start", "worker": "0", ...}
+    {"type": "step", "scenario": "features/cart.feature:9", "status": "passed", ...}
+    {"type": "scenario", "location": "features/cart.feature:9", "status": "passed", ...}
+    {"type": "run", "event": "end", ...}
+
+StreamMerger reads any number of these files incrementally: it remembers how
+far it got in each file, keeps only the steps of scenarios still running in
+memory, and spools rendered scenarios to disk, so a long run can be merged
+into an HTML report and summary while it is still going.
+
+Usage:
+    python -m utils.result_stream reports/results.jsonl
+    python -m utils.result_stream "reports/results-worker-*.jsonl" --follow
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+from utils.config import REPORTS_DIR, RESULTS_STREAM, WORKER_ID
+from utils.reporting import feature_heading_html, scenario_html, write_html_page
+
+
+class ResultStream:
+    """Writes finished steps and scenarios of one behave process as JSON lines."""
+
+    def __init__(self, enabled=RESULTS_STREAM):
+        """Initialize a closed stream."""
+        self.enabled = enabled
+        self.path = None
+        self.records = 0
+        self._file = None
+        self._streamed = set()  # Step locations of the current scenario already written
+
+    def open(self, path):
+        """Start a new stream file (replacing one from an earlier run)."""
+        if not self.enabled:
+            return
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = open(path, 'w', encoding='utf-8')
+        self.path = path
+        self._write({'type': 'run', 'event': 'start', 'worker': WORKER_ID or None,
+                     'pid': os.getpid(), 'time': time.time()})
+
+    def _write(self, record):
+        if self._file is None:
+            return
+        # One flushed line per record: readers never see more than a partial last line
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._file.flush()
+        self.records += 1
+
+    def step(self, scenario, step, page_metrics=()):
+        """Write a finished step of a scenario."""
+        self._streamed.add(str(step.location))
+        self._write(_step_record(scenario, step, page_metrics))
+
+    def scenario(self, scenario):
+        """Write a finished scenario (after the steps that never ran, e.g. skipped after a failure)."""
+        for step in scenario.all_steps:
+            if str(step.location) not in self._streamed:
+                self._write(_step_record(scenario, step))
+        self._streamed = set()
+        self._write({
+            'type': 'scenario',
+            'feature': scenario.feature.filename,
+            'feature_name': scenario.feature.name,
+            'feature_keyword': scenario.feature.keyword,
+            'location': str(scenario.location),
+            'keyword': scenario.keyword,
+            'name': scenario.name,
+            'tags': list(scenario.effective_tags),
+            'status': scenario.status.name,
+            'duration': scenario.duration,
+            'time': time.time(),
+        })
+
+    def close(self):
+        """Mark the run as finished and close the file."""
+        if self._file is None:
+            return
+        self._write({'type': 'run', 'event': 'end', 'worker': WORKER_ID or None, 'time': time.time()})
+        self._file.close()
+        self._file = None
+
+
+def _step_record(scenario, step, page_metrics=()):
+    record = {
+        'type': 'step',
+        'feature': scenario.feature.filename,
+        'scenario': str(scenario.location),
+        'location': str(step.location),
+        'keyword': step.keyword,
+        'name': step.name,
+        'status': step.status.name,
+        'duration': step.duration,
+    }
+    if step.error_message:
+        record['error_message'] = step.error_message
+    if page_metrics:
+        record['page_metrics'] = list(page_metrics)
+    return record
+
+
+class StreamMerger:
+    """Incrementally merges result streams into report counters and rendered HTML."""
+
+    def __init__(self, patterns, work_dir=None):
+        """
+        Args:
+            patterns (list): Stream files or glob patterns (re-expanded on every poll)
+            work_dir (str): Directory for the rendered scenario spool files
+                (default: a temporary directory removed by close())
+        """
+        self.patterns = list(patterns)
+        self._temp = None if work_dir else tempfile.TemporaryDirectory(prefix='report-parts-')
+        self.work_dir = work_dir or self._temp.name
+        os.makedirs(self.work_dir, exist_ok=True)
+        self.summary = {'scenarios': {}, 'steps': {}}
+        self.features = {}  # feature file -> keyword, name, status, scenario counts, spool file
+        self.failed = []  # Locations of failed scenarios
+        self.scenario_seconds = 0.0
+        self.records = 0
+        self._offsets = {}  # stream file -> bytes consumed (complete lines only)
+        self._started = set()
+        self._ended = set()
+        self._pending = {}  # (stream file, scenario location) -> steps so far
+
+    @property
+    def files(self):
+        """Stream files currently matching the patterns."""
+        found = []
+        for pattern in self.patterns:
+            matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+            found.extend(path for path in matches if os.path.exists(path) and path not in found)
+        return found
+
+    @property
+    def complete(self):
+        """True once every stream that started has also ended."""
+        return bool(self._started) and self._started <= self._ended
+
+    @property
+    def in_progress(self):
+        """Locations of the scenarios that have started but not finished."""
+        return sorted(location for _, location in self._pending)
+
+    def poll(self):
+        """
+        Consume the lines written since the last poll.
+
+        Returns:
+            int: Number of records consumed
+        """
+        consumed = 0
+        for path in self.files:
+            offset = self._offsets.get(path, 0)
+            if os.path.getsize(path) < offset:
+                offset = 0  # Rewritten by a new run
+            with open(path, 'rb') as file:
+                file.seek(offset)
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break  # Still being written; picked up by the next poll
+                    offset += len(line)
+                    if line.strip():
+                        self._consume(path, json.loads(line))
+                        consumed += 1
+            self._offsets[path] = offset
+        self.records += consumed
+        return consumed
+
+    def _consume(self, path, record):
+        kind = record.get('type')
+        if kind == 'run':
+            (self._started if record['event'] == 'start' else self._ended).add(path)
+        elif kind == 'step':
+            self._pending.setdefault((path, record['scenario']), []).append({
+                'keyword': record['keyword'],
+                'name': record['name'],
+                'location': record['location'],
+                'result': {'status': record['status'], 'duration': record.get('duration') or 0.0,
+                           'error_message': record.get('error_message')},
+                'page_metrics': record.get('page_metrics', []),
+            })
+            self._count('steps', record['status'])
+        elif kind == 'scenario':
+            steps = self._pending.pop((path, record['location']), [])
+            self._count('scenarios', record['status'])
+            self.scenario_seconds += record.get('duration') or 0.0
+            if record['status'] == 'failed':
+                self.failed.append(record['location'])
+            feature = self.features.setdefault(record['feature'], {
+                'keyword': record['feature_keyword'], 'name': record['feature_name'], 'status': 'passed',
+                'scenarios': {}, 'spool': os.path.join(self.work_dir, re.sub(r'\W', '_', record['feature']))})
+            feature['scenarios'][record['status']] = feature['scenarios'].get(record['status'], 0) + 1
+            if record['status'] == 'failed':
+                feature['status'] = 'failed'
+            element = {'name': record['name'], 'location': record['location'],
+                       'status': record['status'], 'steps': steps}
+            with open(feature['spool'], 'a', encoding='utf-8') as spool:
+                spool.write(scenario_html(element) + "\n")
+
+    def _count(self, kind, status):
+        self.summary[kind][status] = self.summary[kind].get(status, 0) + 1
+
+    def _sections(self):
+        """Feature sections, read back from the spool files one at a time."""
+        for filename in sorted(self.features):
+            feature = self.features[filename]
+            with open(feature['spool'], 'r', encoding='utf-8') as spool:
+                yield "<div class='feature'>" + feature_heading_html(feature) + "\n"
+                for chunk in spool:
+                    yield chunk
+                yield "</div>\n"
+
+    def write(self, html_path, summary_path, title="Sauce Demo Test Report"):
+        """
+        Write the HTML report and JSON summary of everything consumed so far.
+
+        Both files are replaced atomically, so they can be watched while the run is going.
+        """
+        state = {'complete': self.complete, 'streams': len(self._started),
+                 'scenario_seconds': round(self.scenario_seconds, 2)}
+        if self.in_progress:
+            state['in_progress'] = ", ".join(self.in_progress)
+        write_html_page(f"{html_path}.tmp", self.summary, self._sections(), title, extra=state)
+        os.replace(f"{html_path}.tmp", html_path)
+        os.makedirs(os.path.dirname(summary_path) or '.', exist_ok=True)
+        with open(f"{summary_path}.tmp", 'w', encoding='utf-8') as file:
+            json.dump({
+                'summary': self.summary,
+                'features': {filename: {'name': feature['name'], 'status': feature['status'],
+                                        'scenarios': feature['scenarios']}
+                             for filename, feature in sorted(self.features.items())},
+                'failed': self.failed,
+                'in_progress': self.in_progress,
+                'complete': self.complete,
+                'streams': len(self._started),
+                'records': self.records,
+                'scenario_seconds': round(self.scenario_seconds, 2),
+                'updated_at': time.time(),
+            }, file, indent=2)
+        os.replace(f"{summary_path}.tmp", summary_path)
+
+    def close(self):
+        """Remove the spool files."""
+        if self._temp is not None:
+            self._temp.cleanup()
+            self._temp = None
+
+
+def follow(merger, html_path, summary_path, interval=2.0, stop=None, title="Sauce Demo Test Report"):
+    """
+    Keep merging new results into the report until the streams end.
+
+    Args:
+        merger (StreamMerger): Merger to poll
+        html_path (str): HTML report to refresh
+        summary_path (str): JSON summary to refresh
+        interval (float): Seconds between polls
+        stop (threading.Event): Optional event that ends following (after a final merge)
+        title (str): Report heading
+    """
+    merger.write(html_path, summary_path, title)
+    while True:
+        finished = merger.complete or (stop is not None and stop.is_set())
+        if merger.poll() or finished:
+            merger.write(html_path, summary_path, title)
+        if finished:
+            return
+        if stop is not None:
+            stop.wait(interval)
+        else:
+            time.sleep(interval)
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Merge streamed behave results into a report.")
+    parser.add_argument('streams', nargs='+', help="Result stream files or glob patterns")
+    parser.add_argument('--html', default=os.path.join(REPORTS_DIR, 'stream-report.html'),
+                        help="HTML report to write")
+    parser.add_argument('--summary', default=os.path.join(REPORTS_DIR, 'stream-summary.json'),
+                        help="JSON summary to write")
+    parser.add_argument('--follow', action='store_true',
+                        help="Keep merging new results until every stream has ended")
+    parser.add_argument('--interval', type=float, default=2.0,
+                        help="Seconds between polls with --follow")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Merge the streams once (or follow them). Returns 1 if any scenario failed."""
+    args = parse_args(argv)
+    merger = StreamMerger(args.streams)
+    try:
+        if args.follow:
+            follow(merger, args.html, args.summary, args.interval)
+        else:
+            merger.poll()
+            merger.write(args.html, args.summary)
+    except KeyboardInterrupt:
+        merger.write(args.html, args.summary)
+    finally:
+        merger.close()
+    print(f"Merged {merger.records} records from {len(merger.files)} streams: "
+          f"scenarios {merger.summary['scenarios']}"
+          + (f", {len(merger.in_progress)} still running" if merger.in_progress else ""))
+    print(f"Report: {args.html}, summary: {args.summary}")
+    return 1 if merger.failed else 0
+
+
+# Shared by the environment hooks of one behave process
+result_stream = ResultStream()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Per-scenario history (durations and outcomes) persisted between runs.
+
+Entries are keyed by ScenarioRef.id ("feature file::scenario name"; outline
+rows carry their "-- @1.2" suffix), so every example row has its own entry.
+The parallel runner uses the history to schedule long scenarios first and
+to spot flaky scenarios; the ids that failed in their latest run are kept
+separately in FAILED_SCENARIOS_PATH for failed-only reruns.
+"""
+
+import heapq
+import json
+import os
+import statistics
+
+from utils.config import FAILED_SCENARIOS_PATH, SCENARIO_HISTORY_PATH
+
+
+DEFAULT_ESTIMATE = 5.0  # Seconds assumed for a scenario when nothing is known yet
+KEEP_RUNS = 10  # Durations/outcomes kept per scenario
+FLAKY_FLIPS = 2  # Pass/fail changes within the kept runs that mark a scenario as flaky
+
+
+class ScenarioHistory:
+    """Durations and outcomes of previous runs, per scenario id."""
+
+    def __init__(self, path=SCENARIO_HISTORY_PATH):
+        """
+        Load the history file if it exists.
+
+        Args:
+            path (str): JSON history file
+        """
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                self.entries = json.load(file)
+
+    def save(self):
+        """Write the history file."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as file:
+            json.dump(self.entries, file, indent=2, sort_keys=True)
+
+    def record(self, scenario_id, duration, status):
+        """
+        Add one run of a scenario.
+
+        Args:
+            scenario_id (str): ScenarioRef.id
+            duration (float): Seconds the scenario took
+            status (str): Behave status, e.g. 'passed' or 'failed'
+        """
+        entry = self.entries.setdefault(scenario_id, {'durations': [], 'statuses': []})
+        entry['durations'] = (entry['durations'] + [round(duration, 3)])[-KEEP_RUNS:]
+        entry['statuses'] = (entry['statuses'] + [status])[-KEEP_RUNS:]
+
+    def last_status(self, scenario_id):
+        """Status of the most recent run, or None if the scenario never ran."""
+        statuses = self.entries.get(scenario_id, {}).get('statuses')
+        return statuses[-1] if statuses else None
+
+    def flips(self, scenario_id):
+        """Number of times the outcome changed between passed and failed in the kept runs."""
+        statuses = [status for status in self.entries.get(scenario_id, {}).get('statuses', [])
+                    if status in ('passed', 'failed')]
+        return sum(1 for before, after in zip(statuses, statuses[1:]) if before != after)
+
+    def is_flaky(self, scenario_id):
+        """
+        Whether a scenario both passes and fails without a lasting change.
+
+        A scenario that started failing and keeps failing flipped once (a
+        regression); one that went pass -> fail -> pass flipped twice.
+        """
+        return self.flips(scenario_id) >= FLAKY_FLIPS
+
+    def estimate(self, scenario_id):
+        """
+        Predicted duration of a scenario in seconds.
+
+        The median of its recent runs; scenarios without history get the
+        median of all known scenarios (or DEFAULT_ESTIMATE).
+        """
+        durations = self.entries.get(scenario_id, {}).get('durations')
+        if durations:
+            return statistics.median(durations)
+        known = [statistics.median(entry['durations']) for entry in self.entries.values()
+                 if entry.get('durations')]
+        return statistics.median(known) if known else DEFAULT_ESTIMATE
+
+
+def load_failed_ids(path=FAILED_SCENARIOS_PATH):
+    """Scenario ids that failed in their most recent run (empty if never written)."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return set()
+    with open(path, 'r', encoding='utf-8') as file:
+        return set(json.load(file))
+
+
+def update_failed_ids(outcomes, path=FAILED_SCENARIOS_PATH):
+    """
+    Fold a run's outcomes into the persisted failed set.
+
+    Scenarios that did not run keep their entry, so a failed-only rerun that
+    fixes some scenarios leaves the others to be rerun next time.
+
+    Args:
+        outcomes (dict): Scenario id -> (status, seconds), see record_history()
+        path (str): JSON file holding the failed ids
+
+    Returns:
+        set: The updated failed ids
+    """
+    failed = {scenario_id for scenario_id in load_failed_ids(path) if scenario_id not in outcomes}
+    failed.update(scenario_id for scenario_id, (status, _) in outcomes.items() if status == 'failed')
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(sorted(failed), file, indent=2)
+    return failed
+
+
+def split_longest_first(scenarios, workers, history):
+    """
+    Longest-processing-time-first scheduling.
+
+    Scenarios are taken in order of predicted duration (scenarios that
+    failed last time first) and each goes to the worker with the least
+    predicted work so far. Shards keep that order, which only decides run
+    order where scenarios are handed out one batch at a time (the
+    distributed work queue): a single behave invocation, as in the
+    parallel runner, runs its scenarios in feature-file order.
+
+    Args:
+        scenarios (list): ScenarioRef entries
+        workers (int): Number of worker processes
+        history (ScenarioHistory): Source of predicted durations
+
+    Returns:
+        tuple: (shards, predicted seconds per shard); empty shards are dropped
+    """
+    ordered = sorted(scenarios, key=lambda ref: (history.last_status(ref.id) != 'failed',
+                                                 -history.estimate(ref.id)))
+    loads = [(0.0, worker) for worker in range(max(min(workers, len(scenarios)), 1))]
+    shards = [[] for _ in loads]
+    for ref in ordered:
+        load, worker = heapq.heappop(loads)
+        shards[worker].append(ref)
+        heapq.heappush(loads, (load + history.estimate(ref.id), worker))
+    predicted = [sum(history.estimate(ref.id) for ref in shard) for shard in shards]
+    return ([shard for shard in shards if shard],
+            [load for shard, load in zip(shards, predicted) if shard])
@@ -0,0 +1,132 @@
+"""Per-process cache of authenticated browser sessions, keyed by username."""
+
+import time
+
+from pages.wait_engine import WaitEngine
+
+
+CAPTURE_STORAGE_SCRIPT = ("return [Object.assign({}, window.localStorage), "
+                          "Object.assign({}, window.sessionStorage)];")
+INJECT_STORAGE_SCRIPT = (
+    "var local = arguments[0], sess = arguments[1];"
+    "Object.keys(local).forEach(function (k) { window.localStorage.setItem(k, local[k]); });"
+    "Object.keys(sess).forEach(function (k) { window.sessionStorage.setItem(k, sess[k]); });"
+)
+
+
+class SessionCache:
+    """Stores the cookies and web storage a successful login leaves behind."""
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._sessions = {}
+
+    def get(self, username):
+        """
+        Get a cached session for a user.
+
+        Args:
+            username (str): User the session was captured for
+
+        Returns:
+            dict: Session data, or None if missing or any cookie has expired
+        """
+        session = self._sessions.get(username)
+        if session is None:
+            return None
+        if self.is_expired(session):
+            del self._sessions[username]
+            return None
+        return session
+
+    @staticmethod
+    def is_expired(session):
+        """Return True if any cookie of a captured session has expired."""
+        now = time.time()
+        return any(cookie.get('expiry', now + 1) <= now for cookie in session['cookies'])
+
+    def store(self, username, session):
+        """Cache session data for a user."""
+        self._sessions[username] = session
+
+    def invalidate(self, username):
+        """Drop a user's cached session (e.g. after it was rejected)."""
+        self._sessions.pop(username, None)
+
+    @staticmethod
+    def capture(driver):
+        """
+        Capture the current origin's cookies and web storage.
+
+        Args:
+            driver: WebDriver instance positioned on the application
+
+        Returns:
+            dict: {'cookies': [...], 'local_storage': {...}, 'session_storage': {...}}
+        """
+        storage = driver.execute_script(CAPTURE_STORAGE_SCRIPT)
+        return SessionCache.build_session(driver.get_cookies(), storage)
+
+    @staticmethod
+    def build_session(cookies, storage):
+        """
+        Build session data from a page's cookies and web storage.
+
+        Args:
+            cookies (list): Result of get_cookies()
+            storage (list): Result of CAPTURE_STORAGE_SCRIPT
+
+        Returns:
+            dict: {'cookies': [...], 'local_storage': {...}, 'session_storage': {...}}
+        """
+        return {
+            'cookies': cookies,
+            'local_storage': storage[0],
+            'session_storage': storage[1],
+        }
+
+    @staticmethod
+    def cookies_to_add(session):
+        """A session's cookies as add_cookie() arguments (without sameSite, which drivers may reject)."""
+        return [{key: value for key, value in cookie.items() if key != 'sameSite'}
+                for cookie in session['cookies']]
+
+    @staticmethod
+    def storage_arguments(session):
+        """Arguments for INJECT_STORAGE_SCRIPT that restore a session's web storage."""
+        return session['local_storage'], session['session_storage']
+
+    @staticmethod
+    def inject(driver, base_url, session):
+        """
+        Restore a captured session into the browser.
+
+        Cookies are set over DevTools when the browser supports it, which
+        avoids loading an application page just to be on the right origin.
+        Web storage is per-origin, so it still needs one page on the origin.
+
+        Args:
+            driver: WebDriver instance
+            base_url (str): Application origin the session belongs to
+            session (dict): Data returned by capture()
+        """
+        has_storage = session['local_storage'] or session['session_storage']
+        if hasattr(driver, 'execute_cdp_cmd') and not has_storage:
+            for cookie in session['cookies']:
+                params = {key: cookie[key] for key in ('name', 'value', 'path', 'secure', 'httpOnly')
+                          if key in cookie}
+                params['url'] = base_url
+                if 'expiry' in cookie:
+                    params['expires'] = cookie['expiry']
+                driver.execute_cdp_cmd('Network.setCookie', params)
+            return
+
+        if not driver.current_url.startswith(base_url):
+            WaitEngine(driver).load(base_url)
+        for cookie in SessionCache.cookies_to_add(session):
+            driver.add_cookie(cookie)
+        driver.execute_script(INJECT_STORAGE_SCRIPT, *SessionCache.storage_arguments(session))
+
+
+# Shared by the login steps and the environment hooks within one behave process
+session_cache = SessionCache()
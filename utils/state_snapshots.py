@@ -0,0 +1,110 @@
+"""Snapshot and restore of the application state a Background leaves behind.
+
+The first scenario of a feature runs its Background normally; afterwards the
+browser state (cookies, web storage, current URL) and the page objects the
+steps stored on the context are captured. Later scenarios with the same
+Background restore that snapshot instead of replaying the steps.
+
+Snapshots are keyed by the Background's step text and the application URL,
+kept in process memory only (they hold session cookies, so they are never
+written to disk) and dropped when any cookie expires.
+
+This relies on two behave 1.2.6 internals, used by features/environment.py:
+setting `scenario._background_steps = []` makes behave skip the Background
+of a restored scenario, and `context._stack[0]` is the layer holding the
+attributes the current scenario's steps set (see context_page_objects()).
+Opt in with STATE_SNAPSHOTS=true; check both after upgrading behave.
+"""
+
+import hashlib
+import importlib
+from urllib.parse import urlsplit
+
+from pages.base_page import BasePage
+from pages.wait_engine import WaitEngine
+from utils.session_cache import SessionCache
+
+
+def background_key(background, base_url):
+    """Key of a Background: its step text (with tables/doc strings) and the app URL."""
+    lines = [base_url]
+    for step in background.steps:
+        lines.append(f"{step.keyword} {step.name}")
+        if step.text:
+            lines.append(step.text)
+        if step.table:
+            lines.extend(" | ".join(row.cells) for row in [step.table.headings, *step.table.rows])
+    return hashlib.sha1("\n".join(lines).encode('utf-8')).hexdigest()
+
+
+class StateSnapshotCache:
+    """Captured Background states of the current behave process."""
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self.snapshots = {}
+        self.restored = 0
+
+    def get(self, key):
+        """
+        Return a valid snapshot, dropping it if any of its cookies expired.
+
+        Args:
+            key (str): background_key() of the scenario's Background
+
+        Returns:
+            dict: Snapshot, or None
+        """
+        snapshot = self.snapshots.get(key)
+        if snapshot is not None and SessionCache.is_expired(snapshot['session']):
+            self.invalidate(key)
+            return None
+        return snapshot
+
+    def invalidate(self, key):
+        """Drop a snapshot."""
+        self.snapshots.pop(key, None)
+
+    def capture(self, key, driver, page_objects):
+        """
+        Snapshot the browser after a Background has passed.
+
+        Args:
+            key (str): background_key() of the Background
+            driver: WebDriver instance
+            page_objects (dict): Context attribute name -> page object the steps created
+        """
+        if key in self.snapshots:
+            return
+        self.snapshots[key] = {
+            'url': driver.current_url,
+            'session': SessionCache.capture(driver),
+            'page_objects': {name: [type(page).__module__, type(page).__qualname__]
+                             for name, page in page_objects.items()},
+        }
+
+    def restore(self, snapshot, driver, base_url):
+        """
+        Put the browser back into a snapshot's state.
+
+        Returns:
+            dict: Context attribute name -> new page object, or None if the
+            application did not accept the state (e.g. redirected to login)
+        """
+        SessionCache.inject(driver, base_url, snapshot['session'])
+        WaitEngine(driver).load(snapshot['url'])
+        if urlsplit(driver.current_url)[:3] != urlsplit(snapshot['url'])[:3]:
+            return None
+        page_objects = {}
+        for name, (module, qualname) in snapshot['page_objects'].items():
+            page_class = getattr(importlib.import_module(module), qualname)
+            page_objects[name] = page_class(driver)
+        self.restored += 1
+        return page_objects
+
+
+def context_page_objects(context):
+    """Page objects stored on the context by the current scenario's steps."""
+    # behave internal: per-scenario attributes live in the innermost context layer
+    layer = context._stack[0]
+    return {name: value for name, value in layer.items() if isinstance(value, BasePage)}
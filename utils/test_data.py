@@ -0,0 +1,158 @@
+"""Cached, indexed access to the test data in data/.
+
+Sources are read once per process. Users are indexed by username and by role
+(the group they are listed under in users.json, e.g. 'valid_users'). Small
+CSV files are parsed once and memoized; large ones can be streamed row by
+row, and a byte-offset index (built in one pass, 8 bytes per row) lets a
+step jump straight to row N without parsing the rows before it.
+"""
+
+import csv
+import io
+import json
+import threading
+from array import array
+from itertools import islice
+
+from utils.config import CHECKOUT_DATA_PATH, USERS_DATA_PATH
+
+
+class TestDataService:
+    """Loads users and CSV rows once and serves them from memory."""
+
+    def __init__(self, users_path=USERS_DATA_PATH, checkout_path=CHECKOUT_DATA_PATH):
+        """
+        Initialize the service (nothing is read until first use).
+
+        Args:
+            users_path (str): JSON file with users grouped by role
+            checkout_path (str): Default CSV file for checkout rows
+        """
+        self.users_path = users_path
+        self.checkout_path = checkout_path
+        self._lock = threading.Lock()
+        self._users = None
+        self._by_username = None
+        self._by_role = None
+        self._rows = {}
+        self._offsets = {}
+        self._headers = {}
+
+    # -- Users ----------------------------------------------------------
+
+    def _load_users(self):
+        with self._lock:
+            if self._users is None:
+                with open(self.users_path, 'r', encoding='utf-8') as file:
+                    groups = json.load(file)
+                users, by_username, by_role = [], {}, {}
+                for role, members in groups.items():
+                    for member in members:
+                        user = dict(member, role=role)
+                        users.append(user)
+                        by_username.setdefault(user['username'], user)
+                        by_role.setdefault(role, []).append(user)
+                self._users, self._by_username, self._by_role = users, by_username, by_role
+        return self._users
+
+    def users(self, role=None):
+        """
+        Return all users, or the users of one role.
+
+        Args:
+            role (str): Group name in users.json, e.g. 'valid_users'
+        """
+        self._load_users()
+        if role is None:
+            return list(self._users)
+        return list(self._by_role.get(role, []))
+
+    def user(self, username):
+        """Return the user record for a username, or None."""
+        self._load_users()
+        return self._by_username.get(username)
+
+    def password_for(self, username, default=None):
+        """Return the password listed for a username, or `default`."""
+        user = self.user(username)
+        return user['password'] if user else default
+
+    # -- CSV rows -------------------------------------------------------
+
+    def rows(self, path=None):
+        """
+        Return all rows of a CSV file as dicts, parsed once and memoized.
+
+        Meant for small files; use iter_rows()/row() for large ones.
+        """
+        path = path or self.checkout_path
+        with self._lock:
+            if path not in self._rows:
+                with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+                    self._rows[path] = [row for row in csv.DictReader(file) if any(row.values())]
+            return self._rows[path]
+
+    def iter_rows(self, path=None, start=0, stop=None, step=1):
+        """
+        Stream rows of a CSV file without keeping them in memory.
+
+        `start`/`step` allow fanning a file out over workers, e.g.
+        iter_rows(start=worker_index, step=worker_count).
+
+        Yields:
+            dict: One row at a time
+        """
+        path = path or self.checkout_path
+        with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+            rows = (row for row in csv.DictReader(file) if any(row.values()))
+            yield from islice(rows, start, stop, step)
+
+    def _offset_index(self, path):
+        """Byte offset of every data row (built once per file)."""
+        with self._lock:
+            if path not in self._offsets:
+                offsets = array('q')
+                with open(path, 'rb') as file:
+                    self._headers[path] = next(csv.reader([file.readline().decode('utf-8-sig')]))
+                    offset, record, quotes = file.tell(), b'', 0
+                    for line in iter(file.readline, b''):
+                        record += line
+                        quotes += line.count(b'"')
+                        if quotes % 2:
+                            continue  # Quoted field spans lines
+                        if record.strip():
+                            offsets.append(offset)
+                        offset += len(record)
+                        record, quotes = b'', 0
+                self._offsets[path] = offsets
+            return self._offsets[path]
+
+    def row_count(self, path=None):
+        """Number of data rows in a CSV file (via the offset index)."""
+        return len(self._offset_index(path or self.checkout_path))
+
+    def row(self, index, path=None):
+        """
+        Return one row of a CSV file by position, without reading the rows before it.
+
+        Args:
+            index (int): Zero-based data row index
+            path (str): CSV file (default: the checkout data)
+
+        Returns:
+            dict: The row
+        """
+        path = path or self.checkout_path
+        offsets = self._offset_index(path)
+        if not 0 <= index < len(offsets):
+            raise IndexError(f"{path} has {len(offsets)} data rows, no row {index}")
+        with open(path, 'rb') as file:
+            file.seek(offsets[index])
+            end = offsets[index + 1] if index + 1 < len(offsets) else None
+            data = file.read(end - offsets[index]) if end is not None else file.read()
+        values = next(csv.reader(io.StringIO(data.decode('utf-8'))))
+        return dict(zip(self._headers[path], values))
+
+
+# Shared by the step definitions of the current process
+test_data = TestDataService()